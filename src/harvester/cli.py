@@ -1,15 +1,18 @@
 """Command-line interface for the QDArchive data harvester."""
 
 import logging
-from datetime import datetime
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
 import click
-import httpx
 from rich.console import Console
-from rich.table import Table
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.sqlite import insert
 
-from harvester.database.engine import open_session, setup_database
+from harvester.database.engine import dispose_engine, open_session, setup_database
 from harvester.database.export import write_csv
 from harvester.database.models import File
 from harvester.helpers.licensing import license_is_open
@@ -24,8 +27,7 @@ from harvester.settings import (
     ROOT_DIR,
     prepare_directories,
 )
-from harvester.sources import SOURCES
-from harvester.storage.files import build_output_path, sha256_digest
+from harvester.storage.files import StreamDigest, build_output_path, expected_sha256
 
 terminal = Console()
 log = logging.getLogger("harvester")
@@ -44,6 +46,8 @@ def app() -> None:
 
 def _resolve_source(key: str):
     """Look up a source by its short key, or abort."""
+    from harvester.sources import SOURCES
+
     src = SOURCES.get(key)
     if src is None:
         valid = ", ".join(SOURCES)
@@ -52,20 +56,53 @@ def _resolve_source(key: str):
     return src
 
 
+# DatasetHit list fields stored as "; "-joined text
+_JOIN_FIELDS = (
+    "tags", "keywords", "kind_of_data", "language", "software",
+    "geographic_coverage", "producer", "publication",
+)
+# DatasetHit string fields stored as NULL when empty
+_OPTIONAL_FIELDS = (
+    "depositor", "date_of_collection", "time_period_covered",
+    "uploader_name", "uploader_email",
+)
+
+
+def _meta_columns(meta) -> dict:
+    """Serialise the dataset-level File columns once, to be shared by every file row."""
+    cols = dict(
+        license_type=meta.license_type,
+        license_url=meta.license_url,
+        title=meta.title,
+        description=meta.description,
+        authors=meta.authors,
+        date_published=meta.date_published,
+    )
+    join = "; ".join
+    for name in _JOIN_FIELDS:
+        values = getattr(meta, name)
+        cols[name] = join(values) if values else None
+    for name in _OPTIONAL_FIELDS:
+        cols[name] = getattr(meta, name) or None
+    return cols
+
+
 def _store_metadata_record(
-    session, source_name, hit, meta, finfo, fname, ext, qda_flag,
+    pending, recorded, source_name, hit, cols, finfo, fname, ext, qda_flag,
     folder=None, notes="access restricted",
 ):
-    """Persist a record where the file itself was not downloaded."""
-    already = (
-        session.query(File)
-        .filter_by(source_name=source_name, download_url=finfo["download_url"], file_name=fname)
-        .first()
-    )
-    if already:
+    """Queue a record where the file itself was not downloaded.
+
+    The row is appended to *pending* and written by ``_flush_records``;
+    *recorded* (see ``_recorded_files``) guards against duplicates.  *cols*
+    comes from ``_meta_columns``.
+    """
+    url = finfo["download_url"]
+    if fname in recorded.get(url, ()):
         return
+    recorded.setdefault(url, set()).add(fname)
 
-    rec = File(
+    pending.append(dict(
         source_name=source_name,
         source_url=hit.source_url,
         download_url=finfo["download_url"],
@@ -74,49 +111,76 @@ def _store_metadata_record(
         file_size_bytes=finfo.get("size"),
         local_path=None,
         local_directory=folder,
-        license_type=meta.license_type,
-        license_url=meta.license_url,
-        title=meta.title,
-        description=meta.description,
-        authors=meta.authors,
-        date_published=meta.date_published,
-        tags="; ".join(meta.tags) if meta.tags else None,
-        keywords="; ".join(meta.keywords) if meta.keywords else None,
-        kind_of_data="; ".join(meta.kind_of_data) if meta.kind_of_data else None,
-        language="; ".join(meta.language) if meta.language else None,
-        software="; ".join(meta.software) if meta.software else None,
-        geographic_coverage=(
-            "; ".join(meta.geographic_coverage) if meta.geographic_coverage else None
-        ),
         content_type=finfo.get("content_type"),
         friendly_type=finfo.get("friendly_type"),
         restricted=finfo.get("restricted", False),
         api_checksum=finfo.get("api_checksum"),
-        depositor=meta.depositor or None,
-        producer="; ".join(meta.producer) if meta.producer else None,
-        publication="; ".join(meta.publication) if meta.publication else None,
-        date_of_collection=meta.date_of_collection or None,
-        time_period_covered=meta.time_period_covered or None,
-        uploader_name=meta.uploader_name or None,
-        uploader_email=meta.uploader_email or None,
+        **cols,
         is_qda_file=qda_flag,
         notes=notes,
+    ))
+
+
+def _recorded_files(session, source_name: str, files: list[dict]) -> dict[str, set[str]]:
+    """Map each of *files*' download URLs already stored for the source to its file names.
+
+    One query per dataset replaces a lookup per file.
+    """
+    urls = {f["download_url"] for f in files}
+    recorded: dict[str, set[str]] = {}
+    rows = (
+        session.query(File.download_url, File.file_name)
+        .filter(File.source_name == source_name, File.download_url.in_(urls))
     )
-    session.add(rec)
+    for url, name in rows:
+        recorded.setdefault(url, set()).add(name)
+    return recorded
+
+
+def _flush_records(session, pending: list[dict], fetched: list[dict] | None = None) -> None:
+    """Insert every queued record in one executemany per kind and commit once.
+
+    *pending* holds metadata-only rows; *fetched* holds downloaded files,
+    whose ``downloaded_at`` is stamped by the database (CURRENT_TIMESTAMP)
+    rather than bound per row.  Rows that collide with the (source, URL,
+    file name) unique index — e.g. written by a concurrent run since the
+    dataset was checked — are skipped.
+    """
+    if not pending and not fetched:
+        return
+    if pending:
+        session.execute(insert(File).on_conflict_do_nothing(), pending)
+        pending.clear()
+    if fetched:
+        stmt = insert(File).values(downloaded_at=func.now()).on_conflict_do_nothing()
+        session.execute(stmt, fetched)
+        fetched.clear()
     session.commit()
 
 
+def _suffix(name: str) -> str:
+    """Lower-cased extension of *name*, matching ``Path(name).suffix.lower()``.
+
+    Plain string slicing avoids building a Path for every listed file.
+    """
+    base = name[name.rfind("/") + 1:]
+    i = base.rfind(".")
+    if i <= 0 or i == len(base) - 1:
+        return ""
+    return base[i:].lower()
+
+
 def _is_qda_file(fname: str, finfo: dict) -> bool:
     """Decide whether a file is a QDA artefact based on extension or API hints."""
-    ext = Path(fname).suffix.lower()
-    label = finfo.get("friendly_type", "").lower()
-    mime = finfo.get("content_type", "").lower()
-    return ext in QDA_FORMATS or "refi-qda" in label or "refiqda" in mime
+    return _is_qda_type(
+        _suffix(fname), finfo.get("friendly_type", ""), finfo.get("content_type", ""),
+    )
 
 
-def _dataset_has_qda(files: list[dict]) -> bool:
-    """Return True when at least one file in the dataset looks like a QDA file."""
-    return any(_is_qda_file(f["name"], f) for f in files)
+@lru_cache(maxsize=4096)
+def _is_qda_type(ext: str, label: str, mime: str) -> bool:
+    """Memoised core of ``_is_qda_file``; only a handful of type strings recur."""
+    return ext in QDA_FORMATS or "refi-qda" in label.lower() or "refiqda" in mime.lower()
 
 
 # ── Core harvesting loop ───────────────────────────────────────
@@ -124,23 +188,34 @@ def _dataset_has_qda(files: list[dict]) -> bool:
 
 _DEFAULT_SIZE_CAP = 100 * 1024 * 1024  # 100 MB
 
+# One alternation over every relevance term: a single scan of the text
+# instead of one substring search per keyword.  Longest terms first so
+# overlapping prefixes cannot shadow them; "(?!)" never matches.
+_RELEVANCE_RE = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(RELEVANCE_KEYWORDS, key=len, reverse=True))
+    or "(?!)",
+    re.IGNORECASE,
+)
+
 
 def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP):
     """Walk through search hits: fetch metadata, check license, download.
 
     Returns a triple (downloaded, restricted, skipped).
     """
+    import httpx
+
     n_downloaded = 0
     n_restricted = 0
     n_skipped = 0
 
-    for idx, hit in enumerate(hits, 1):
+    # Metadata for upcoming hits is fetched while the current one downloads
+    metas = source.fetch_metadata_bulk(h.source_url for h in hits)
+    for idx, (hit, meta) in enumerate(zip(hits, metas), 1):
         terminal.print(f"\n[bold][{idx}/{len(hits)}][/bold] {hit.title[:70]}")
 
-        try:
-            meta = source.fetch_metadata(hit.source_url)
-        except Exception as exc:
-            terminal.print(f"  [red]Could not fetch metadata: {exc}[/red]")
+        if isinstance(meta, Exception):
+            terminal.print(f"  [red]Could not fetch metadata: {meta}[/red]")
             continue
 
         # Only keep openly-licensed datasets
@@ -159,11 +234,15 @@ def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP
             terminal.print("  [yellow]No files attached to this dataset.[/yellow]")
             continue
 
+        # Classify every file once; the gates and the file loop reuse the flags
+        qda_flags = [_is_qda_file(f["name"], f) for f in meta.files]
+        has_qda = any(qda_flags)
+
         # Exclude non-data resource types unless a QDA file is present
         if meta.kind_of_data:
             kinds_lower = {v.strip().lower() for v in meta.kind_of_data}
             if kinds_lower & EXCLUDED_RESOURCE_TYPES:
-                if not _dataset_has_qda(meta.files):
+                if not has_qda:
                     terminal.print(
                         f"  [dim]Skipped — non-data resource: "
                         f"'{'; '.join(meta.kind_of_data)}'[/dim]"
@@ -172,27 +251,33 @@ def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP
                     continue
 
         # Relevance gate: description + keywords must contain a qualitative term
-        has_qda = _dataset_has_qda(meta.files)
         if not has_qda:
-            combined_text = (meta.description or "").lower()
+            combined_text = meta.description or ""
             if meta.keywords:
-                combined_text += " " + " ".join(k.lower() for k in meta.keywords)
-            if not any(kw in combined_text for kw in RELEVANCE_KEYWORDS):
+                combined_text += " " + " ".join(meta.keywords)
+            if _RELEVANCE_RE.search(combined_text) is None:
                 terminal.print("  [dim]Skipped — no qualitative signal in description[/dim]")
                 n_skipped += 1
                 continue
 
-        # Process each file in the dataset
-        for finfo in meta.files:
+        # Process each file in the dataset; downloads are queued and run
+        # concurrently once every file has been classified
+        cols = _meta_columns(meta)
+        pending: list[dict] = []
+        recorded = _recorded_files(session, source_name, meta.files)
+        queued: list[tuple] = []
+        queued_urls: set[str] = set()
+        queued_paths: set[Path] = set()
+
+        for finfo, qda_flag in zip(meta.files, qda_flags):
             fname = finfo["name"]
             file_url = finfo["download_url"]
-            ext = Path(fname).suffix.lower()
-            qda_flag = _is_qda_file(fname, finfo)
+            ext = _suffix(fname)
 
             # Only download recognised formats; everything else → metadata only
             if not qda_flag and ext not in QUALITATIVE_FORMATS:
                 _store_metadata_record(
-                    session, source_name, hit, meta, finfo,
+                    pending, recorded, source_name, hit, cols, finfo,
                     fname, ext, qda_flag, folder=None,
                     notes="irrelevant file type",
                 )
@@ -212,12 +297,7 @@ def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP
             folder_name = dest_path.parent.name
 
             # Duplicate check by URL
-            existing = (
-                session.query(File)
-                .filter_by(source_name=source_name, download_url=file_url)
-                .first()
-            )
-            if existing:
+            if file_url in recorded or file_url in queued_urls:
                 terminal.print(f"  [dim]Already recorded: {fname}[/dim]")
                 continue
 
@@ -225,7 +305,7 @@ def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP
             file_bytes = finfo.get("size", 0) or 0
             if size_cap and file_bytes > size_cap and not qda_flag:
                 _store_metadata_record(
-                    session, source_name, hit, meta, finfo,
+                    pending, recorded, source_name, hit, cols, finfo,
                     fname, ext, qda_flag, folder=folder_name,
                     notes=f"oversized ({file_bytes / (1024*1024):.0f} MB)",
                 )
@@ -239,7 +319,7 @@ def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP
             # If the API flags the file as restricted, save metadata only
             if finfo.get("restricted", False):
                 _store_metadata_record(
-                    session, source_name, hit, meta, finfo,
+                    pending, recorded, source_name, hit, cols, finfo,
                     fname, ext, qda_flag, folder=folder_name,
                 )
                 n_restricted += 1
@@ -247,42 +327,77 @@ def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP
                 terminal.print(f"  {tag} {fname} [yellow](restricted — metadata saved)[/yellow]")
                 continue
 
-            # Attempt the actual download
-            try:
-                local = source.pull_file(file_url, dest_dir, filename=fname)
-            except httpx.HTTPStatusError as err:
-                if err.response.status_code == 403:
-                    _store_metadata_record(
-                        session, source_name, hit, meta, finfo,
-                        fname, ext, qda_flag, folder=folder_name,
-                    )
-                    n_restricted += 1
-                    tag = "[green]QDA[/green]" if qda_flag else "[dim]file[/dim]"
-                    terminal.print(
-                        f"  {tag} {fname} [yellow](restricted — metadata saved)[/yellow]"
-                    )
-                    continue
-                terminal.print(f"  [red]Download error for {fname}: {err}[/red]")
-                continue
-            except Exception as err:
-                terminal.print(f"  [red]Download error for {fname}: {err}[/red]")
+            # Two files sharing a destination would overwrite each other mid-stream
+            if dest_path in queued_paths:
+                _store_metadata_record(
+                    pending, recorded, source_name, hit, cols, finfo,
+                    fname, ext, qda_flag, folder=folder_name,
+                    notes="duplicate file name in dataset",
+                )
+                terminal.print(f"  [dim]{fname} — metadata only (name clash in dataset)[/dim]")
                 continue
+            queued_paths.add(dest_path)
+            queued_urls.add(file_url)
 
-            local_size = Path(local).stat().st_size
-            if local_size > 50 * 1024 * 1024:
-                terminal.print(
-                    f"  [dim]Hashing {local_size / (1024*1024):.0f} MB…[/dim]"
+            queued.append((finfo, fname, ext, qda_flag, file_url, dest_dir, folder_name))
+
+        # Metadata-only rows are safe to persist before the slow downloads start
+        _flush_records(session, pending)
+        if not queued:
+            continue
+
+        # Downloads run on the source's worker threads; the session is only
+        # touched from here.  Each file is hashed while it streams to disk,
+        # so no second read pass.
+        hashers = [StreamDigest() for _ in queued]
+        results = source.pull_files(
+            [job[4] for job in queued], [job[5] for job in queued],
+            filenames=[job[1] for job in queued], hashers=hashers,
+        )
+
+        fetched: list[dict] = []
+
+        # Look up every fresh digest in one query rather than one per file
+        digests = {
+            h.hexdigest() for res, h in zip(results, hashers) if not isinstance(res, Exception)
+        }
+        known_hashes = set(
+            session.scalars(select(File.file_hash).where(File.file_hash.in_(digests)))
+        )
+
+        for (finfo, fname, ext, qda_flag, file_url, _, folder_name), local, hasher in zip(
+            queued, results, hashers,
+        ):
+            if isinstance(local, httpx.HTTPStatusError) and local.response.status_code == 403:
+                _store_metadata_record(
+                    pending, recorded, source_name, hit, cols, finfo,
+                    fname, ext, qda_flag, folder=folder_name,
                 )
-            digest = sha256_digest(Path(local))
+                n_restricted += 1
+                tag = "[green]QDA[/green]" if qda_flag else "[dim]file[/dim]"
+                terminal.print(f"  {tag} {fname} [yellow](restricted — metadata saved)[/yellow]")
+                continue
+            if isinstance(local, Exception):
+                terminal.print(f"  [red]Download error for {fname}: {local}[/red]")
+                continue
+
+            digest = hasher.hexdigest()
+
+            # The digest came for free while streaming; check it against the API's
+            expected = expected_sha256(finfo.get("api_checksum"))
+            if expected and digest != expected:
+                terminal.print(f"  [red]Checksum mismatch for {fname} — discarded[/red]")
+                Path(local).unlink(missing_ok=True)
+                continue
 
             # Hash-based deduplication
-            dup = session.query(File).filter_by(file_hash=digest).first()
-            if dup:
+            if digest in known_hashes:
                 terminal.print(f"  [dim]Duplicate (hash): {fname}[/dim]")
                 Path(local).unlink(missing_ok=True)
                 continue
+            known_hashes.add(digest)
 
-            rec = File(
+            fetched.append(dict(
                 source_name=source_name,
                 source_url=hit.source_url,
                 download_url=file_url,
@@ -292,41 +407,20 @@ def _process_hits(source, source_name, hits, session, size_cap=_DEFAULT_SIZE_CAP
                 file_size_bytes=finfo.get("size"),
                 local_path=str(Path(local).relative_to(ROOT_DIR)),
                 local_directory=folder_name,
-                license_type=meta.license_type,
-                license_url=meta.license_url,
-                title=meta.title,
-                description=meta.description,
-                authors=meta.authors,
-                date_published=meta.date_published,
-                tags="; ".join(meta.tags) if meta.tags else None,
-                keywords="; ".join(meta.keywords) if meta.keywords else None,
-                kind_of_data="; ".join(meta.kind_of_data) if meta.kind_of_data else None,
-                language="; ".join(meta.language) if meta.language else None,
-                software="; ".join(meta.software) if meta.software else None,
-                geographic_coverage=(
-                    "; ".join(meta.geographic_coverage) if meta.geographic_coverage else None
-                ),
                 content_type=finfo.get("content_type"),
                 friendly_type=finfo.get("friendly_type"),
                 restricted=finfo.get("restricted", False),
                 api_checksum=finfo.get("api_checksum"),
-                depositor=meta.depositor or None,
-                producer="; ".join(meta.producer) if meta.producer else None,
-                publication="; ".join(meta.publication) if meta.publication else None,
-                date_of_collection=meta.date_of_collection or None,
-                time_period_covered=meta.time_period_covered or None,
-                uploader_name=meta.uploader_name or None,
-                uploader_email=meta.uploader_email or None,
+                **cols,
                 is_qda_file=qda_flag,
-                downloaded_at=datetime.utcnow(),
-            )
-            session.add(rec)
-            session.commit()
+            ))
             n_downloaded += 1
 
             tag = "[green]QDA[/green]" if qda_flag else "[blue]file[/blue]"
             terminal.print(f"  {tag} {fname} ({finfo.get('size', '?')} bytes)")
 
+        _flush_records(session, pending, fetched)
+
     return n_downloaded, n_restricted, n_skipped
 
 
@@ -348,85 +442,170 @@ def _read_query_list(path: str | None, single: str | None) -> list[str]:
 
 def _run_source(
     source, source_name: str, queries: list[str], cap: int | None,
-    size_cap: int = _DEFAULT_SIZE_CAP,
+    size_cap: int, session,
 ) -> tuple[int, int, int]:
-    """Execute every query against one source. Returns (downloaded, restricted, skipped)."""
-    session = open_session()
+    """Execute every query against one source. Returns (downloaded, restricted, skipped).
+
+    The caller owns *session* and closes it once the whole run is over.
+    """
     tot_dl = 0
     tot_rest = 0
     tot_skip = 0
-    seen: set[str] = set()
+    # Hashes of dataset URLs already handled.  Storing the 64-bit string
+    # hash instead of the URL keeps this small over long multi-query runs;
+    # a collision (odds ~1e-8 at a million URLs) would only skip one dataset.
+    seen: set[int] = set()
+    seen_add = seen.add
 
-    try:
-        for qi, q in enumerate(queries, 1):
-            terminal.print(f"\n[bold]=== Query {qi}/{len(queries)}: '{q}' ===[/bold]")
-            terminal.print(f"[dim]Searching {source_name}…[/dim]")
-
-            try:
-                hits = source.find(q)
-            except Exception as exc:
-                terminal.print(f"[red]Search error: {exc}[/red]")
-                continue
+    for qi, q in enumerate(queries, 1):
+        terminal.print(
+            f"\n[bold]=== {source_name} — query {qi}/{len(queries)}: '{q}' ===[/bold]"
+        )
+        terminal.print(f"[dim]Searching {source_name}…[/dim]")
 
-            # Drop datasets already seen in earlier queries
-            hits = [h for h in hits if h.source_url not in seen]
-            seen.update(h.source_url for h in hits)
+        try:
+            hits = source.find(q)
+        except Exception as exc:
+            terminal.print(f"[red]Search error: {exc}[/red]")
+            continue
 
-            if cap:
-                hits = hits[:cap]
+        # Drop datasets already seen in earlier queries
+        fresh = []
+        for h in hits:
+            key = hash(h.source_url)
+            if key not in seen:
+                seen_add(key)
+                fresh.append(h)
+        hits = fresh
 
-            terminal.print(f"Found {len(hits)} new dataset(s).")
-            if not hits:
-                continue
+        if cap:
+            hits = hits[:cap]
 
-            dl, rest, skip = _process_hits(source, source_name, hits, session, size_cap)
-            tot_dl += dl
-            tot_rest += rest
-            tot_skip += skip
+        terminal.print(f"Found {len(hits)} new dataset(s).")
+        if not hits:
+            continue
 
-    finally:
-        session.close()
+        dl, rest, skip = _process_hits(source, source_name, hits, session, size_cap)
+        tot_dl += dl
+        tot_rest += rest
+        tot_skip += skip
 
     return tot_dl, tot_rest, tot_skip
 
 
+_SOURCE_WORKERS = 8  # sources harvested in parallel by collect-all
+
+
+def _run_sources_concurrently(
+    keys: list[str], queries: list[str], cap: int | None, size_cap: int,
+):
+    """Run several sources on a thread pool, yielding (key, counts, error) as each finishes.
+
+    Sessions are not thread-safe, so each worker thread opens one session on
+    first use and keeps it for every source it picks up; all of them are
+    closed once the pool drains.
+    """
+    from harvester.sources import SOURCES
+
+    local = threading.local()
+    sessions: list = []
+
+    def _work(key: str) -> tuple[int, int, int]:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = open_session()
+            sessions.append(session)
+        try:
+            return _run_source(SOURCES[key], key, queries, cap, size_cap, session)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            SOURCES[key].close()
+
+    workers = max(1, min(_SOURCE_WORKERS, len(keys)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_work, key): key for key in keys}
+            for fut in as_completed(futures):
+                key = futures[fut]
+                try:
+                    yield key, fut.result(), None
+                except Exception as exc:
+                    log.exception("Source %s failed entirely", key)
+                    yield key, None, exc
+    finally:
+        for session in sessions:
+            session.close()
+
+
 # ── CLI commands ───────────────────────────────────────────────
 
 
+def _find_concurrently(sources: dict, query: str, file_type: str | None) -> dict:
+    """Search every source at once; map each key to its hits or the exception raised.
+
+    Sources have independent rate limits and hosts, so a multi-source
+    query takes as long as the slowest source rather than the sum.
+    """
+    def _search(src):
+        try:
+            return src.find(query, file_type)
+        except Exception as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=max(1, len(sources))) as pool:
+        return dict(zip(sources, pool.map(_search, sources.values())))
+
+
 @app.command()
 @click.argument("source")
 @click.option("--query", "-q", default="qualitative", help="Search term.")
 @click.option("--file-type", "-t", default=None, help="Restrict to a file extension.")
 def find(source: str, query: str, file_type: str | None) -> None:
-    """Search a source and display matching datasets."""
-    src = _resolve_source(source)
+    """Search a source and display matching datasets.
 
-    terminal.print(f"[bold]Searching {source}[/bold] for '{query}'…")
-    try:
-        hits = src.find(query, file_type)
-    except Exception as exc:
-        terminal.print(f"[red]Search failed: {exc}[/red]")
-        raise SystemExit(1) from exc
+    SOURCE may list several keys separated by commas (e.g. ``ia,loc``);
+    they are searched concurrently and shown one table each.
+    """
+    from rich.table import Table
 
-    if not hits:
-        terminal.print("[yellow]Nothing found.[/yellow]")
-        return
+    keys = [k.strip() for k in source.split(",") if k.strip()]
+    sources = {key: _resolve_source(key) for key in keys}
 
-    tbl = Table(title=f"Results from {source} ({len(hits)} datasets)")
-    tbl.add_column("#", style="dim", width=4)
-    tbl.add_column("Title", max_width=60)
-    tbl.add_column("Authors", max_width=30)
-    tbl.add_column("Published", width=12)
+    terminal.print(f"[bold]Searching {', '.join(keys)}[/bold] for '{query}'…")
+    results = _find_concurrently(sources, query, file_type)
 
-    for i, h in enumerate(hits, 1):
-        tbl.add_row(
-            str(i),
-            h.title[:60],
-            h.authors[:30] if h.authors else "",
-            h.date_published[:10] if h.date_published else "",
-        )
+    failure = None
+    for key, hits in results.items():
+        prefix = f"{key}: " if len(keys) > 1 else ""
+        if isinstance(hits, Exception):
+            terminal.print(f"[red]{prefix}Search failed: {hits}[/red]")
+            failure = failure or hits
+            continue
 
-    terminal.print(tbl)
+        if not hits:
+            terminal.print(f"[yellow]{prefix}Nothing found.[/yellow]")
+            continue
+
+        tbl = Table(title=f"Results from {key} ({len(hits)} datasets)")
+        tbl.add_column("#", style="dim", width=4)
+        tbl.add_column("Title", max_width=60)
+        tbl.add_column("Authors", max_width=30)
+        tbl.add_column("Published", width=12)
+
+        for i, h in enumerate(hits, 1):
+            tbl.add_row(
+                str(i),
+                h.title[:60],
+                h.authors[:30] if h.authors else "",
+                h.date_published[:10] if h.date_published else "",
+            )
+
+        terminal.print(tbl)
+
+    if failure is not None:
+        raise SystemExit(1) from failure
 
 
 @app.command()
@@ -451,7 +630,12 @@ def harvest(
     queries = _read_query_list(queries_file, query)
     size_cap = max_file_size * 1024 * 1024 if max_file_size else 0
 
-    dl, rest, skip = _run_source(src, source, queries, limit, size_cap)
+    session = open_session()
+    try:
+        dl, rest, skip = _run_source(src, source, queries, limit, size_cap, session)
+    finally:
+        session.close()
+        src.close()
 
     terminal.print(
         f"\n[bold]Finished.[/bold] Queries: {len(queries)}, "
@@ -474,7 +658,9 @@ def harvest(
 def collect_all(
     queries_file: str | None, limit: int | None, retries: int, max_file_size: int,
 ) -> None:
-    """Harvest every configured source in sequence with retry."""
+    """Harvest every configured source concurrently with retry."""
+    from harvester.sources import SOURCES
+
     # Fall back to queries.txt if it exists
     if queries_file is None:
         default = ROOT_DIR / "queries.txt"
@@ -492,16 +678,14 @@ def collect_all(
     results: dict[str, dict] = {}
     failures: list[str] = []
 
-    for key, src in SOURCES.items():
-        terminal.print(f"\n[bold cyan]>>> {key}[/bold cyan]")
-        try:
-            dl, rest, skip = _run_source(src, key, queries, limit, size_cap)
+    for key, counts, exc in _run_sources_concurrently(list(SOURCES), queries, limit, size_cap):
+        if exc is None:
+            dl, rest, skip = counts
             results[key] = {
                 "status": "OK", "downloaded": dl,
                 "restricted": rest, "skipped": skip, "error": None,
             }
-        except Exception as exc:
-            log.exception("Source %s failed entirely", key)
+        else:
             terminal.print(f"[red]{key} failed: {exc}[/red]")
             results[key] = {
                 "status": "FAILED", "downloaded": 0,
@@ -518,27 +702,28 @@ def collect_all(
             f"(attempt {attempt}/{retries})[/bold yellow]"
         )
         still_broken: list[str] = []
-        for key in failures:
-            src = SOURCES[key]
-            terminal.print(f"\n[bold cyan]>>> Retry: {key}[/bold cyan]")
-            try:
-                dl, rest, skip = _run_source(src, key, queries, limit, size_cap)
+        for key, counts, exc in _run_sources_concurrently(failures, queries, limit, size_cap):
+            if exc is None:
+                dl, rest, skip = counts
                 results[key] = {
                     "status": "OK", "downloaded": dl,
                     "restricted": rest, "skipped": skip, "error": None,
                 }
-            except Exception as exc:
-                log.exception("Retry %d for %s failed", attempt, key)
+            else:
                 terminal.print(f"[red]{key} retry failed: {exc}[/red]")
                 results[key]["error"] = str(exc)
                 still_broken.append(key)
         failures = still_broken
 
+    # Report in registry order rather than completion order
+    results = {key: results[key] for key in SOURCES if key in results}
     _show_collection_report(results)
 
 
 def _show_collection_report(results: dict[str, dict]) -> None:
     """Render a Rich summary table after collect-all finishes."""
+    from rich.table import Table
+
     tbl = Table(title="Collection Report")
     tbl.add_column("Source", style="bold", width=14)
     tbl.add_column("Status", width=8)
@@ -604,15 +789,20 @@ def wipe(yes: bool) -> None:
     gone = []
     from harvester.settings import DOWNLOAD_DIR as dl_dir
 
+    dispose_engine()
     if DATABASE_PATH.exists():
         DATABASE_PATH.unlink()
         gone.append(f"Database: {DATABASE_PATH}")
-    if dl_dir.exists():
-        shutil.rmtree(dl_dir)
-        gone.append(f"Downloads: {dl_dir}")
-    if OUTPUT_DIR.exists():
-        shutil.rmtree(OUTPUT_DIR)
-        gone.append(f"Output: {OUTPUT_DIR}")
+    # WAL sidecars must go too, or SQLite replays them into the new database
+    for suffix in ("-wal", "-shm"):
+        DATABASE_PATH.with_name(DATABASE_PATH.name + suffix).unlink(missing_ok=True)
+    # The two trees are independent; remove them side by side
+    trees = [(lbl, d) for lbl, d in (("Downloads", dl_dir), ("Output", OUTPUT_DIR)) if d.exists()]
+    with ThreadPoolExecutor(max_workers=max(1, len(trees))) as pool:
+        removals = [pool.submit(shutil.rmtree, d) for _, d in trees]
+    for (lbl, d), fut in zip(trees, removals):
+        fut.result()
+        gone.append(f"{lbl}: {d}")
     if LOG_PATH.exists():
         LOG_PATH.unlink()
         gone.append(f"Log: {LOG_PATH}")
@@ -627,18 +817,50 @@ def wipe(yes: bool) -> None:
     terminal.print("[bold]Wipe complete.[/bold]")
 
 
+# (heading, grouping column, label width, row limit) for each overview breakdown
+_BREAKDOWNS = (
+    ("By source:", File.source_name, 20, None),
+    ("By language:", File.language, 35, 10),
+    ("By software:", File.software, 35, None),
+    ("By file type:", File.file_type, 20, None),
+    ("By license:", File.license_type, 35, None),
+)
+
+
 @app.command()
 def overview() -> None:
     """Display collection statistics and breakdowns."""
     session = open_session()
     try:
-        total = session.query(File).count()
-        qda = session.query(File).filter(File.is_qda_file.is_(True)).count()
-        downloaded = session.query(File).filter(File.local_path.isnot(None)).count()
-
-        from sqlalchemy import case, func
-
-        restricted = session.query(File).filter(File.restricted.is_(True)).count()
+        # One table scan feeds both the headline counters and every breakdown.
+        rows = session.execute(
+            select(
+                *(col for _, col, _, _ in _BREAKDOWNS),
+                File.is_qda_file,
+                File.local_path.isnot(None),
+                File.restricted,
+            )
+        )
+        totals = [0, 0, 0, 0]
+        groups: list[dict] = [{} for _ in _BREAKDOWNS]
+        for *labels, is_qda, has_local, is_restricted in rows:
+            q, d, r = int(bool(is_qda)), int(bool(has_local)), int(bool(is_restricted))
+            totals[0] += 1
+            totals[1] += q
+            totals[2] += d
+            totals[3] += r
+            for group, label in zip(groups, labels):
+                if label is None:
+                    continue
+                c = group.get(label)
+                if c is None:
+                    c = group[label] = [0, 0, 0, 0]
+                c[0] += 1
+                c[1] += q
+                c[2] += d
+                c[3] += r
+
+        total, qda, downloaded, restricted = totals
         metadata_only = total - downloaded - restricted
 
         terminal.print(f"[bold]Total records:[/bold]    {total}")
@@ -648,14 +870,6 @@ def overview() -> None:
         terminal.print(f"  [yellow]Restricted:[/yellow]     {restricted}  (metadata only)")
         terminal.print(f"  [dim]Other:[/dim]          {metadata_only}  (metadata only)")
 
-        # Reusable aggregation expressions
-        c_total = func.count(File.id).label("total")
-        c_qda = func.sum(case((File.is_qda_file.is_(True), 1), else_=0)).label("qda")
-        c_dl = func.sum(case((File.local_path.isnot(None), 1), else_=0)).label("downloaded")
-        c_rest = func.sum(
-            case((File.restricted.is_(True), 1), else_=0)
-        ).label("restricted")
-
         def _breakdown(heading: str, rows: list, width: int = 30) -> None:
             if not rows:
                 return
@@ -665,55 +879,9 @@ def overview() -> None:
             for label, t, q, d, r in rows:
                 terminal.print(f"  {label:>{width}}  {t:>7}  {q:>5}  {d:>7}  {r:>7}")
 
-        # Per-source
-        by_source = (
-            session.query(File.source_name, c_total, c_qda, c_dl, c_rest)
-            .group_by(File.source_name)
-            .order_by(c_total.desc())
-            .all()
-        )
-        _breakdown("By source:", by_source, width=20)
-
-        # Language
-        by_lang = (
-            session.query(File.language, c_total, c_qda, c_dl, c_rest)
-            .filter(File.language.isnot(None))
-            .group_by(File.language)
-            .order_by(c_total.desc())
-            .limit(10)
-            .all()
-        )
-        _breakdown("By language:", by_lang, width=35)
-
-        # Software
-        by_sw = (
-            session.query(File.software, c_total, c_qda, c_dl, c_rest)
-            .filter(File.software.isnot(None))
-            .group_by(File.software)
-            .order_by(c_total.desc())
-            .all()
-        )
-        _breakdown("By software:", by_sw, width=35)
-
-        # File type
-        by_ext = (
-            session.query(File.file_type, c_total, c_qda, c_dl, c_rest)
-            .filter(File.file_type.isnot(None))
-            .group_by(File.file_type)
-            .order_by(c_total.desc())
-            .all()
-        )
-        _breakdown("By file type:", by_ext, width=20)
-
-        # License
-        by_lic = (
-            session.query(File.license_type, c_total, c_qda, c_dl, c_rest)
-            .filter(File.license_type.isnot(None))
-            .group_by(File.license_type)
-            .order_by(c_total.desc())
-            .all()
-        )
-        _breakdown("By license:", by_lic, width=35)
+        for (heading, _, width, limit), group in zip(_BREAKDOWNS, groups):
+            ranked = sorted(group.items(), key=lambda item: item[1][0], reverse=True)
+            _breakdown(heading, [(label, *c) for label, c in ranked[:limit]], width=width)
 
     finally:
         session.close()
@@ -730,7 +898,9 @@ def overview() -> None:
 @click.option("--file-type", "file_type", default=None, help="Exact extension filter (e.g. .pdf).")
 @click.option("--has-software", is_flag=True, help="Only records with software info.")
 @click.option("--has-keywords", is_flag=True, help="Only records with keywords.")
-@click.option("--limit", "-n", default=50, type=int, help="Maximum rows to show.")
+@click.option(
+    "--limit", "-n", default=50, type=click.IntRange(min=1), help="Maximum rows to show.",
+)
 def browse(
     source: str | None,
     qda_only: bool,
@@ -746,9 +916,16 @@ def browse(
     """Browse stored records in a table view."""
     session = open_session()
     try:
+        from rich.table import Table
         from sqlalchemy import or_
 
-        q = session.query(File)
+        # Only the displayed columns, plus a window count so the grand total
+        # comes back with the page instead of from a second COUNT query
+        q = session.query(
+            File.id, File.file_name, File.file_type, File.source_name,
+            File.is_qda_file, _RECORD_STATUS, File.file_size_bytes,
+            func.count().over().label("total"),
+        )
         if source:
             q = q.filter(File.source_name == source)
         if qda_only:
@@ -775,14 +952,7 @@ def browse(
         if has_keywords:
             q = q.filter(File.keywords.isnot(None))
 
-        total = q.count()
-        rows = q.order_by(File.id).limit(limit).all()
-
-        if not rows:
-            terminal.print("[yellow]No matching records.[/yellow]")
-            return
-
-        tbl = Table(title=f"Records ({total} total, showing {len(rows)})")
+        tbl = Table()
         tbl.add_column("ID", style="dim", width=5)
         tbl.add_column("File", max_width=40)
         tbl.add_column("Type", width=6)
@@ -791,14 +961,10 @@ def browse(
         tbl.add_column("Status", width=12)
         tbl.add_column("Size", width=10, justify="right")
 
-        for r in rows:
-            if r.local_path:
-                status = "[green]downloaded[/green]"
-            elif r.notes and "restricted" in r.notes:
-                status = "[yellow]restricted[/yellow]"
-            else:
-                status = "[dim]metadata[/dim]"
-
+        total = 0
+        for r in q.order_by(File.id).limit(limit).yield_per(200):
+            total = r.total
+            status = _STATUS_MARKUP[r.status]
             size = _human_size(r.file_size_bytes) if r.file_size_bytes else ""
             qda_mark = "[green]yes[/green]" if r.is_qda_file else ""
 
@@ -807,6 +973,12 @@ def browse(
                 r.source_name, qda_mark, status, size,
             )
 
+        # limit is at least 1, so an empty page means nothing matched at all
+        if not total:
+            terminal.print("[yellow]No matching records.[/yellow]")
+            return
+
+        tbl.title = f"Records ({total} total, showing {tbl.row_count})"
         terminal.print(tbl)
 
         if total > limit:
@@ -820,22 +992,18 @@ def browse(
 @click.argument("ids", nargs=-1, required=True, type=int)
 def detail(ids: tuple[int, ...]) -> None:
     """Show every field for one or more records by ID."""
+    from rich.panel import Panel
+
     session = open_session()
     try:
+        # One IN query for every requested ID; output still follows argument order
+        rows = session.query(File, _RECORD_STATUS).filter(File.id.in_(set(ids)))
+        found = {r.id: (r, status) for r, status in rows}
         for rid in ids:
-            r = session.query(File).filter_by(id=rid).first()
-            if not r:
+            if rid not in found:
                 terminal.print(f"[red]No record with ID {rid}.[/red]")
                 continue
-
-            from rich.panel import Panel
-
-            if r.local_path:
-                status = "downloaded"
-            elif r.notes and "restricted" in r.notes:
-                status = "restricted"
-            else:
-                status = "metadata only"
+            r, status = found[rid]
 
             size = _human_size(r.file_size_bytes) if r.file_size_bytes else "unknown"
 
@@ -896,18 +1064,39 @@ def detail(ids: tuple[int, ...]) -> None:
 @app.command("sources")
 def list_sources() -> None:
     """Show configured data sources."""
+    from harvester.sources import SOURCES
+
     terminal.print("[bold]Configured sources:[/bold]\n")
     for key, src in SOURCES.items():
         terminal.print(f"  {key:<15} {src.label:<40} [green]active[/green]")
 
 
+# (threshold, unit) from largest to smallest; the threshold is also the divisor
+_SIZE_UNITS = ((1 << 30, "GB"), (1 << 20, "MB"), (1 << 10, "KB"))
+
+
+@lru_cache(maxsize=4096)
 def _human_size(n: int) -> str:
-    """Format a byte count for display."""
-    if n < 1024:
-        return f"{n} B"
-    if n < 1024 * 1024:
-        return f"{n / 1024:.1f} KB"
-    return f"{n / (1024 * 1024):.1f} MB"
+    """Format a byte count for display (memoised: listings repeat sizes a lot)."""
+    for limit, unit in _SIZE_UNITS:
+        if n >= limit:
+            return f"{n / limit:.1f} {unit}"
+    return f"{n} B"
+
+
+# Record status computed by SQLite: downloaded if a local path is set, else
+# restricted if the notes say so (case-sensitive, like ``in``), else metadata
+_RECORD_STATUS = case(
+    (func.coalesce(File.local_path, "") != "", "downloaded"),
+    (func.instr(File.notes, "restricted") > 0, "restricted"),
+    else_="metadata only",
+).label("status")
+
+_STATUS_MARKUP = {
+    "downloaded": "[green]downloaded[/green]",
+    "restricted": "[yellow]restricted[/yellow]",
+    "metadata only": "[dim]metadata[/dim]",
+}
 
 
 if __name__ == "__main__":
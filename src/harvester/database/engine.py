@@ -2,15 +2,43 @@
 
 import logging
 
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from harvester.database.models import Base, File
 from harvester.settings import DATABASE_URL
 
 log = logging.getLogger("harvester")
 
-_engine = create_engine(DATABASE_URL, echo=False)
+# collect-all writes from several threads at once; wait for the lock
+# instead of failing immediately with "database is locked".  The pool keeps
+# one warm connection per worker so sessions don't reconnect per source.
+# (StaticPool would hand every worker's session the same sqlite3 connection
+# and interleave their transactions.)
+_engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args={"timeout": 30},
+    poolclass=QueuePool,
+    pool_size=8,
+    max_overflow=16,
+)
+
+
+@event.listens_for(_engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _record) -> None:
+    """Use WAL journaling so commits don't fsync and readers don't block writers."""
+    if _engine.dialect.name != "sqlite":
+        return
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.close()
+
 _SessionFactory = sessionmaker(bind=_engine)
 
 # Columns added after the initial release.  Keys are column names; values are
@@ -36,27 +64,95 @@ _EXTRA_COLUMNS: dict[str, str] = {
 }
 
 
+# Bump whenever _EXTRA_COLUMNS or the model's indexes change.  Stored in the
+# database as PRAGMA user_version once every migration has been applied.
+_SCHEMA_VERSION = 2
+
+
 def _apply_migrations() -> None:
     """Add any columns present in the model but missing in the table."""
+    with _engine.connect() as conn:
+        if conn.execute(text("PRAGMA user_version")).scalar() == _SCHEMA_VERSION:
+            return
+
     inspector = inspect(_engine)
     table = File.__tablename__
     if not inspector.has_table(table):
         return
 
     current_cols = {c["name"] for c in inspector.get_columns(table)}
+    missing = [(col, t) for col, t in _EXTRA_COLUMNS.items() if col not in current_cols]
+    if missing:
+        # One script, one transaction: a single prepare/commit for all ALTERs
+        script = "".join(f"ALTER TABLE {table} ADD COLUMN {c} {t};" for c, t in missing)
+        raw = _engine.raw_connection()
+        try:
+            raw.driver_connection.executescript(f"BEGIN;{script}COMMIT;")
+        finally:
+            raw.close()
+        for col, _ in missing:
+            log.info("Migration: added column %r to %s", col, table)
+
+    # Indexes declared on the model after the table was first created
+    current_idx = {ix["name"] for ix in inspector.get_indexes(table)}
+    for index in File.__table__.indexes:
+        if index.name in current_idx:
+            continue
+        with _engine.begin() as conn:
+            if index.unique:
+                removed = _drop_duplicates(conn, table, [c.name for c in index.columns])
+                if removed:
+                    log.info(
+                        "Migration: removed %d duplicate row(s) from %s before adding %r",
+                        removed, table, index.name,
+                    )
+            index.create(conn)
+        log.info("Migration: added index %r to %s", index.name, table)
+
+    # Everything above succeeded (or raised), so later starts can skip it
     with _engine.begin() as conn:
-        for col, col_type in _EXTRA_COLUMNS.items():
-            if col not in current_cols:
-                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {col_type}"))
-                log.info("Migration: added column %r to %s", col, table)
+        conn.execute(text(f"PRAGMA user_version = {_SCHEMA_VERSION}"))
+
+
+def _drop_duplicates(conn, table: str, columns: list[str]) -> int:
+    """Delete rows repeating an earlier row's *columns*; return how many went.
+
+    The oldest row (lowest id) of each group is kept, so a unique index on
+    *columns* can then be created.
+    """
+    key = ", ".join(columns)
+    result = conn.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {key})"
+    ))
+    return result.rowcount
+
+
+def _schema_is_current() -> bool:
+    """True when the table exists and carries the current schema stamp."""
+    with _engine.connect() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"),
+            {"n": File.__tablename__},
+        ).scalar()
+        return bool(exists) and (
+            conn.execute(text("PRAGMA user_version")).scalar() == _SCHEMA_VERSION
+        )
 
 
 def setup_database() -> None:
     """Create tables (if needed) and run pending migrations."""
+    # Common case: nothing to do, so skip create_all's per-table reflection
+    if _engine.dialect.name == "sqlite" and _schema_is_current():
+        return
     Base.metadata.create_all(_engine)
     _apply_migrations()
 
 
+def dispose_engine() -> None:
+    """Close pooled connections, e.g. before the database file is removed."""
+    _engine.dispose()
+
+
 def open_session() -> Session:
     """Return a fresh database session."""
     return _SessionFactory()
@@ -1,30 +1,53 @@
 """Write the full records table to a CSV file."""
 
 import csv
+from itertools import chain
 from pathlib import Path
 
-from sqlalchemy import inspect
+from sqlalchemy import select
 
 from harvester.database.engine import open_session
 from harvester.database.models import File
 
+# Rows fetched per round trip; bounds memory regardless of table size.
+_CHUNK_ROWS = 10_000
+# Output buffer: one write() per MiB instead of per few rows.
+_WRITE_BUFFER = 1024 * 1024
+
 
 def write_csv(destination: Path) -> int:
-    """Dump every record to *destination* and return the row count."""
+    """Dump every record to *destination* and return the row count.
+
+    The query runs as a plain Core ``SELECT`` on the session's connection,
+    bypassing the ORM result layer; rows come back as tuples in chunks and
+    go straight into ``csv.writer.writerows``.
+    """
     session = open_session()
     try:
-        rows = session.query(File).all()
-        if not rows:
+        table = File.__table__
+        col_names = [c.name for c in table.columns]
+        # Core execution skips ORM entity/compile bookkeeping while keeping
+        # the column type processors, so dates and booleans render as before.
+        # yield_per streams in fixed batches, so the table is never buffered whole
+        result = session.connection().execute(
+            select(table).execution_options(yield_per=_CHUNK_ROWS),
+        )
+        chunks = result.partitions()
+
+        first = next(chunks, None)
+        if not first:
             return 0
 
-        col_names = [attr.key for attr in inspect(File).mapper.column_attrs]
-
-        with open(destination, "w", newline="", encoding="utf-8") as fh:
+        count = 0
+        with open(
+            destination, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER,
+        ) as fh:
             writer = csv.writer(fh)
             writer.writerow(col_names)
-            for row in rows:
-                writer.writerow([getattr(row, c) for c in col_names])
+            for chunk in chain([first], chunks):
+                writer.writerows(chunk)
+                count += len(chunk)
 
-        return len(rows)
+        return count
     finally:
         session.close()
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -14,6 +14,12 @@ class File(Base):
     """Metadata record for a downloaded file."""
 
     __tablename__ = "files"
+    # Backs the per-dataset duplicate lookups and lets inserts skip rows that
+    # already exist.  file_name is part of the key because some sources (FSD)
+    # list several files without a download URL.
+    __table_args__ = (
+        Index("ix_files_source_url_name", "source_name", "download_url", "file_name", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
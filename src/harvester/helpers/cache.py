@@ -0,0 +1,148 @@
+"""On-disk cache of raw API response bodies, keyed by URL and query params."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+log = logging.getLogger("harvester")
+
+# Seconds a cached body stays fresh, per kind of request
+TTLS: dict[str, float] = {
+    "search": 60 * 60,
+    "metadata": 24 * 60 * 60,
+}
+
+# In-process layer in front of the files: entries and how long they are trusted
+_MEMORY_SIZE = 512
+_MEMORY_TTL = 60.0
+
+
+class ResponseCache:
+    """Cache-aside store for JSON API responses under *root*.
+
+    Each entry is one file holding the body exactly as the server sent it,
+    at ``<root>/<kind>/<xx>/<sha256 of url+params>``; its mtime is the
+    fetch time, so freshness is a single ``stat``.  Writes go to a temp
+    file and are renamed into place, so concurrent workers never read a
+    partial entry.  A *root* of ``None`` disables the cache, and I/O errors
+    only cost a cache miss.
+
+    Hot entries are also kept in a small in-memory LRU for up to a minute,
+    so repeated lookups within a run skip the ``stat`` and the read.
+
+    When the server sent an ``ETag`` or ``Last-Modified`` header, those are
+    kept in a ``<digest>.hdr`` file next to the body; once the entry has
+    expired, :meth:`revalidation` turns them into conditional request
+    headers so an unchanged resource costs a bodiless 304.
+    """
+
+    def __init__(self, root: Path | None, ttls: dict[str, float] = TTLS) -> None:
+        self._root = root
+        self._ttls = ttls
+        self._memory: OrderedDict[Path, tuple[float, bytes]] = OrderedDict()
+        self._memory_lock = threading.Lock()
+
+    def _path(self, kind: str, url: str, params) -> Path:
+        key = json.dumps([url, params], sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self._root / kind / digest[:2] / digest
+
+    def get(self, kind: str, url: str, params=None) -> bytes | None:
+        """Return the cached body if it is younger than the kind's TTL."""
+        if self._root is None:
+            return None
+        path = self._path(kind, url, params)
+        now = time.monotonic()
+        with self._memory_lock:
+            entry = self._memory.get(path)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(path)
+                    return entry[1]
+                del self._memory[path]
+        try:
+            age = time.time() - path.stat().st_mtime
+            ttl = self._ttls[kind]
+            if age > ttl:
+                return None
+            body = path.read_bytes()
+        except OSError:
+            return None
+        log.debug("Cache hit (%s) %s", kind, url)
+        self._remember(path, body, now + min(_MEMORY_TTL, ttl - age))
+        return body
+
+    def put(
+        self, kind: str, url: str, params, body: bytes,
+        etag: str | None = None, last_modified: str | None = None,
+    ) -> None:
+        """Store *body* as the fresh response for this request."""
+        if self._root is None:
+            return
+        path = self._path(kind, url, params)
+        self._remember(path, body, time.monotonic() + min(_MEMORY_TTL, self._ttls[kind]))
+        validators = {}
+        if etag:
+            validators["If-None-Match"] = etag
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(path, body)
+            if validators:
+                _write_atomic(path.with_suffix(".hdr"), json.dumps(validators).encode())
+            else:
+                path.with_suffix(".hdr").unlink(missing_ok=True)
+        except OSError as exc:
+            log.debug("Cache write failed for %s: %s", url, exc)
+
+    def revalidation(self, kind: str, url: str, params=None) -> tuple[bytes, dict] | None:
+        """Return an expired entry's body and the headers to revalidate it with.
+
+        ``None`` when there is no entry or the server gave no validators.
+        """
+        if self._root is None:
+            return None
+        path = self._path(kind, url, params)
+        try:
+            headers = json.loads(path.with_suffix(".hdr").read_bytes())
+            body = path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return body, headers
+
+    def refresh(self, kind: str, url: str, params, body: bytes) -> None:
+        """Mark an entry fresh again after the server answered 304 Not Modified."""
+        if self._root is None:
+            return
+        path = self._path(kind, url, params)
+        self._remember(path, body, time.monotonic() + min(_MEMORY_TTL, self._ttls[kind]))
+        try:
+            os.utime(path)
+        except OSError as exc:
+            log.debug("Cache refresh failed for %s: %s", url, exc)
+
+    def _remember(self, path: Path, body: bytes, expires: float) -> None:
+        with self._memory_lock:
+            self._memory[path] = (expires, body)
+            self._memory.move_to_end(path)
+            if len(self._memory) > _MEMORY_SIZE:
+                self._memory.popitem(last=False)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write *data* to a temp file beside *path* and rename it into place."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
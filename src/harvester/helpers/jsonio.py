@@ -0,0 +1,19 @@
+"""JSON decoding for API responses, using orjson when it is installed."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speed-up: pip install qdarchive-harvester[fast]
+    orjson = None
+
+
+def loads(data: bytes | str):
+    """Decode a JSON document from raw response bytes.
+
+    orjson parses large metadata blobs several times faster than the
+    standard library; both accept bytes directly, so no decode step.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
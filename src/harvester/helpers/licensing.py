@@ -1,6 +1,7 @@
 """Determine whether a dataset's license allows harvesting."""
 
 import re
+from functools import lru_cache
 
 # Prefixes / identifiers that we consider open enough to collect.
 _ACCEPTED = {
@@ -44,25 +45,35 @@ _OPEN_PHRASES = [
 ]
 
 
+_ACCEPTED_PREFIXES = tuple(_ACCEPTED)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+# All phrases in one alternation: a single scan of the text instead of one per phrase
+_OPEN_PHRASE_RE = re.compile("|".join(re.escape(p) for p in _OPEN_PHRASES))
+
+
+@lru_cache(maxsize=4096)
 def license_is_open(identifier: str | None) -> bool:
     """Check whether *identifier* matches any known open-license prefix.
 
     Handles both short identifiers ("CC BY 4.0") and long license text
     blocks that some Dataverse installations store in termsOfAccess.
+    Results are memoised: a harvest sees the same few license strings
+    over and over.
     """
     if not identifier:
         return False
 
     # Strip HTML tags and collapse whitespace for long termsOfAccess blobs
-    cleaned = re.sub(r"<[^>]+>", " ", identifier)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _TAG_RE.sub(" ", identifier)
+    cleaned = _WS_RE.sub(" ", cleaned).strip()
 
-    canonical = cleaned.lower().replace(" ", "-").replace("_", "-")
+    lower = cleaned.lower()
+    canonical = lower.replace(" ", "-").replace("_", "-")
 
     # Direct prefix match (works for short identifiers)
-    if any(canonical.startswith(prefix) for prefix in _ACCEPTED):
+    if canonical.startswith(_ACCEPTED_PREFIXES):
         return True
 
     # Substring search for open-license phrases buried in long text
-    lower = cleaned.lower()
-    return any(phrase in lower for phrase in _OPEN_PHRASES)
+    return _OPEN_PHRASE_RE.search(lower) is not None
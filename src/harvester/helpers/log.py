@@ -1,6 +1,9 @@
 """Configure Rich console + file logging."""
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from rich.console import Console
 from rich.logging import RichHandler
@@ -13,7 +16,12 @@ _ready = False
 
 
 def init_logging(level: int = logging.INFO) -> logging.Logger:
-    """Set up the 'harvester' logger (idempotent)."""
+    """Set up the 'harvester' logger (idempotent).
+
+    The logger itself only enqueues records; a background listener does the
+    Rich rendering and file writes, so download and search threads never
+    block on terminal or disk I/O.
+    """
     global _ready
 
     logger = logging.getLogger("harvester")
@@ -26,13 +34,18 @@ def init_logging(level: int = logging.INFO) -> logging.Logger:
     ch = RichHandler(console=terminal, show_path=False, markup=True)
     ch.setLevel(level)
 
-    # Persistent log file
-    fh = logging.FileHandler(LOG_PATH, encoding="utf-8")
+    # Persistent log file (opened on the first record, not at import)
+    fh = logging.FileHandler(LOG_PATH, encoding="utf-8", delay=True)
     fh.setLevel(logging.DEBUG)
     fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(name)s — %(message)s"))
 
-    logger.addHandler(ch)
-    logger.addHandler(fh)
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(records, ch, fh, respect_handler_level=True)
+    listener.start()
+    # Drain whatever is still queued before the interpreter exits
+    atexit.register(listener.stop)
+
+    logger.addHandler(QueueHandler(records))
 
     _ready = True
     return logger
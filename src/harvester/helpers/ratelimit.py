@@ -0,0 +1,118 @@
+"""Client-side request pacing shared by the API sources."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class Throttle:
+    """Space calls at least *interval* seconds apart, across threads.
+
+    Each caller reserves the next free slot under the lock and sleeps
+    outside it, so concurrent workers wait in parallel for their own slot
+    instead of queueing on the lock behind someone else's sleep.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TokenBucket:
+    """Allow bursts of up to *capacity* calls, refilled at *rate* calls per second.
+
+    Drop-in for :class:`Throttle` where an API documents an average rate
+    rather than a minimum gap: idle time banks tokens, so a short search
+    goes out back to back while a long one settles at *rate*.  A caller
+    that finds the bucket empty takes a token on credit and sleeps off the
+    deficit outside the lock, like ``Throttle`` does with its slots.
+    """
+
+    def __init__(self, capacity: float, rate: float) -> None:
+        self._capacity = capacity
+        self._rate = rate
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Take one token, blocking until it has been refilled if necessary."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            self._tokens -= 1
+            deficit = -self._tokens
+        if deficit > 0:
+            time.sleep(deficit / self._rate)
+
+    def sync(self, remaining: int, reset_in: float) -> None:
+        """Re-peg the bucket to a quota the server reported.
+
+        *remaining* calls are left in a window that resets in *reset_in*
+        seconds.  The refill rate becomes that quota spread evenly over the
+        window, so plenty of headroom means little or no sleeping, and an
+        exhausted quota holds callers until the reset.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            if reset_in > 0:
+                self._rate = max(remaining, 1) / reset_in
+            self._tokens = min(self._tokens, remaining)
+
+
+def backoff(attempt: int, base: float) -> float:
+    """Seconds to wait before retry number *attempt* (1-based).
+
+    Exponential in the attempt, scaled by a random factor in [0.5, 1.5) so
+    workers that were rate-limited together don't all retry at the same
+    instant and trip the limit again.
+    """
+    return base * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+
+
+def quota_from_headers(headers) -> tuple[int, float] | None:
+    """``(remaining, seconds_to_reset)`` from ``X-RateLimit-*`` headers, if sent.
+
+    ``X-RateLimit-Reset`` is accepted both as a delay in seconds and as an
+    epoch timestamp.
+    """
+    remaining = headers.get("x-ratelimit-remaining")
+    reset = headers.get("x-ratelimit-reset")
+    if remaining is None or reset is None:
+        return None
+    try:
+        remaining_n, reset_s = int(remaining), float(reset)
+    except ValueError:
+        return None
+    if reset_s > 1e9:  # epoch seconds
+        reset_s -= time.time()
+    return max(remaining_n, 0), max(reset_s, 0.0)
+
+
+def retry_after(headers) -> float | None:
+    """Seconds a 429/503 response's ``Retry-After`` asks for, if it says."""
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
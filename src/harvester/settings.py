@@ -1,5 +1,6 @@
 """Load project settings from config.yml and derive runtime paths."""
 
+import os
 from pathlib import Path
 
 import yaml
@@ -7,8 +8,10 @@ import yaml
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 
 _config_file = ROOT_DIR / "config.yml"
+# libyaml's C loader when PyYAML was built with it; same safe subset either way
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 with open(_config_file, encoding="utf-8") as _f:
-    _raw = yaml.safe_load(_f)
+    _raw = yaml.load(_f, Loader=_Loader)
 
 # ── Paths (resolved relative to project root) ──
 DOWNLOAD_DIR = ROOT_DIR / _raw["paths"]["downloads"]
@@ -18,13 +21,28 @@ LOG_PATH = ROOT_DIR / _raw["paths"]["log"]
 
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
+# API response cache: HARVESTER_CACHE_DIR moves it, an empty value turns it off
+_cache_env = os.environ.get("HARVESTER_CACHE_DIR")
+if _cache_env is None:
+    CACHE_DIR: Path | None = Path.home() / ".cache" / "harvester"
+else:
+    CACHE_DIR = Path(_cache_env).expanduser() if _cache_env else None
+
+# Local mirror of repository files: file:// download links are only followed
+# inside this directory (unset = never, since links come from remote metadata)
+_mirror_env = os.environ.get("HARVESTER_MIRROR_DIR")
+MIRROR_DIR: Path | None = Path(_mirror_env).expanduser() if _mirror_env else None
+
+# Opt-in: write downloads with O_DIRECT (Linux), bypassing the page cache
+DIRECT_IO = os.environ.get("HARVESTER_O_DIRECT", "") not in ("", "0")
+
 # ── File type sets ──
-QDA_FORMATS: set[str] = set(_raw.get("qda_formats", []))
-QUALITATIVE_FORMATS: set[str] = set(_raw.get("qualitative_formats", []))
+QDA_FORMATS: frozenset[str] = frozenset(_raw.get("qda_formats", []))
+QUALITATIVE_FORMATS: frozenset[str] = frozenset(_raw.get("qualitative_formats", []))
 
 # ── Filtering rules ──
-EXCLUDED_RESOURCE_TYPES: set[str] = set(_raw.get("excluded_resource_types", []))
-RELEVANCE_KEYWORDS: set[str] = set(_raw.get("relevance_keywords", []))
+EXCLUDED_RESOURCE_TYPES: frozenset[str] = frozenset(_raw.get("excluded_resource_types", []))
+RELEVANCE_KEYWORDS: frozenset[str] = frozenset(_raw.get("relevance_keywords", []))
 
 # ── Source → folder mapping ──
 FOLDER_NAMES: dict[str, str] = _raw.get("folder_names", {})
@@ -1,42 +1,107 @@
-"""Source registry — maps short keys to ready-to-use source instances."""
-
-from harvester.sources.base import BaseSource, DatasetHit
-from harvester.sources.dataverse import DataverseSource, _BROWSER_UA
-from harvester.sources.figshare import FigshareSource
-from harvester.sources.fsd import FSDSource
-from harvester.sources.ia import IASource
-from harvester.sources.loc import LOCSource
-from harvester.sources.osf import OSFSource
-
-SOURCES: dict[str, BaseSource] = {
-    "qdr": DataverseSource("https://data.qdr.syr.edu", "qdr"),
-    "borealis": DataverseSource("https://borealisdata.ca", "borealis"),
-    "dataversenl": DataverseSource("https://dataverse.nl", "dataversenl"),
-    "sciencespo": DataverseSource("https://data.sciencespo.fr", "sciencespo"),
-    "rdg": DataverseSource("https://entrepot.recherche.data.gouv.fr", "rdg"),
-    "abacus": DataverseSource("https://abacus.library.ubc.ca", "abacus"),
-    "jhu": DataverseSource("https://archive.data.jhu.edu", "jhu"),
-    "cora": DataverseSource("https://dataverse.csuc.cat", "cora"),
-    "ucla": DataverseSource("https://dataverse.ucla.edu", "ucla"),
-    "drntu": DataverseSource("https://researchdata.ntu.edu.sg", "drntu"),
-    "goettingen": DataverseSource("https://data.goettingen-research-online.de", "goettingen"),
-    "nie": DataverseSource("https://researchdata.nie.edu.sg", "nie"),
-    "figshare": FigshareSource(),
-    "osf": OSFSource(),
-    "fsd": FSDSource(),
-    "ia": IASource(),
-    "loc": LOCSource(),
-    "eciencia": DataverseSource("https://edatos.consorciomadrono.es", "eciencia"),
-    "scielo": DataverseSource(
-        "https://data.scielo.org", "scielo",
-        headers={"User-Agent": _BROWSER_UA},
+"""Source registry — maps short keys to ready-to-use source instances.
+
+Backends are imported and instantiated on first lookup, so commands that
+never talk to a source (dump, overview, detail, …) skip httpx, bs4 and
+twenty constructor calls.
+"""
+
+import importlib
+import threading
+from collections.abc import Callable, Iterator, Mapping
+
+from harvester.sources.base import BaseSource, DatasetHit, FileEntry
+
+# key → (backend module, factory called with that module)
+_Spec = tuple[str, Callable[..., BaseSource]]
+
+
+def _dataverse(host: str, key: str) -> _Spec:
+    return "dataverse", lambda mod: mod.DataverseSource(host, key)
+
+
+_SOURCE_SPECS: dict[str, _Spec] = {
+    "qdr": _dataverse("https://data.qdr.syr.edu", "qdr"),
+    "borealis": _dataverse("https://borealisdata.ca", "borealis"),
+    "dataversenl": _dataverse("https://dataverse.nl", "dataversenl"),
+    "sciencespo": _dataverse("https://data.sciencespo.fr", "sciencespo"),
+    "rdg": _dataverse("https://entrepot.recherche.data.gouv.fr", "rdg"),
+    "abacus": _dataverse("https://abacus.library.ubc.ca", "abacus"),
+    "jhu": _dataverse("https://archive.data.jhu.edu", "jhu"),
+    "cora": _dataverse("https://dataverse.csuc.cat", "cora"),
+    "ucla": _dataverse("https://dataverse.ucla.edu", "ucla"),
+    "drntu": _dataverse("https://researchdata.ntu.edu.sg", "drntu"),
+    "goettingen": _dataverse("https://data.goettingen-research-online.de", "goettingen"),
+    "nie": _dataverse("https://researchdata.nie.edu.sg", "nie"),
+    "figshare": ("figshare", lambda mod: mod.FigshareSource()),
+    "osf": ("osf", lambda mod: mod.OSFSource()),
+    "fsd": ("fsd", lambda mod: mod.FSDSource()),
+    "ia": ("ia", lambda mod: mod.IASource()),
+    "loc": ("loc", lambda mod: mod.LOCSource()),
+    "eciencia": _dataverse("https://edatos.consorciomadrono.es", "eciencia"),
+    "scielo": (
+        "dataverse",
+        lambda mod: mod.DataverseSource(
+            "https://data.scielo.org", "scielo",
+            headers={"User-Agent": mod._BROWSER_UA},
+        ),
     ),
 }
 
+
+class _LazySources(Mapping[str, BaseSource]):
+    """Read-only registry that builds each source the first time it is looked up."""
+
+    def __init__(self, specs: dict[str, _Spec]) -> None:
+        self._specs = specs
+        self._built: dict[str, BaseSource] = {}
+        self._lock = threading.Lock()  # collect-all looks sources up from worker threads
+
+    def __getitem__(self, key: str) -> BaseSource:
+        src = self._built.get(key)
+        if src is not None:
+            return src
+        module, factory = self._specs[key]
+        with self._lock:
+            if key not in self._built:
+                mod = importlib.import_module(f"harvester.sources.{module}")
+                self._built[key] = factory(mod)
+            return self._built[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._specs
+
+
+SOURCES: Mapping[str, BaseSource] = _LazySources(_SOURCE_SPECS)
+
+# Backend classes stay importable from the package, loaded on demand
+_CLASS_MODULES = {
+    "DataverseSource": "dataverse",
+    "FigshareSource": "figshare",
+    "FSDSource": "fsd",
+    "IASource": "ia",
+    "LOCSource": "loc",
+    "OSFSource": "osf",
+}
+
+
+def __getattr__(name: str):
+    if name in _CLASS_MODULES:
+        mod = importlib.import_module(f"harvester.sources.{_CLASS_MODULES[name]}")
+        return getattr(mod, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "SOURCES",
     "BaseSource",
     "DatasetHit",
+    "FileEntry",
     "DataverseSource",
     "FigshareSource",
     "FSDSource",
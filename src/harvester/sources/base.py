@@ -1,8 +1,41 @@
 """Interface that every data source must satisfy."""
 
+import copy
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 
+from harvester.storage.files import StreamDigest
+
+
+@dataclass(slots=True)
+class FileEntry:
+    """One downloadable file of a dataset, as listed in ``DatasetHit.files``.
+
+    Slotted, so large file lists stay small.  ``entry["name"]`` and
+    ``entry.get(...)`` still work, letting consumers treat these and the
+    plain dicts some sources return the same way.
+    """
+
+    id: str
+    name: str
+    size: int
+    download_url: str
+    content_type: str = ""
+    restricted: bool = False
+    api_checksum: str = ""
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
 
 @dataclass
 class DatasetHit:
@@ -29,12 +62,44 @@ class DatasetHit:
     time_period_covered: str = ""
     uploader_name: str = ""
     uploader_email: str = ""
-    files: list[dict] = field(default_factory=list)
+    files: list[FileEntry | dict] = field(default_factory=list)
+
+
+class HitCache:
+    """Bounded, thread-safe LRU of parsed metadata hits keyed by dataset URL.
+
+    Sources consult it before a metadata round trip.  Hits are copied in and
+    out so callers can't alter what later lookups see.
+    """
+
+    def __init__(self, maxsize: int = 2048) -> None:
+        self._maxsize = maxsize
+        self._hits: OrderedDict[str, DatasetHit] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> DatasetHit | None:
+        with self._lock:
+            hit = self._hits.get(key)
+            if hit is None:
+                return None
+            self._hits.move_to_end(key)
+        return copy.deepcopy(hit)
+
+    def put(self, key: str, hit: DatasetHit) -> None:
+        hit = copy.deepcopy(hit)
+        with self._lock:
+            self._hits[key] = hit
+            self._hits.move_to_end(key)
+            if len(self._hits) > self._maxsize:
+                self._hits.popitem(last=False)
 
 
 class BaseSource(ABC):
     """Contract for pluggable data sources."""
 
+    # Concurrent streams in pull_files; sources whose file host is shared lower it
+    download_workers: int = 8
+
     @property
     @abstractmethod
     def label(self) -> str:
@@ -48,6 +113,73 @@ class BaseSource(ABC):
     def fetch_metadata(self, url: str) -> DatasetHit:
         """Retrieve the complete metadata for a single dataset."""
 
+    def fetch_metadata_bulk(
+        self, urls: Iterable[str], workers: int = 4,
+    ) -> Iterator[DatasetHit | Exception]:
+        """Yield ``fetch_metadata(url)`` for each of *urls*, in order.
+
+        Up to *workers* lookups run ahead of the consumer on a thread pool,
+        so metadata for the next datasets arrives while the current one is
+        being processed; the source's own rate limiter still paces them.  A
+        failed lookup is yielded as its exception instead of ending the batch.
+        """
+        todo = iter(urls)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            ahead: deque[Future] = deque(
+                pool.submit(self.fetch_metadata, url) for _, url in zip(range(workers), todo)
+            )
+            while ahead:
+                future = ahead.popleft()
+                url = next(todo, None)
+                if url is not None:
+                    ahead.append(pool.submit(self.fetch_metadata, url))
+                exc = future.exception()
+                yield exc if exc is not None else future.result()
+
     @abstractmethod
-    def pull_file(self, url: str, dest_dir: str, filename: str | None = None) -> str:
-        """Download one file and return its local path."""
+    def pull_file(
+        self, url: str, dest_dir: str, filename: str | None = None,
+        hasher: StreamDigest | None = None,
+    ) -> str:
+        """Download one file and return its local path.
+
+        When *hasher* is given, every chunk written is also fed to it so the
+        caller gets the file's digest without reading it back from disk.
+        """
+
+    def pull_files(
+        self, urls: list[str], dest_dirs: str | list[str],
+        filenames: list[str | None] | None = None,
+        hashers: list[StreamDigest | None] | None = None,
+    ) -> list[str | Exception]:
+        """Download several files concurrently with ``pull_file``, in *urls* order.
+
+        *dest_dirs* is either one directory for every file or one per URL;
+        *filenames* and *hashers*, when given, pair up with *urls* too.  Up to
+        ``download_workers`` streams share the source's pooled client.  A
+        failed download comes back as its exception instead of ending the
+        batch, so the caller can handle each file on its own.
+        """
+        if not urls:
+            return []
+        if isinstance(dest_dirs, str):
+            dest_dirs = [dest_dirs] * len(urls)
+        filenames = filenames or [None] * len(urls)
+        hashers = hashers or [None] * len(urls)
+        with ThreadPoolExecutor(max_workers=min(self.download_workers, len(urls))) as pool:
+            futures = [
+                pool.submit(self.pull_file, url, dest, filename=name, hasher=h)
+                for url, dest, name, h in zip(urls, dest_dirs, filenames, hashers)
+            ]
+        return [
+            exc if (exc := fut.exception()) is not None else fut.result() for fut in futures
+        ]
+
+    def close(self) -> None:
+        """Release pooled network connections; sources without any keep the no-op."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
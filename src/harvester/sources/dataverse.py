@@ -1,13 +1,20 @@
 """Generic Dataverse API source — instantiated once per installation."""
 
+import html
 import logging
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import httpx
 
+from harvester.helpers.jsonio import loads
+from harvester.helpers.ratelimit import backoff
 from harvester.sources.base import BaseSource, DatasetHit
+from harvester.storage.files import DOWNLOAD_CHUNK, StreamDigest, declared_length, write_stream
 
 log = logging.getLogger("harvester")
 
@@ -16,9 +23,13 @@ _API_TIMEOUT = 30.0
 _DOWNLOAD_TIMEOUT = 120.0
 _RETRY_LIMIT = 3
 _INITIAL_BACKOFF = 2.0       # doubled on each subsequent attempt
+# Keep-alive pool shared by searches, metadata lookups and the download workers
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
 
 # Guard against enormous result sets on large installations
 _SEARCH_CAP = 500
+_PAGE_SIZE = 100
+_PAGE_WORKERS = 4            # concurrent search-page requests per query
 
 # Some Dataverse hosts (e.g. SciELO) block the default python-httpx User-Agent
 # while others (e.g. Sciences Po) block browser-style UAs.  Allow per-instance
@@ -42,42 +53,64 @@ class DataverseSource(BaseSource):
         self._host = host_url.rstrip("/")
         self._key = key
         self._headers = headers or {}
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
 
     @property
     def label(self) -> str:
         return self._key
 
+    @property
+    def _client(self) -> httpx.Client:
+        """Connection-pooling client, created on first use.
+
+        Built lazily so the registry's many idle installations never pay
+        for a TLS context; the lock covers concurrent first use by the
+        download workers.
+        """
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        headers=self._headers,
+                        timeout=_API_TIMEOUT,
+                        limits=_POOL_LIMITS,
+                        follow_redirects=True,
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close the pooled client; a later request opens a fresh one."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
     # ── Search ──────────────────────────────────────────────
 
     def find(self, query: str, file_type: str | None = None) -> list[DatasetHit]:
-        """Paginate through the Dataverse search endpoint."""
-        hits: list[DatasetHit] = []
-        page_size = 100
-        offset = 0
-        reported_total = 0
-
-        while True:
-            params: dict[str, str | int] = {
-                "q": query,
-                "type": "dataset",
-                "per_page": page_size,
-                "start": offset,
-                "fq": "-isHarvested:true",
-            }
-
-            r = httpx.get(
-                f"{self._host}/api/search",
-                params=params,
-                headers=self._headers,
-                timeout=_API_TIMEOUT,
-            )
-            r.raise_for_status()
-            payload = r.json().get("data", {})
+        """Paginate through the Dataverse search endpoint.
+
+        The first page reports the total, so the remaining pages (up to the
+        cap) are requested concurrently and merged back in page order.
+        """
+        first = self._search_page(query, 0)
+        pages = [first.get("items", [])]
+        reported_total = first.get("total_count", 0)
+
+        offsets = range(_PAGE_SIZE, min(reported_total, _SEARCH_CAP), _PAGE_SIZE)
+        if pages[0] and offsets:
+            workers = min(_PAGE_WORKERS, len(offsets))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                pages.extend(
+                    payload.get("items", [])
+                    for payload in pool.map(lambda o: self._search_page(query, o), offsets)
+                )
 
-            items = payload.get("items", [])
+        hits: list[DatasetHit] = []
+        for items in pages:
             if not items:
                 break
-
             for item in items:
                 hit = DatasetHit(
                     source_name=self._key,
@@ -93,11 +126,6 @@ class DataverseSource(BaseSource):
                     hit.source_url = f"{self._host}/dataset.xhtml?persistentId={pid}"
                 hits.append(hit)
 
-            reported_total = payload.get("total_count", 0)
-            offset += page_size
-            if offset >= reported_total or len(hits) >= _SEARCH_CAP:
-                break
-
         if len(hits) > _SEARCH_CAP:
             hits = hits[:_SEARCH_CAP]
 
@@ -111,6 +139,19 @@ class DataverseSource(BaseSource):
 
         return hits
 
+    def _search_page(self, query: str, offset: int) -> dict:
+        """Fetch one page of search results and return its ``data`` payload."""
+        params: dict[str, str | int] = {
+            "q": query,
+            "type": "dataset",
+            "per_page": _PAGE_SIZE,
+            "start": offset,
+            "fq": "-isHarvested:true",
+        }
+        r = self._client.get(f"{self._host}/api/search", params=params)
+        r.raise_for_status()
+        return loads(r.content).get("data", {})
+
     # ── Full metadata ───────────────────────────────────────
 
     def fetch_metadata(self, url: str) -> DatasetHit:
@@ -118,22 +159,16 @@ class DataverseSource(BaseSource):
         pid = self._parse_persistent_id(url)
 
         if pid:
-            r = httpx.get(
+            r = self._client.get(
                 f"{self._host}/api/datasets/:persistentId",
                 params={"persistentId": pid},
-                headers=self._headers,
-                timeout=_API_TIMEOUT,
             )
         else:
             numeric_id = url.rstrip("/").split("/")[-1]
-            r = httpx.get(
-                f"{self._host}/api/datasets/{numeric_id}",
-                headers=self._headers,
-                timeout=_API_TIMEOUT,
-            )
+            r = self._client.get(f"{self._host}/api/datasets/{numeric_id}")
 
         r.raise_for_status()
-        blob = r.json().get("data", {})
+        blob = loads(r.content).get("data", {})
         latest = blob.get("latestVersion", {})
         blocks = latest.get("metadataBlocks", {})
         citation = blocks.get("citation", {})
@@ -148,26 +183,11 @@ class DataverseSource(BaseSource):
             raw_html = desc_entries[0].get("dsDescriptionValue", {}).get("value", "")
             description = _clean_html(raw_html)
 
-        # Authors
-        author_entries = _field_val(fld, "author", [])
-        author_names = []
-        if isinstance(author_entries, list):
-            for a in author_entries:
-                n = a.get("authorName", {}).get("value", "")
-                if n:
-                    author_names.append(n)
+        # Compound fields reduced to their primary sub-field values
+        compound = {key: _compound_values(fld, key, sub) for key, sub in _LIST_FIELDS}
 
         subject_vals = _field_val(fld, "subject", [])
 
-        # Keywords
-        kw_entries = _field_val(fld, "keyword", [])
-        kw_list = []
-        if isinstance(kw_entries, list):
-            for entry in kw_entries:
-                v = entry.get("keywordValue", {}).get("value", "")
-                if v:
-                    kw_list.append(v)
-
         kind_of_data = _field_val(fld, "kindOfData", [])
         if not isinstance(kind_of_data, list):
             kind_of_data = []
@@ -176,38 +196,11 @@ class DataverseSource(BaseSource):
         if not isinstance(lang_vals, list):
             lang_vals = []
 
-        # Software
-        sw_entries = _field_val(fld, "software", [])
-        software_list = []
-        if isinstance(sw_entries, list):
-            for sw in sw_entries:
-                v = sw.get("softwareName", {}).get("value", "")
-                if v:
-                    software_list.append(v)
-
-        # Geographic coverage
-        geo_entries = _field_val(fld, "geographicCoverage", [])
-        geo_list = []
-        if isinstance(geo_entries, list):
-            for g in geo_entries:
-                country = g.get("country", {}).get("value", "")
-                if country:
-                    geo_list.append(country)
-
         # Depositor
         depositor = _field_val(fld, "depositor", "")
         if not isinstance(depositor, str):
             depositor = ""
 
-        # Producers
-        prod_entries = _field_val(fld, "producer", [])
-        producers = []
-        if isinstance(prod_entries, list):
-            for p in prod_entries:
-                n = p.get("producerName", {}).get("value", "")
-                if n:
-                    producers.append(n)
-
         # Related publications
         pub_entries = _field_val(fld, "publication", [])
         pubs = []
@@ -282,18 +275,18 @@ class DataverseSource(BaseSource):
             source_url=url,
             title=title,
             description=description,
-            authors="; ".join(author_names),
+            authors="; ".join(compound["author"]),
             license_type=license_type,
             license_url=license_url,
             date_published=latest.get("releaseTime", ""),
             tags=subject_vals if isinstance(subject_vals, list) else [],
-            keywords=kw_list,
+            keywords=compound["keyword"],
             kind_of_data=kind_of_data,
             language=lang_vals,
-            software=software_list,
-            geographic_coverage=geo_list,
+            software=compound["software"],
+            geographic_coverage=compound["geographicCoverage"],
             depositor=depositor,
-            producer=producers,
+            producer=compound["producer"],
             publication=pubs,
             date_of_collection=date_of_collection,
             time_period_covered=time_period_covered,
@@ -304,17 +297,17 @@ class DataverseSource(BaseSource):
 
     # ── File download ───────────────────────────────────────
 
-    def pull_file(self, url: str, dest_dir: str, filename: str | None = None) -> str:
+    def pull_file(
+        self, url: str, dest_dir: str, filename: str | None = None,
+        hasher: StreamDigest | None = None,
+    ) -> str:
         """Stream a file to disk with automatic retry on transient failures."""
         target = Path(dest_dir)
         target.mkdir(parents=True, exist_ok=True)
 
         for attempt in range(1, _RETRY_LIMIT + 1):
             try:
-                with httpx.stream(
-                    "GET", url, headers=self._headers,
-                    timeout=_DOWNLOAD_TIMEOUT, follow_redirects=True,
-                ) as resp:
+                with self._client.stream("GET", url, timeout=_DOWNLOAD_TIMEOUT) as resp:
                     resp.raise_for_status()
 
                     if not filename:
@@ -322,17 +315,20 @@ class DataverseSource(BaseSource):
                     if not filename:
                         filename = url.rstrip("/").split("/")[-1]
 
+                    if hasher is not None:
+                        hasher.reset()
                     out = target / filename
-                    with open(out, "wb") as fh:
-                        for chunk in resp.iter_bytes(chunk_size=8192):
-                            fh.write(chunk)
+                    write_stream(
+                        out, resp.iter_bytes(chunk_size=DOWNLOAD_CHUNK), hasher,
+                        size=declared_length(resp.headers),
+                    )
 
                 log.info("Saved %s → %s", url, out)
                 return str(out)
 
             except (httpx.ConnectError, httpx.ReadError, ConnectionError) as exc:
                 if attempt < _RETRY_LIMIT:
-                    wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                    wait = backoff(attempt, _INITIAL_BACKOFF)
                     log.warning(
                         "Attempt %d/%d failed for %s (%s) — retrying in %.0fs",
                         attempt, _RETRY_LIMIT, url, exc, wait,
@@ -356,18 +352,66 @@ class DataverseSource(BaseSource):
 # ── Module-level utilities ──────────────────────────────────
 
 
+# Complete tags, plus a broken tag left dangling at the end of the text
+_TAG_RE = re.compile(r"</?[^>]*>|</?\s*\w*$")
+# Malformed numeric entities like '&# 8217;'
+_BAD_ENTITY_RE = re.compile(r"&#\s+(\d+);")
+# Stray XML attribute fragments like 'xlink ">'
+_ATTR_FRAGMENT_RE = re.compile(r'\w+\s*">')
+
+
+# Inputs longer than this are cleaned directly rather than pinned in the cache
+_CLEAN_CACHE_MAX_LEN = 16_384
+
+
 def _clean_html(text: str) -> str:
-    """Strip HTML tags, decode entities, and normalise whitespace."""
-    import html
-    # Remove XML/HTML fragments (including broken ones like '</ p')
-    stripped = re.sub(r"</?[^>]*>", " ", text)
-    stripped = re.sub(r"</?\s*\w*$", " ", stripped)  # trailing broken tags
-    # Fix malformed entities like '&# 8217;' → '&#8217;'
-    stripped = re.sub(r"&#\s+(\d+);", r"&#\1;", stripped)
-    # Remove stray XML attribute fragments like 'xlink ">'
-    stripped = re.sub(r'\w+\s*">', " ", stripped)
-    decoded = html.unescape(stripped)
-    return re.sub(r"\s+", " ", decoded).strip()
+    """Strip HTML tags, decode entities, and normalise whitespace.
+
+    Descriptions, terms of use and license blurbs repeat across datasets, so
+    short inputs are served from an LRU cache.  Plain text (no tag, entity
+    or attribute debris; most IA/LOC fields) only needs its whitespace
+    normalised and skips the regex passes and the cache altogether.
+    """
+    if "<" not in text and "&" not in text and '">' not in text:
+        return " ".join(text.split())
+    if len(text) < _CLEAN_CACHE_MAX_LEN:
+        return _clean_html_cached(text)
+    return _strip_html(text)
+
+
+def _strip_html(text: str) -> str:
+    """Uncached worker behind :func:`_clean_html`."""
+    stripped = _TAG_RE.sub(" ", text)
+    stripped = _BAD_ENTITY_RE.sub(r"&#\1;", stripped)
+    stripped = _ATTR_FRAGMENT_RE.sub(" ", stripped)
+    # str.split() collapses every whitespace run without a regex pass
+    return " ".join(html.unescape(stripped).split())
+
+
+_clean_html_cached = lru_cache(maxsize=4096)(_strip_html)
+
+
+# Compound citation fields and the sub-field whose value we keep
+_LIST_FIELDS = (
+    ("author", "authorName"),
+    ("keyword", "keywordValue"),
+    ("software", "softwareName"),
+    ("geographicCoverage", "country"),
+    ("producer", "producerName"),
+)
+
+
+def _compound_values(fields: dict, key: str, sub: str) -> list[str]:
+    """Collect the non-empty *sub* values of a multi-valued compound field."""
+    entries = _field_val(fields, key, [])
+    if not isinstance(entries, list):
+        return []
+    values = []
+    for entry in entries:
+        v = entry.get(sub, {}).get("value", "")
+        if v:
+            values.append(v)
+    return values
 
 
 def _field_val(fields: dict, key: str, fallback=None):
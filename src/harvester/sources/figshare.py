@@ -2,13 +2,25 @@
 
 import logging
 import re
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import httpx
 
-from harvester.sources.base import BaseSource, DatasetHit
+from harvester.helpers.jsonio import loads
+from harvester.helpers.ratelimit import Throttle, backoff
+from harvester.sources.base import BaseSource, DatasetHit, HitCache
 from harvester.sources.dataverse import _clean_html, _name_from_headers
+from harvester.storage.files import (
+    DOWNLOAD_CHUNK,
+    StreamDigest,
+    copy_file_url,
+    declared_length,
+    write_stream,
+)
 
 log = logging.getLogger("harvester")
 
@@ -17,13 +29,19 @@ _API_TIMEOUT = 30.0
 _DOWNLOAD_TIMEOUT = 120.0
 _RETRY_LIMIT = 3
 _INITIAL_BACKOFF = 2.0
+# Keep-alive pool shared by paged searches, metadata lookups and downloads
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
 _SEARCH_CAP = 500
 _PAGE_SIZE = 50
+_PAGE_WORKERS = 4            # search pages requested concurrently per round
 _THROTTLE = 0.5
 
 # Figshare content types that are not qualitative data
 _SKIP_TYPES = {"figure", "media", "code", "poster", "presentation"}
 
+# /articles/<type>/<slug>/<id>[/<version>]
+_ARTICLE_ID_RE = re.compile(r"/articles/[^/]+/[^/]+/(\d+)")
+
 
 class FigshareSource(BaseSource):
     """Source for the Figshare open-access repository.
@@ -34,71 +52,91 @@ class FigshareSource(BaseSource):
     """
 
     def __init__(self) -> None:
-        self._last_request_time = 0.0
+        self._pace = Throttle(_THROTTLE)
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
+        self._metadata = HitCache()
 
     @property
     def label(self) -> str:
         return "figshare"
 
+    @property
+    def _client(self) -> httpx.Client:
+        """Connection-pooling client, created on first use."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    # The transport retries failed connects itself, on the
+                    # same pool; pull_file only has to handle broken reads
+                    transport = httpx.HTTPTransport(limits=_POOL_LIMITS, retries=_RETRY_LIMIT)
+                    self._http = httpx.Client(
+                        timeout=_API_TIMEOUT,
+                        transport=transport,
+                        follow_redirects=True,
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close the pooled client; a later request opens a fresh one."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
     def _throttle(self) -> None:
-        """Enforce minimum interval between API requests."""
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < _THROTTLE:
-            time.sleep(_THROTTLE - elapsed)
-        self._last_request_time = time.monotonic()
+        """Enforce minimum interval between API requests (across threads)."""
+        self._pace.wait()
 
     # ── Search ──────────────────────────────────────────────
 
     def find(self, query: str, file_type: str | None = None) -> list[DatasetHit]:
         """Search Figshare articles via POST /v2/articles/search."""
-        hits: list[DatasetHit] = []
-        page = 1
-
-        while True:
-            self._throttle()
-            body = {
-                "search_for": query,
-                "page": page,
-                "page_size": _PAGE_SIZE,
-            }
-            r = httpx.post(
-                f"{_API_BASE}/articles/search",
-                json=body,
-                timeout=_API_TIMEOUT,
-            )
-            r.raise_for_status()
-            items = r.json()
-
-            if not items:
-                break
-
-            for item in items:
-                dtype = item.get("defined_type_name", "")
-                if dtype.lower() in _SKIP_TYPES:
-                    continue
-
-                title = _clean_title(item.get("title", ""))
-                hit = DatasetHit(
-                    source_name="figshare",
-                    source_url=item.get("url_public_html", ""),
-                    title=title,
-                    date_published=item.get("published_date", ""),
-                )
-                hits.append(hit)
-
-            if len(hits) >= _SEARCH_CAP:
-                log.info("[figshare] '%s': capped at %d results", query, len(hits))
-                hits = hits[:_SEARCH_CAP]
-                break
-
-            if len(items) < _PAGE_SIZE:
-                break
-
-            page += 1
+        hits = list(self.find_iter(query, file_type))
+        if len(hits) >= _SEARCH_CAP:
+            log.info("[figshare] '%s': capped at %d results", query, len(hits))
 
         log.info("[figshare] '%s': %d article(s)", query, len(hits))
         return hits
 
+    def find_iter(self, query: str, file_type: str | None = None) -> Iterator[DatasetHit]:
+        """Yield search hits as their pages arrive, up to the search cap.
+
+        The API reports no total, so once a page comes back full the
+        following pages are requested a few at a time concurrently (still
+        spaced by the throttle) and yielded in page order.  Nothing past the
+        current round is requested until the caller asks for more.
+        """
+        count = 0
+        batch = [self._search_page(query, 1)]
+        next_page = 2
+
+        with ThreadPoolExecutor(max_workers=_PAGE_WORKERS) as pool:
+            while True:
+                for items in batch:
+                    for hit in _page_hits(items):
+                        yield hit
+                        count += 1
+                        if count >= _SEARCH_CAP:
+                            return
+                    if len(items) < _PAGE_SIZE:
+                        return
+                pages = range(next_page, next_page + _PAGE_WORKERS)
+                batch = list(pool.map(lambda p: self._search_page(query, p), pages))
+                next_page = pages.stop
+
+    def _search_page(self, query: str, page: int) -> list[dict]:
+        """Fetch one page of search results."""
+        self._throttle()
+        body = {
+            "search_for": query,
+            "page": page,
+            "page_size": _PAGE_SIZE,
+        }
+        r = self._client.post(f"{_API_BASE}/articles/search", json=body)
+        r.raise_for_status()
+        return loads(r.content)
+
     # ── Full metadata ───────────────────────────────────────
 
     def fetch_metadata(self, url: str) -> DatasetHit:
@@ -107,15 +145,20 @@ class FigshareSource(BaseSource):
         Accepts URLs like ``https://figshare.com/articles/dataset/Title/12345``
         or institution subdomains.
         """
+        hit = self._metadata.get(url)
+        if hit is None:
+            hit = self._load_metadata(url)
+            self._metadata.put(url, hit)
+        return hit
+
+    def _load_metadata(self, url: str) -> DatasetHit:
+        """Fetch and parse one article, bypassing the cache."""
         article_id = _extract_article_id(url)
 
         self._throttle()
-        r = httpx.get(
-            f"{_API_BASE}/articles/{article_id}",
-            timeout=_API_TIMEOUT,
-        )
+        r = self._client.get(f"{_API_BASE}/articles/{article_id}")
         r.raise_for_status()
-        data = r.json()
+        data = loads(r.content)
 
         # Skip confidential or metadata-only records
         if data.get("is_confidential") or data.get("is_metadata_record"):
@@ -159,29 +202,10 @@ class FigshareSource(BaseSource):
         # Uploader = first author
         uploader_name = author_entries[0].get("full_name", "") if author_entries else ""
 
-        # Files
-        file_list = []
-        for f in data.get("files", []):
-            if f.get("is_link_only"):
-                continue
-
-            mime = f.get("mimetype", "")
-            if mime == "undefined":
-                mime = ""
-
-            md5 = f.get("computed_md5", "") or f.get("supplied_md5", "")
-            api_checksum = f"MD5:{md5}" if md5 else ""
-
-            file_list.append({
-                "id": f.get("id"),
-                "name": f.get("name", ""),
-                "size": f.get("size", 0),
-                "download_url": f.get("download_url", ""),
-                "content_type": mime,
-                "friendly_type": "",
-                "restricted": False,
-                "api_checksum": api_checksum,
-            })
+        # Files (link-only entries have nothing to download)
+        file_list = [
+            _file_entry(f) for f in data.get("files", ()) if not f.get("is_link_only")
+        ]
 
         return DatasetHit(
             source_name="figshare",
@@ -208,16 +232,23 @@ class FigshareSource(BaseSource):
 
     # ── File download ───────────────────────────────────────
 
-    def pull_file(self, url: str, dest_dir: str, filename: str | None = None) -> str:
+    def pull_file(
+        self, url: str, dest_dir: str, filename: str | None = None,
+        hasher: StreamDigest | None = None,
+    ) -> str:
         """Stream a file from Figshare (via S3 redirect) with retry."""
         target = Path(dest_dir)
         target.mkdir(parents=True, exist_ok=True)
 
+        if url.startswith("file://"):
+            # Mirrored or cached copy on local disk: no HTTP round trip
+            out = copy_file_url(url, target, filename, hasher)
+            log.info("Saved %s → %s", url, out)
+            return str(out)
+
         for attempt in range(1, _RETRY_LIMIT + 1):
             try:
-                with httpx.stream(
-                    "GET", url, timeout=_DOWNLOAD_TIMEOUT, follow_redirects=True,
-                ) as resp:
+                with self._client.stream("GET", url, timeout=_DOWNLOAD_TIMEOUT) as resp:
                     resp.raise_for_status()
 
                     if not filename:
@@ -225,17 +256,20 @@ class FigshareSource(BaseSource):
                     if not filename:
                         filename = url.rstrip("/").split("/")[-1]
 
+                    if hasher is not None:
+                        hasher.reset()
                     out = target / filename
-                    with open(out, "wb") as fh:
-                        for chunk in resp.iter_bytes(chunk_size=8192):
-                            fh.write(chunk)
+                    write_stream(
+                        out, resp.iter_bytes(chunk_size=DOWNLOAD_CHUNK), hasher,
+                        size=declared_length(resp.headers),
+                    )
 
                 log.info("Saved %s → %s", url, out)
                 return str(out)
 
-            except (httpx.ConnectError, httpx.ReadError, ConnectionError) as exc:
+            except (httpx.ReadError, httpx.RemoteProtocolError, ConnectionError) as exc:
                 if attempt < _RETRY_LIMIT:
-                    wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                    wait = backoff(attempt, _INITIAL_BACKOFF)
                     log.warning(
                         "Attempt %d/%d failed for %s (%s) — retrying in %.0fs",
                         attempt, _RETRY_LIMIT, url, exc, wait,
@@ -257,7 +291,7 @@ def _extract_article_id(url: str) -> str:
     - https://institution.figshare.com/articles/...
     - Bare numeric IDs
     """
-    match = re.search(r"/articles/[^/]+/[^/]+/(\d+)", url)
+    match = _ARTICLE_ID_RE.search(url)
     if match:
         return match.group(1)
     stripped = url.strip().rstrip("/")
@@ -270,7 +304,41 @@ def _extract_article_id(url: str) -> str:
     return parts[-1]
 
 
+def _file_entry(f: dict) -> dict:
+    """Map one Figshare file record to the harvester's file dict."""
+    get = f.get  # bound once; this runs for every file of every article
+    mime = get("mimetype", "")
+    if mime == "undefined":
+        mime = ""
+    md5 = get("computed_md5", "") or get("supplied_md5", "")
+    return {
+        "id": get("id"),
+        "name": get("name", ""),
+        "size": get("size", 0),
+        "download_url": get("download_url", ""),
+        "content_type": mime,
+        "friendly_type": "",
+        "restricted": False,
+        "api_checksum": f"MD5:{md5}" if md5 else "",
+    }
+
+
+def _page_hits(items: list[dict]) -> Iterator[DatasetHit]:
+    """Turn one page of search items into hits, skipping non-data types."""
+    skip = _SKIP_TYPES
+    for item in items:
+        if item.get("defined_type_name", "").lower() in skip:
+            continue
+
+        yield DatasetHit(
+            source_name="figshare",
+            source_url=item.get("url_public_html", ""),
+            title=_clean_title(item.get("title", "")),
+            date_published=item.get("published_date", ""),
+        )
+
+
 def _clean_title(title: str) -> str:
     """Strip HTML tags and collapse whitespace/newlines."""
-    clean = _clean_html(title)
-    return re.sub(r"\s+", " ", clean).strip()
+    # _clean_html already joins on single spaces, so no second regex pass
+    return _clean_html(title)
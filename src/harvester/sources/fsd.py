@@ -1,15 +1,28 @@
 """FSD Finland (Finnish Social Science Data Archive) OAI-PMH source."""
 
+import html
 import logging
 import re
+import threading
 import time
 import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import httpx
 
-from harvester.sources.base import BaseSource, DatasetHit
+from harvester.helpers.ratelimit import Throttle, backoff
+from harvester.helpers.xmlio import fromstring, pull_parser
+from harvester.sources.base import BaseSource, DatasetHit, HitCache
 from harvester.sources.dataverse import _clean_html, _name_from_headers
+from harvester.storage.files import (
+    DOWNLOAD_CHUNK,
+    StreamDigest,
+    copy_file_url,
+    declared_length,
+    write_stream,
+)
 
 log = logging.getLogger("harvester")
 
@@ -18,6 +31,8 @@ _API_TIMEOUT = 60.0
 _DOWNLOAD_TIMEOUT = 120.0
 _RETRY_LIMIT = 3
 _INITIAL_BACKOFF = 2.0
+# Keep-alive pool shared by paged searches, metadata lookups and downloads
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
 _SEARCH_CAP = 500
 _THROTTLE = 1.0
 
@@ -29,9 +44,56 @@ _NS = {
     "ddi": "ddi:codebook:2_5",
 }
 
+
+def _q(path: str) -> str:
+    """Expand the ``prefix:name`` steps of an ElementPath into Clark notation.
+
+    Paths are expanded once here, so lookups skip ElementTree's per-call
+    prefix resolution against the namespace map.
+    """
+    return re.sub(r"(\w+):(?=\w)", lambda m: "{%s}" % _NS[m.group(1)], path)
+
+
+# Element paths used by the parsers, expanded at import
+_OAI_HEADER = _q("oai:header")
+_OAI_DC = _q("oai:metadata/oai_dc:dc")
+_OAI_ANY_RECORD = _q(".//oai:record")
+_OAI_METADATA = _q("oai:metadata")
+_OAI_SET_SPEC = _q("oai:setSpec")
+_OAI_IDENTIFIER = _q("oai:identifier")
+_DDI_CODEBOOK = _q("ddi:codeBook")
+_DDI_STUDY = _q("ddi:stdyDscr")
+_DDI_TITLE = _q("ddi:citation/ddi:titlStmt/ddi:titl")
+_DDI_ABSTRACT = _q("ddi:stdyInfo/ddi:abstract")
+_DDI_AUTHOR = _q("ddi:citation/ddi:rspStmt/ddi:AuthEnty")
+_DDI_KEYWORD = _q("ddi:stdyInfo/ddi:subject/ddi:keyword")
+_DDI_TOPIC = _q("ddi:stdyInfo/ddi:subject/ddi:topcClas")
+_DDI_DIST_DATE = _q("ddi:citation/ddi:distStmt/ddi:distDate")
+_DDI_NATION = _q("ddi:stdyInfo/ddi:sumDscr/ddi:nation")
+_DDI_GEOG_COVER = _q("ddi:stdyInfo/ddi:sumDscr/ddi:geogCover")
+_DDI_COLL_DATE = _q("ddi:stdyInfo/ddi:sumDscr/ddi:collDate")
+_DDI_TIME_PERIOD = _q("ddi:stdyInfo/ddi:sumDscr/ddi:timePrd")
+_DDI_DATA_KIND = _q("ddi:stdyInfo/ddi:sumDscr/ddi:dataKind")
+_DDI_RESTRICTION = _q("ddi:dataAccs/ddi:useStmt/ddi:restrctn")
+_DDI_PRODUCER = _q("ddi:citation/ddi:prodStmt/ddi:producer")
+_DDI_FILE_DSCR = _q("ddi:fileDscr")
+_DDI_FILE_TXT = _q("ddi:fileTxt")
+_DDI_FILE_NAME = _q("ddi:fileName")
+_DC_TITLE = _q("dc:title")
+_DC_DESCRIPTION = _q("dc:description")
+_DC_IDENTIFIER = _q("dc:identifier")
+_DC_CREATOR = _q("dc:creator")
+_DC_SUBJECT = _q("dc:subject")
+_DC_DATE = _q("dc:date")
+_DC_LANGUAGE = _q("dc:language")
+_DC_COVERAGE = _q("dc:coverage")
+
 # Access level prefixes in DDI restrctn field
 _OPEN_ACCESS_MARKER = "(A)"
 
+_FSD_ID_RE = re.compile(r"(FSD\d+)", re.IGNORECASE)
+_XML_LANG_ATTR = "{http://www.w3.org/XML/1998/namespace}lang"
+
 
 class FSDSource(BaseSource):
     """Source for the Finnish Social Science Data Archive.
@@ -42,96 +104,131 @@ class FSDSource(BaseSource):
     """
 
     def __init__(self) -> None:
-        self._last_request_time = 0.0
+        self._pace = Throttle(_THROTTLE)
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
+        self._metadata = HitCache()
 
     @property
     def label(self) -> str:
         return "fsd"
 
+    @property
+    def _client(self) -> httpx.Client:
+        """Connection-pooling client, created on first use."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    # The transport retries failed connects itself, on the
+                    # same pool; pull_file only has to handle broken reads
+                    transport = httpx.HTTPTransport(limits=_POOL_LIMITS, retries=_RETRY_LIMIT)
+                    self._http = httpx.Client(
+                        timeout=_API_TIMEOUT,
+                        transport=transport,
+                        follow_redirects=True,
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close the pooled client; a later request opens a fresh one."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
     def _throttle(self) -> None:
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < _THROTTLE:
-            time.sleep(_THROTTLE - elapsed)
-        self._last_request_time = time.monotonic()
+        """Enforce minimum interval between API requests (across threads)."""
+        self._pace.wait()
 
-    def _oai_get(self, params: dict) -> ET.Element:
-        """Send an OAI-PMH request and return the parsed XML root."""
+    def _oai_fetch(self, params: dict) -> bytes:
+        """Send an OAI-PMH request and return the raw response body."""
         for attempt in range(1, _RETRY_LIMIT + 1):
             self._throttle()
-            r = httpx.get(_OAI_BASE, params=params, timeout=_API_TIMEOUT)
+            r = self._client.get(_OAI_BASE, params=params)
             if r.status_code == 429:
-                wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                wait = backoff(attempt, _INITIAL_BACKOFF)
                 log.warning("[fsd] 429 rate-limited — retrying in %.0fs", wait)
                 time.sleep(wait)
                 continue
             r.raise_for_status()
-            return ET.fromstring(r.content)
+            return r.content
         r.raise_for_status()
-        return ET.fromstring(r.content)
+        return r.content
+
+    def _oai_get(self, params: dict) -> ET.Element:
+        """Send an OAI-PMH request and return the parsed XML root."""
+        return fromstring(self._oai_fetch(params))
 
     # ── Search ──────────────────────────────────────────────
 
     def find(self, query: str, file_type: str | None = None) -> list[DatasetHit]:
-        """Harvest OAI-PMH records and filter locally by query keywords.
+        """Harvest OAI-PMH records and filter locally by query keywords."""
+        hits = list(self.find_iter(query, file_type))
+        if len(hits) >= _SEARCH_CAP:
+            log.info("[fsd] '%s': capped at %d results", query, _SEARCH_CAP)
+        else:
+            log.info("[fsd] '%s': %d record(s)", query, len(hits))
+        return hits
+
+    def find_iter(self, query: str, file_type: str | None = None) -> Iterator[DatasetHit]:
+        """Yield matching records one at a time, up to the search cap.
 
         Uses ``ListRecords`` with ``oai_dc`` (lightweight).  The OAI-PMH
         protocol has no search verb, so we harvest all records and match
-        titles/descriptions/subjects against the query.
+        titles/descriptions/subjects against the query.  Resumption tokens
+        are opaque, so pages stay sequential, but each page's successor is
+        requested in the background while the current one is matched.
         """
-        query_terms = [t.lower() for t in query.split() if t]
-        hits: list[DatasetHit] = []
+        # Distinct terms, longest first: the rarest term rules a record out soonest
+        query_terms = sorted({t.lower() for t in query.split()}, key=len, reverse=True)
+        count = 0
         params: dict[str, str] = {
             "verb": "ListRecords",
             "metadataPrefix": "oai_dc",
         }
 
-        while True:
-            root = self._oai_get(params)
-
-            list_records = root.find("oai:ListRecords", _NS)
-            if list_records is None:
-                # Check for OAI error (e.g. expired token)
-                error = root.find("oai:error", _NS)
-                if error is not None:
-                    log.warning("[fsd] OAI error: %s", error.text)
-                break
-
-            for record in list_records.findall("oai:record", _NS):
-                header = record.find("oai:header", _NS)
-                if header is None:
-                    continue
-                # Skip deleted records
-                if header.get("status") == "deleted":
-                    continue
-
-                metadata = record.find("oai:metadata/oai_dc:dc", _NS)
-                if metadata is None:
-                    continue
-
-                hit = self._dc_to_hit(header, metadata)
-                if hit is None:
-                    continue
-
-                # Local keyword matching
-                searchable = f"{hit.title} {hit.description} {' '.join(hit.tags)}".lower()
-                if query_terms and not all(t in searchable for t in query_terms):
-                    continue
-
-                hits.append(hit)
-
-                if len(hits) >= _SEARCH_CAP:
-                    log.info("[fsd] '%s': capped at %d results", query, _SEARCH_CAP)
-                    return hits[:_SEARCH_CAP]
-
-            # Pagination via resumptionToken
-            token_el = list_records.find("oai:resumptionToken", _NS)
-            if token_el is None or not token_el.text:
-                break
-
-            params = {"verb": "ListRecords", "resumptionToken": token_el.text}
+        pool = ThreadPoolExecutor(max_workers=1)
+        pending: Future | None = pool.submit(self._oai_fetch, params)
+        try:
+            while pending is not None:
+                data = pending.result()
+
+                # Pagination via resumptionToken — prefetch the next page
+                token = _resumption_token(data)
+                pending = None
+                if token:
+                    pending = pool.submit(
+                        self._oai_fetch, {"verb": "ListRecords", "resumptionToken": token},
+                    )
 
-        log.info("[fsd] '%s': %d record(s)", query, len(hits))
-        return hits
+                for record in _iter_records(data):
+                    header = record.find(_OAI_HEADER)
+                    if header is None:
+                        continue
+                    # Skip deleted records
+                    if header.get("status") == "deleted":
+                        continue
+
+                    metadata = record.find(_OAI_DC)
+                    if metadata is None:
+                        continue
+
+                    hit = self._dc_to_hit(header, metadata)
+                    if hit is None:
+                        continue
+
+                    # Local keyword matching
+                    if not _matches_terms(hit, query_terms):
+                        continue
+
+                    yield hit
+                    count += 1
+                    if count >= _SEARCH_CAP:
+                        return
+        finally:
+            # Don't wait on a prefetch nobody will read (also runs when the
+            # caller stops iterating early)
+            pool.shutdown(wait=False, cancel_futures=True)
 
     # ── Full metadata ───────────────────────────────────────
 
@@ -141,6 +238,14 @@ class FSDSource(BaseSource):
         Accepts FSD identifiers like ``FSD4012``, OAI identifiers
         like ``oai:fsd.uta.fi:FSD4012``, or URN URLs.
         """
+        hit = self._metadata.get(url)
+        if hit is None:
+            hit = self._load_metadata(url)
+            self._metadata.put(url, hit)
+        return hit
+
+    def _load_metadata(self, url: str) -> DatasetHit:
+        """Fetch and parse one record, bypassing the cache."""
         oai_id = _to_oai_identifier(url)
         fsd_id = _extract_fsd_id(url)
 
@@ -151,62 +256,62 @@ class FSDSource(BaseSource):
             "identifier": oai_id,
         })
 
-        record = root.find(".//oai:record", _NS)
+        record = root.find(_OAI_ANY_RECORD)
         if record is None:
             # Fallback to Dublin Core
             return self._fetch_dc_metadata(oai_id, url)
 
-        md = record.find("oai:metadata", _NS)
+        md = record.find(_OAI_METADATA)
         if md is None:
             return self._fetch_dc_metadata(oai_id, url)
 
-        cb = md.find("ddi:codeBook", _NS)
+        cb = md.find(_DDI_CODEBOOK)
         if cb is None:
             return self._fetch_dc_metadata(oai_id, url)
 
-        stdy = cb.find("ddi:stdyDscr", _NS)
+        stdy = cb.find(_DDI_STUDY)
         if stdy is None:
             return DatasetHit(source_name="fsd", source_url=url, title="")
 
         # Title (prefer English)
-        title = _ddi_text(stdy, "ddi:citation/ddi:titlStmt/ddi:titl", lang="en")
+        title = _ddi_text(stdy, _DDI_TITLE, lang="en")
 
         # Description
         description = _clean_html(
-            _ddi_text(stdy, "ddi:stdyInfo/ddi:abstract", lang="en")
+            _ddi_text(stdy, _DDI_ABSTRACT, lang="en")
         )
 
         # Authors
         authors = []
-        for auth in stdy.findall("ddi:citation/ddi:rspStmt/ddi:AuthEnty", _NS):
+        for auth in stdy.findall(_DDI_AUTHOR):
             name = (auth.text or "").strip()
             if name:
                 authors.append(name)
 
         # Keywords
         keywords = []
-        for kw in stdy.findall("ddi:stdyInfo/ddi:subject/ddi:keyword", _NS):
+        for kw in stdy.findall(_DDI_KEYWORD):
             text = (kw.text or "").strip()
             if text:
                 keywords.append(text)
 
         # Topic classifications → tags
         tags = []
-        for tc in stdy.findall("ddi:stdyInfo/ddi:subject/ddi:topcClas", _NS):
+        for tc in stdy.findall(_DDI_TOPIC):
             text = (tc.text or "").strip()
             if text:
                 tags.append(text)
 
         # Date
-        dist_date = _ddi_text(stdy, "ddi:citation/ddi:distStmt/ddi:distDate")
+        dist_date = _ddi_text(stdy, _DDI_DIST_DATE)
 
         # Geographic coverage
         geo = []
-        for n in stdy.findall("ddi:stdyInfo/ddi:sumDscr/ddi:nation", _NS):
+        for n in stdy.findall(_DDI_NATION):
             text = (n.text or "").strip()
             if text:
                 geo.append(text)
-        for g in stdy.findall("ddi:stdyInfo/ddi:sumDscr/ddi:geogCover", _NS):
+        for g in stdy.findall(_DDI_GEOG_COVER):
             text = (g.text or "").strip()
             if text and text not in geo:
                 geo.append(text)
@@ -214,43 +319,27 @@ class FSDSource(BaseSource):
         # Language
         language = []
         # Look in the header setSpecs for language info
-        header = record.find("oai:header", _NS)
+        header = record.find(_OAI_HEADER)
         if header is not None:
-            for ss in header.findall("oai:setSpec", _NS):
+            for ss in header.findall(_OAI_SET_SPEC):
                 text = (ss.text or "")
                 if text.startswith("language:"):
                     language.append(text.split(":", 1)[1])
 
-        # Collection dates
-        date_of_collection = ""
-        coll_dates = stdy.findall("ddi:stdyInfo/ddi:sumDscr/ddi:collDate", _NS)
-        starts = [d.get("date", "") for d in coll_dates if d.get("event") == "start"]
-        ends = [d.get("date", "") for d in coll_dates if d.get("event") == "end"]
-        if starts or ends:
-            s = starts[0] if starts else ""
-            e = ends[0] if ends else ""
-            date_of_collection = f"{s} – {e}" if s and e else (s or e)
-
-        # Time period
-        time_period_covered = ""
-        time_els = stdy.findall("ddi:stdyInfo/ddi:sumDscr/ddi:timePrd", _NS)
-        tp_starts = [t.get("date", "") for t in time_els if t.get("event") == "start"]
-        tp_ends = [t.get("date", "") for t in time_els if t.get("event") == "end"]
-        if tp_starts or tp_ends:
-            s = tp_starts[0] if tp_starts else ""
-            e = tp_ends[0] if tp_ends else ""
-            time_period_covered = f"{s} – {e}" if s and e else (s or e)
+        # Collection dates and time period
+        date_of_collection = _date_range(stdy.findall(_DDI_COLL_DATE))
+        time_period_covered = _date_range(stdy.findall(_DDI_TIME_PERIOD))
 
         # Kind of data
         kind_of_data = []
-        for dk in stdy.findall("ddi:stdyInfo/ddi:sumDscr/ddi:dataKind", _NS):
+        for dk in stdy.findall(_DDI_DATA_KIND):
             text = (dk.text or "").strip()
             if text:
                 kind_of_data.append(text)
 
         # Access / license
         license_type = ""
-        restrctn = stdy.find("ddi:dataAccs/ddi:useStmt/ddi:restrctn", _NS)
+        restrctn = stdy.find(_DDI_RESTRICTION)
         if restrctn is not None and restrctn.text:
             license_type = restrctn.text.strip()
 
@@ -260,18 +349,18 @@ class FSDSource(BaseSource):
 
         # Producer
         producers = []
-        for p in stdy.findall("ddi:citation/ddi:prodStmt/ddi:producer", _NS):
+        for p in stdy.findall(_DDI_PRODUCER):
             text = (p.text or "").strip()
             if text:
                 producers.append(text)
 
         # Files (from fileDscr)
         file_list = []
-        for fd in cb.findall("ddi:fileDscr", _NS):
-            ft = fd.find("ddi:fileTxt", _NS)
+        for fd in cb.findall(_DDI_FILE_DSCR):
+            ft = fd.find(_DDI_FILE_TXT)
             if ft is None:
                 continue
-            fn_el = ft.find("ddi:fileName", _NS)
+            fn_el = ft.find(_DDI_FILE_NAME)
             fname = (fn_el.text or "").strip() if fn_el is not None else ""
             if fname:
                 file_list.append({
@@ -320,12 +409,12 @@ class FSDSource(BaseSource):
             "metadataPrefix": "oai_dc",
             "identifier": oai_id,
         })
-        record = root.find(".//oai:record", _NS)
+        record = root.find(_OAI_ANY_RECORD)
         if record is None:
             return DatasetHit(source_name="fsd", source_url=url, title="")
 
-        header = record.find("oai:header", _NS)
-        metadata = record.find("oai:metadata/oai_dc:dc", _NS)
+        header = record.find(_OAI_HEADER)
+        metadata = record.find(_OAI_DC)
         if header is None or metadata is None:
             return DatasetHit(source_name="fsd", source_url=url, title="")
 
@@ -334,16 +423,23 @@ class FSDSource(BaseSource):
 
     # ── File download ───────────────────────────────────────
 
-    def pull_file(self, url: str, dest_dir: str, filename: str | None = None) -> str:
+    def pull_file(
+        self, url: str, dest_dir: str, filename: str | None = None,
+        hasher: StreamDigest | None = None,
+    ) -> str:
         """Stream a file from FSD with retry."""
         target = Path(dest_dir)
         target.mkdir(parents=True, exist_ok=True)
 
+        if url.startswith("file://"):
+            # Mirrored or cached copy on local disk: no HTTP round trip
+            out = copy_file_url(url, target, filename, hasher)
+            log.info("Saved %s → %s", url, out)
+            return str(out)
+
         for attempt in range(1, _RETRY_LIMIT + 1):
             try:
-                with httpx.stream(
-                    "GET", url, timeout=_DOWNLOAD_TIMEOUT, follow_redirects=True,
-                ) as resp:
+                with self._client.stream("GET", url, timeout=_DOWNLOAD_TIMEOUT) as resp:
                     resp.raise_for_status()
 
                     if not filename:
@@ -351,17 +447,20 @@ class FSDSource(BaseSource):
                     if not filename:
                         filename = url.rstrip("/").split("/")[-1]
 
+                    if hasher is not None:
+                        hasher.reset()
                     out = target / filename
-                    with open(out, "wb") as fh:
-                        for chunk in resp.iter_bytes(chunk_size=8192):
-                            fh.write(chunk)
+                    write_stream(
+                        out, resp.iter_bytes(chunk_size=DOWNLOAD_CHUNK), hasher,
+                        size=declared_length(resp.headers),
+                    )
 
                 log.info("Saved %s → %s", url, out)
                 return str(out)
 
-            except (httpx.ConnectError, httpx.ReadError, ConnectionError) as exc:
+            except (httpx.ReadError, httpx.RemoteProtocolError, ConnectionError) as exc:
                 if attempt < _RETRY_LIMIT:
-                    wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                    wait = backoff(attempt, _INITIAL_BACKOFF)
                     log.warning(
                         "Attempt %d/%d failed for %s (%s) — retrying in %.0fs",
                         attempt, _RETRY_LIMIT, url, exc, wait,
@@ -377,22 +476,22 @@ class FSDSource(BaseSource):
     ) -> DatasetHit | None:
         """Convert a Dublin Core record to a DatasetHit."""
         # Prefer English title
-        title = _dc_text(dc, "dc:title", lang="en")
+        title = _dc_text(dc, _DC_TITLE, lang="en")
         if not title:
             return None
 
-        description = _clean_html(_dc_text(dc, "dc:description", lang="en"))
+        description = _clean_html(_dc_text(dc, _DC_DESCRIPTION, lang="en"))
 
         # Source URL — prefer the https://urn.fi/ identifier
         source_url = ""
-        for ident in dc.findall("dc:identifier", _NS):
+        for ident in dc.findall(_DC_IDENTIFIER):
             text = (ident.text or "").strip()
             if text.startswith("https://urn.fi/"):
                 source_url = text
                 break
         if not source_url:
             oai_id = ""
-            id_el = header.find("oai:identifier", _NS)
+            id_el = header.find(_OAI_IDENTIFIER)
             if id_el is not None:
                 oai_id = (id_el.text or "").strip()
             fsd_id = oai_id.split(":")[-1] if oai_id else ""
@@ -401,38 +500,38 @@ class FSDSource(BaseSource):
 
         # Authors
         creators = []
-        for c in dc.findall("dc:creator", _NS):
+        for c in dc.findall(_DC_CREATOR):
             text = (c.text or "").strip()
             if text:
                 creators.append(text)
 
         # Subjects → tags
         tags = []
-        for s in dc.findall("dc:subject", _NS):
+        for s in dc.findall(_DC_SUBJECT):
             text = (s.text or "").strip()
             if text:
                 tags.append(text)
 
         # Date
-        date_published = _dc_text(dc, "dc:date")
+        date_published = _dc_text(dc, _DC_DATE)
 
         # Language
         language = []
-        for lang in dc.findall("dc:language", _NS):
+        for lang in dc.findall(_DC_LANGUAGE):
             text = (lang.text or "").strip()
             if text:
                 language.append(text)
 
         # Geographic coverage
         geo = []
-        for cov in dc.findall("dc:coverage", _NS):
+        for cov in dc.findall(_DC_COVERAGE):
             text = (cov.text or "").strip()
             if text:
                 geo.append(text)
 
         # Kind of data from setSpecs
         kind_of_data = []
-        for ss in header.findall("oai:setSpec", _NS):
+        for ss in header.findall(_OAI_SET_SPEC):
             text = (ss.text or "")
             if text.startswith("data_kind:"):
                 kind_of_data.append(text.split(":", 1)[1])
@@ -454,6 +553,64 @@ class FSDSource(BaseSource):
 # ── Module-level utilities ──────────────────────────────────
 
 
+_OAI_TAG = "{%s}" % _NS["oai"]
+_PARSE_CHUNK = 64 * 1024
+
+# The token is the last element of a page; its text is the only thing we
+# need before parsing, so a byte-level scan beats building the tree first.
+# Self-closing tokens (end of list) are excluded by the lookbehind.
+_TOKEN_RE = re.compile(rb"<(?:[\w.-]+:)?resumptionToken\b[^>]*(?<!/)>([^<]*)<")
+
+
+def _resumption_token(data: bytes) -> str:
+    """Return the page's resumptionToken text, or "" on the last page."""
+    match = _TOKEN_RE.search(data)
+    if not match:
+        return ""
+    return html.unescape(match.group(1).decode("utf-8")).strip()
+
+
+def _iter_records(data: bytes) -> Iterator[ET.Element]:
+    """Yield each ``oai:record`` of a ListRecords page as it is parsed.
+
+    The page is fed to a pull parser in chunks and every record is dropped
+    from the tree once the caller moves on, so only one record's elements
+    are alive at a time instead of the whole page's DOM.  OAI errors (e.g.
+    an expired token) are logged.
+    """
+    parser = pull_parser()
+    container = None
+    # bytes slices, not memoryviews: lxml's feed() only accepts str/bytes
+    for offset in range(0, len(data), _PARSE_CHUNK):
+        parser.feed(data[offset:offset + _PARSE_CHUNK])
+        for event, elem in parser.read_events():
+            if event == "start":
+                if elem.tag == _OAI_TAG + "ListRecords":
+                    container = elem
+                continue
+            if elem.tag == _OAI_TAG + "record":
+                yield elem
+                if container is not None:
+                    container.remove(elem)
+                else:
+                    elem.clear()
+            elif elem.tag == _OAI_TAG + "error":
+                log.warning("[fsd] OAI error: %s", elem.text)
+    parser.close()
+
+
+def _matches_terms(hit: DatasetHit, terms: list[str]) -> bool:
+    """True if every (lower-cased) term occurs in the hit's title, description or tags.
+
+    Substring semantics are kept on purpose ("interview" matches
+    "interviews"); an empty query matches without building any text.
+    """
+    if not terms:
+        return True
+    searchable = "\n".join((hit.title, hit.description, *hit.tags)).lower()
+    return all(t in searchable for t in terms)
+
+
 def _extract_fsd_id(url: str) -> str:
     """Extract the FSD identifier (e.g. 'FSD4012') from various formats.
 
@@ -463,7 +620,7 @@ def _extract_fsd_id(url: str) -> str:
     - https://urn.fi/urn:nbn:fi:fsd:T-FSD4012
     - https://services.fsd.tuni.fi/catalogue/FSD4012
     """
-    match = re.search(r"(FSD\d+)", url, re.IGNORECASE)
+    match = _FSD_ID_RE.search(url)
     if match:
         return match.group(1).upper()
     return url.strip().rstrip("/").split("/")[-1]
@@ -477,34 +634,42 @@ def _to_oai_identifier(url: str) -> str:
     return f"oai:fsd.uta.fi:{fsd_id}"
 
 
-def _dc_text(element: ET.Element, tag: str, lang: str | None = None) -> str:
-    """Get text from a Dublin Core element, preferring a given language."""
-    candidates = element.findall(tag, _NS)
+def _date_range(elements: list[ET.Element]) -> str:
+    """Format the first start/end ``date`` attributes as "start – end".
+
+    One pass over *elements*; a lone start or end is returned on its own.
+    """
+    start = end = None
+    for el in elements:
+        event = el.get("event")
+        if event == "start" and start is None:
+            start = el.get("date", "")
+        elif event == "end" and end is None:
+            end = el.get("date", "")
+        if start is not None and end is not None:
+            break
+    s, e = start or "", end or ""
+    return f"{s} – {e}" if s and e else (s or e)
+
+
+def _localized_text(element: ET.Element, path: str, lang: str | None = None) -> str:
+    """Text of the first *path* match in language *lang*, else of the first match.
+
+    One ``findall`` and at most one scan; stops at the first language hit.
+    """
+    candidates = element.findall(path)
     if not candidates:
         return ""
 
     if lang:
         for c in candidates:
-            el_lang = c.get("{http://www.w3.org/XML/1998/namespace}lang", "")
-            if el_lang == lang:
+            if c.get(_XML_LANG_ATTR) == lang:
                 return (c.text or "").strip()
 
     # Fall back to first element
     return (candidates[0].text or "").strip()
 
 
-def _ddi_text(
-    element: ET.Element, path: str, lang: str | None = None,
-) -> str:
-    """Get text from a DDI element path, preferring a given language."""
-    candidates = element.findall(path, _NS)
-    if not candidates:
-        return ""
-
-    if lang:
-        for c in candidates:
-            el_lang = c.get("{http://www.w3.org/XML/1998/namespace}lang", "")
-            if el_lang == lang:
-                return (c.text or "").strip()
-
-    return (candidates[0].text or "").strip()
+# Dublin Core and DDI lookups share the same language-preference rule
+_dc_text = _localized_text
+_ddi_text = _localized_text
@@ -2,14 +2,30 @@
 
 import logging
 import re
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from urllib.parse import quote
 
 import httpx
 
-from harvester.sources.base import BaseSource, DatasetHit
+from harvester.helpers.cache import ResponseCache
+from harvester.helpers.jsonio import loads
+from harvester.helpers.ratelimit import TokenBucket, backoff
+from harvester.settings import CACHE_DIR
+from harvester.sources.base import BaseSource, DatasetHit, FileEntry
 from harvester.sources.dataverse import _clean_html, _name_from_headers
+from harvester.storage.files import (
+    DOWNLOAD_CHUNK,
+    StreamDigest,
+    copy_file_url,
+    declared_length,
+    write_stream,
+)
 
 log = logging.getLogger("harvester")
 
@@ -20,19 +36,33 @@ _API_TIMEOUT = 30.0
 _DOWNLOAD_TIMEOUT = 120.0
 _RETRY_LIMIT = 3
 _INITIAL_BACKOFF = 2.0
+# Keep-alive pool shared by search pages, metadata lookups and downloads
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
 _SEARCH_CAP = 500
 _PAGE_SIZE = 50
-_THROTTLE = 1.0  # conservative for unauthenticated access
+_PAGE_WORKERS = 4  # search pages requested concurrently per round
+# Token bucket: short bursts, ~1 req/s sustained (conservative for unauthenticated access)
+_BURST = 5
+_RATE = 1.0
 
-# Fields to request from the search API
+# Fields to request from the search API — exactly what _doc_to_hit reads;
+# license and language come from the full metadata lookup instead
 _SEARCH_FIELDS = [
-    "identifier", "title", "description", "date", "creator",
-    "licenseurl", "subject", "mediatype", "language", "publicdate",
+    "identifier", "title", "description", "date", "creator", "subject", "publicdate",
 ]
+_FL_PARAMS: tuple[tuple[str, str], ...] = tuple(("fl[]", f) for f in _SEARCH_FIELDS)
+
+# Query parameters: a dict, or (key, value) pairs where a key repeats (fl[])
+_Params = dict[str, str | int] | list[tuple[str, str]]
 
 # File sources to keep (skip derivatives and metadata)
 _KEEP_SOURCES = {"original"}
 
+# archive.org/{details,metadata,download}/<identifier>
+_IDENTIFIER_RE = re.compile(r"archive\.org/(?:details|metadata|download)/([^/?]+)")
+# creativecommons.org/{licenses,publicdomain}/<kind>/<version>
+_CC_LICENSE_RE = re.compile(r"creativecommons\.org/(?:licenses|publicdomain)/([^/]+)/([^/]+)")
+
 
 class IASource(BaseSource):
     """Source for the Internet Archive (oral history and text collections).
@@ -43,25 +73,74 @@ class IASource(BaseSource):
     """
 
     def __init__(self) -> None:
-        self._last_request_time = 0.0
+        self._pace = TokenBucket(_BURST, _RATE)
+        self._responses = ResponseCache(CACHE_DIR)
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
 
     @property
     def label(self) -> str:
         return "ia"
 
-    def _throttle(self) -> None:
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < _THROTTLE:
-            time.sleep(_THROTTLE - elapsed)
-        self._last_request_time = time.monotonic()
+    @property
+    def _client(self) -> httpx.Client:
+        """Connection-pooling client, created on first use."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    # The transport retries failed connects itself, on the
+                    # same pool; pull_file only has to handle broken reads
+                    transport = httpx.HTTPTransport(limits=_POOL_LIMITS, retries=_RETRY_LIMIT)
+                    self._http = httpx.Client(
+                        timeout=_API_TIMEOUT,
+                        transport=transport,
+                        follow_redirects=True,
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close the pooled client; a later request opens a fresh one."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
 
-    def _get_json(self, url: str, params: dict | None = None) -> dict:
-        """GET with throttle and 429 backoff."""
+    def _throttle(self) -> None:
+        self._pace.wait()
+
+    def _get_json(
+        self, url: str, params: _Params | None = None, kind: str = "metadata",
+    ) -> dict:
+        """GET a JSON document, served from the response cache while it is fresh."""
+        body = self._responses.get(kind, url, params)
+        if body is not None:
+            return loads(body)
+
+        # Expired entry with an ETag/Last-Modified: ask whether it changed
+        stale = self._responses.revalidation(kind, url, params)
+        r = self._fetch(url, params, headers=stale[1] if stale else None)
+        if r.status_code == 304 and stale:
+            body = stale[0]
+            self._responses.refresh(kind, url, params, body)
+        else:
+            body = r.content
+            self._responses.put(
+                kind, url, params, body,
+                etag=r.headers.get("etag"), last_modified=r.headers.get("last-modified"),
+            )
+        return loads(body)
+
+    def _fetch(
+        self, url: str, params: _Params | None = None, headers: dict | None = None,
+    ) -> httpx.Response:
+        """GET the response with throttle and 429 backoff."""
         for attempt in range(1, _RETRY_LIMIT + 1):
             self._throttle()
-            r = httpx.get(url, params=params, timeout=_API_TIMEOUT)
+            r = self._client.get(url, params=params, headers=headers)
+            if r.status_code == 304:
+                return r
             if r.status_code == 429:
-                wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                wait = backoff(attempt, _INITIAL_BACKOFF)
                 log.warning(
                     "[ia] 429 rate-limited — retrying in %.0fs (attempt %d/%d)",
                     wait, attempt, _RETRY_LIMIT,
@@ -69,9 +148,9 @@ class IASource(BaseSource):
                 time.sleep(wait)
                 continue
             r.raise_for_status()
-            return r.json()
+            return r
         r.raise_for_status()
-        return r.json()
+        return r
 
     # ── Search ──────────────────────────────────────────────
 
@@ -82,92 +161,58 @@ class IASource(BaseSource):
         by default.  The user query is added as a free-text filter.
         """
         hits: list[DatasetHit] = []
-        start = 0
 
         # Build Lucene query
         q_parts = [f"({query})"]
         q_parts.append('mediatype:(texts OR audio)')
         lucene_q = " AND ".join(q_parts)
 
-        while True:
-            params: dict[str, str | int] = {
-                "q": lucene_q,
-                "output": "json",
-                "rows": _PAGE_SIZE,
-                "start": start,
-            }
-            # Add field selectors
-            for field in _SEARCH_FIELDS:
-                params[f"fl[]"] = field  # httpx handles repeated keys via list
-            # Use list for repeated fl[] params
-            param_list = [
-                ("q", lucene_q),
-                ("output", "json"),
-                ("rows", str(_PAGE_SIZE)),
-                ("start", str(start)),
-            ]
-            for field in _SEARCH_FIELDS:
-                param_list.append(("fl[]", field))
-
-            self._throttle()
-            for attempt in range(1, _RETRY_LIMIT + 1):
-                r = httpx.get(
-                    _SEARCH_BASE,
-                    params=param_list,
-                    timeout=_API_TIMEOUT,
-                )
-                if r.status_code == 429:
-                    wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
-                    log.warning("[ia] 429 rate-limited — retrying in %.0fs", wait)
-                    time.sleep(wait)
-                    continue
-                r.raise_for_status()
-                break
-
-            data = r.json()
-            response = data.get("response", {})
-            docs = response.get("docs", [])
-            num_found = response.get("numFound", 0)
-
+        for docs in self._search_pages(lucene_q):
             if not docs:
                 break
 
-            for doc in docs:
-                identifier = doc.get("identifier", "")
-                title = doc.get("title", "")
-                if not title:
-                    continue
-
-                description = _ensure_str(doc.get("description", ""))
-                description = _clean_html(description)
-
-                subject = doc.get("subject", [])
-                if isinstance(subject, str):
-                    subject = [s.strip() for s in subject.split(";")]
-
-                hit = DatasetHit(
-                    source_name="ia",
-                    source_url=f"https://archive.org/details/{identifier}",
-                    title=title,
-                    description=description,
-                    authors=_ensure_str(doc.get("creator", "")),
-                    date_published=doc.get("date", "") or doc.get("publicdate", ""),
-                    tags=subject,
-                )
-                hits.append(hit)
+            # islice stops mapping docs as soon as the cap is reached
+            page_hits = (hit for doc in docs if (hit := _doc_to_hit(doc)) is not None)
+            hits.extend(islice(page_hits, _SEARCH_CAP - len(hits)))
 
             if len(hits) >= _SEARCH_CAP:
                 log.info("[ia] '%s': capped at %d results", query, _SEARCH_CAP)
-                hits = hits[:_SEARCH_CAP]
-                break
-
-            start += _PAGE_SIZE
-            if start >= num_found:
                 break
 
         log.info("[ia] '%s': %d item(s)", query, len(hits))
         return hits
 
+    def _search_pages(self, lucene_q: str) -> Iterator[list[dict]]:
+        """Yield the ``docs`` of each result page in order.
+
+        The first page reports ``numFound``; the remaining offsets are then
+        requested a few at a time concurrently (still paced by the rate
+        limiter).  A round is only started when the caller asks for it, so
+        stopping at the cap leaves later pages unrequested.
+        """
+        response = self._search_page(lucene_q, 0).get("response", {})
+        yield response.get("docs", [])
+
+        starts = range(_PAGE_SIZE, response.get("numFound", 0), _PAGE_SIZE)
+        with ThreadPoolExecutor(max_workers=_PAGE_WORKERS) as pool:
+            for i in range(0, len(starts), _PAGE_WORKERS):
+                for data in pool.map(
+                    lambda s: self._search_page(lucene_q, s), starts[i:i + _PAGE_WORKERS],
+                ):
+                    yield data.get("response", {}).get("docs", [])
+
+    def _search_page(self, lucene_q: str, start: int) -> dict:
+        """Fetch one page of Advanced Search results."""
+        # A list, not a dict: fl[] repeats once per field
+        param_list = [
+            ("q", lucene_q),
+            ("output", "json"),
+            ("rows", str(_PAGE_SIZE)),
+            ("start", str(start)),
+            *_FL_PARAMS,
+        ]
+        return self._get_json(_SEARCH_BASE, param_list, kind="search")
+
     # ── Full metadata ───────────────────────────────────────
 
     def fetch_metadata(self, url: str) -> DatasetHit:
@@ -201,9 +246,7 @@ class IASource(BaseSource):
                 license_type = "Public Domain (US Government)"
 
         # Subject / tags
-        subject = md.get("subject", [])
-        if isinstance(subject, str):
-            subject = [s.strip() for s in subject.split(";")]
+        subject = _as_str_list(md.get("subject"))
 
         # Language
         lang = md.get("language", "")
@@ -228,15 +271,15 @@ class IASource(BaseSource):
             except (ValueError, TypeError):
                 size = 0
 
-            file_list.append({
-                "id": name,
-                "name": name,
-                "size": size,
-                "download_url": f"{_DOWNLOAD_BASE}/{identifier}/{quote(name)}",
-                "content_type": _format_to_mime(f.get("format", "")),
-                "restricted": f.get("private", "") == "true",
-                "api_checksum": api_checksum,
-            })
+            file_list.append(FileEntry(
+                id=name,
+                name=name,
+                size=size,
+                download_url=f"{_DOWNLOAD_BASE}/{identifier}/{quote(name)}",
+                content_type=_format_to_mime(f.get("format", "")),
+                restricted=f.get("private", "") == "true",
+                api_checksum=api_checksum,
+            ))
 
         return DatasetHit(
             source_name="ia",
@@ -248,7 +291,7 @@ class IASource(BaseSource):
             license_url=license_url,
             date_published=_ensure_str(date),
             keywords=[],
-            tags=subject if isinstance(subject, list) else [],
+            tags=subject,
             kind_of_data=[],
             language=language,
             geographic_coverage=[],
@@ -263,16 +306,23 @@ class IASource(BaseSource):
 
     # ── File download ───────────────────────────────────────
 
-    def pull_file(self, url: str, dest_dir: str, filename: str | None = None) -> str:
+    def pull_file(
+        self, url: str, dest_dir: str, filename: str | None = None,
+        hasher: StreamDigest | None = None,
+    ) -> str:
         """Stream a file from the Internet Archive with retry."""
         target = Path(dest_dir)
         target.mkdir(parents=True, exist_ok=True)
 
+        if url.startswith("file://"):
+            # Mirrored or cached copy on local disk: no HTTP round trip
+            out = copy_file_url(url, target, filename, hasher)
+            log.info("Saved %s → %s", url, out)
+            return str(out)
+
         for attempt in range(1, _RETRY_LIMIT + 1):
             try:
-                with httpx.stream(
-                    "GET", url, timeout=_DOWNLOAD_TIMEOUT, follow_redirects=True,
-                ) as resp:
+                with self._client.stream("GET", url, timeout=_DOWNLOAD_TIMEOUT) as resp:
                     resp.raise_for_status()
 
                     if not filename:
@@ -280,17 +330,20 @@ class IASource(BaseSource):
                     if not filename:
                         filename = url.rstrip("/").split("/")[-1]
 
+                    if hasher is not None:
+                        hasher.reset()
                     out = target / filename
-                    with open(out, "wb") as fh:
-                        for chunk in resp.iter_bytes(chunk_size=8192):
-                            fh.write(chunk)
+                    write_stream(
+                        out, resp.iter_bytes(chunk_size=DOWNLOAD_CHUNK), hasher,
+                        size=declared_length(resp.headers),
+                    )
 
                 log.info("Saved %s → %s", url, out)
                 return str(out)
 
-            except (httpx.ConnectError, httpx.ReadError, ConnectionError) as exc:
+            except (httpx.ReadError, httpx.RemoteProtocolError, ConnectionError) as exc:
                 if attempt < _RETRY_LIMIT:
-                    wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                    wait = backoff(attempt, _INITIAL_BACKOFF)
                     log.warning(
                         "Attempt %d/%d failed for %s (%s) — retrying in %.0fs",
                         attempt, _RETRY_LIMIT, url, exc, wait,
@@ -303,6 +356,24 @@ class IASource(BaseSource):
 # ── Module-level utilities ──────────────────────────────────
 
 
+def _doc_to_hit(doc: dict) -> DatasetHit | None:
+    """Turn one Advanced Search doc into a hit; ``None`` for untitled docs."""
+    title = doc.get("title")
+    if not title:
+        return None
+    get = doc.get
+    return DatasetHit(
+        source_name="ia",
+        source_url=f"https://archive.org/details/{get('identifier', '')}",
+        title=title,
+        description=_clean_html(_ensure_str(get("description"))),
+        authors=_ensure_str(get("creator")),
+        date_published=get("date") or get("publicdate", ""),
+        tags=_as_str_list(get("subject")),
+    )
+
+
+@lru_cache(maxsize=1024)
 def _extract_identifier(url: str) -> str:
     """Extract the Internet Archive identifier from various URL formats.
 
@@ -312,7 +383,7 @@ def _extract_identifier(url: str) -> str:
     - https://archive.org/download/my-item/file.pdf
     - Bare identifiers like 'my-item'
     """
-    match = re.search(r"archive\.org/(?:details|metadata|download)/([^/?]+)", url)
+    match = _IDENTIFIER_RE.search(url)
     if match:
         return match.group(1)
     return url.strip().rstrip("/").split("/")[-1]
@@ -325,11 +396,21 @@ def _ensure_str(value) -> str:
     return str(value) if value else ""
 
 
+def _as_str_list(value) -> list:
+    """Normalise a field that may be a list or a ``;``-separated string."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [s.strip() for s in value.split(";")]
+    return []
+
+
+@lru_cache(maxsize=1024)
 def _license_name_from_url(url: str) -> str:
     """Derive a human-readable license name from a Creative Commons URL."""
     if not url:
         return ""
-    match = re.search(r"creativecommons\.org/(?:licenses|publicdomain)/([^/]+)/([^/]+)", url)
+    match = _CC_LICENSE_RE.search(url)
     if match:
         kind = match.group(1).upper()
         version = match.group(2)
@@ -343,18 +424,20 @@ def _license_name_from_url(url: str) -> str:
     return url
 
 
+_FORMAT_MIME = {
+    "Text PDF": "application/pdf",
+    "DjVuTXT": "text/plain",
+    "hOCR": "text/html",
+    "Word Document": "application/msword",
+    "MPEG4": "video/mp4",
+    "VBR MP3": "audio/mpeg",
+    "Ogg Vorbis": "audio/ogg",
+    "WAVE": "audio/wav",
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+}
+
+
 def _format_to_mime(fmt: str) -> str:
     """Map Internet Archive format strings to MIME types."""
-    _map = {
-        "Text PDF": "application/pdf",
-        "DjVuTXT": "text/plain",
-        "hOCR": "text/html",
-        "Word Document": "application/msword",
-        "MPEG4": "video/mp4",
-        "VBR MP3": "audio/mpeg",
-        "Ogg Vorbis": "audio/ogg",
-        "WAVE": "audio/wav",
-        "JPEG": "image/jpeg",
-        "PNG": "image/png",
-    }
-    return _map.get(fmt, "")
+    return _FORMAT_MIME.get(fmt, "")
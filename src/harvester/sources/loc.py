@@ -2,14 +2,29 @@
 
 import logging
 import re
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlencode
 
 import httpx
 
-from harvester.sources.base import BaseSource, DatasetHit
+from harvester.helpers.cache import ResponseCache
+from harvester.helpers.jsonio import loads
+from harvester.helpers.ratelimit import TokenBucket, backoff
+from harvester.settings import CACHE_DIR
+from harvester.sources.base import BaseSource, DatasetHit, FileEntry
 from harvester.sources.dataverse import _clean_html, _name_from_headers
+from harvester.storage.files import (
+    DOWNLOAD_CHUNK,
+    StreamDigest,
+    copy_file_url,
+    declared_length,
+    write_stream,
+)
 
 log = logging.getLogger("harvester")
 
@@ -18,9 +33,20 @@ _API_TIMEOUT = 30.0
 _DOWNLOAD_TIMEOUT = 120.0
 _RETRY_LIMIT = 3
 _INITIAL_BACKOFF = 2.0
+# Keep-alive pool shared by search pages, metadata lookups and downloads
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
 _SEARCH_CAP = 500
 _PAGE_SIZE = 150  # max reliable page size for loc.gov
-_THROTTLE = 3.5  # 20 req/min limit → ≥3s between requests
+_PAGE_WORKERS = 2  # pages in flight per round; the token bucket still paces them
+_DOWNLOAD_WORKERS = 4  # concurrent streams in pull_files (tile.loc.gov is shared)
+# 20 req/min limit (a 1-hour IP block when exceeded).  Any 60 s window sees at
+# most _BURST + 60 * _RATE ≈ 19 requests.
+_BURST = 2
+_RATE = 1 / 3.5
+
+_ITEM_ID_RE = re.compile(r"/item/([^/?]+)")
+# First Creative Commons URL inside a free-text rights statement
+_CC_URL_RE = re.compile(r"https?://creativecommons\.org/[^\s\"'<>]+")
 
 
 class LOCSource(BaseSource):
@@ -31,27 +57,75 @@ class LOCSource(BaseSource):
     for the JSON API; exceeding it triggers a 1-hour IP block.
     """
 
+    download_workers = _DOWNLOAD_WORKERS
+
     def __init__(self) -> None:
-        self._last_request_time = 0.0
+        self._pace = TokenBucket(_BURST, _RATE)
+        self._responses = ResponseCache(CACHE_DIR)
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
 
     @property
     def label(self) -> str:
         return "loc"
 
-    def _throttle(self) -> None:
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < _THROTTLE:
-            time.sleep(_THROTTLE - elapsed)
-        self._last_request_time = time.monotonic()
+    @property
+    def _client(self) -> httpx.Client:
+        """Connection-pooling client, created on first use."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    # The transport retries failed connects itself, on the
+                    # same pool; pull_file only has to handle broken reads
+                    transport = httpx.HTTPTransport(limits=_POOL_LIMITS, retries=_RETRY_LIMIT)
+                    self._http = httpx.Client(
+                        timeout=_API_TIMEOUT,
+                        transport=transport,
+                        follow_redirects=True,
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close the pooled client; a later request opens a fresh one."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
 
-    def _get_json(self, url: str, params: dict | None = None) -> dict:
-        """GET with throttle and retry on 429."""
+    def _throttle(self) -> None:
+        self._pace.wait()
+
+    def _get_json(self, url: str, params: dict | None = None, kind: str = "metadata") -> dict:
+        """GET a JSON document, served from the response cache while it is fresh."""
+        body = self._responses.get(kind, url, params)
+        if body is not None:
+            return loads(body)
+
+        # Expired entry with an ETag/Last-Modified: ask whether it changed
+        stale = self._responses.revalidation(kind, url, params)
+        r = self._fetch(url, params, headers=stale[1] if stale else None)
+        if r.status_code == 304 and stale:
+            body = stale[0]
+            self._responses.refresh(kind, url, params, body)
+        else:
+            body = r.content
+            self._responses.put(
+                kind, url, params, body,
+                etag=r.headers.get("etag"), last_modified=r.headers.get("last-modified"),
+            )
+        return loads(body)
+
+    def _fetch(
+        self, url: str, params: dict | None = None, headers: dict | None = None,
+    ) -> httpx.Response:
+        """GET the response with throttle and retry on 429."""
         for attempt in range(1, _RETRY_LIMIT + 1):
             self._throttle()
-            r = httpx.get(url, params=params, timeout=_API_TIMEOUT,
-                          follow_redirects=True)
+            r = self._client.get(url, params=params, headers=headers)
+            if r.status_code == 304:
+                return r
             if r.status_code == 429:
-                wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                wait = backoff(attempt, _INITIAL_BACKOFF)
                 log.warning(
                     "[loc] 429 rate-limited — retrying in %.0fs (attempt %d/%d)",
                     wait, attempt, _RETRY_LIMIT,
@@ -59,9 +133,9 @@ class LOCSource(BaseSource):
                 time.sleep(wait)
                 continue
             r.raise_for_status()
-            return r.json()
+            return r
         r.raise_for_status()
-        return r.json()
+        return r
 
     # ── Search ──────────────────────────────────────────────
 
@@ -72,25 +146,14 @@ class LOCSource(BaseSource):
         digitised items available online.
         """
         hits: list[DatasetHit] = []
-        page = 1
-
-        while True:
-            params = {
-                "q": query,
-                "fo": "json",
-                "c": _PAGE_SIZE,
-                "sp": page,
-                "fa": "digitized:true",
-            }
-
-            data = self._get_json(f"{_BASE_URL}/search/", params)
-            results = data.get("results", [])
-            pagination = data.get("pagination", {})
 
+        for results in self._search_pages(query):
             if not results:
                 break
 
             for item in results:
+                if len(hits) >= _SEARCH_CAP:
+                    break
                 title = item.get("title", "")
                 if not title:
                     continue
@@ -100,25 +163,12 @@ class LOCSource(BaseSource):
                 if "/item/" not in item_url:
                     continue
 
-                desc_list = item.get("description", [])
-                description = ""
-                if isinstance(desc_list, list) and desc_list:
-                    description = _clean_html(desc_list[0])
-                elif isinstance(desc_list, str):
-                    description = _clean_html(desc_list)
+                descriptions = _as_str_list(item.get("description"))
+                description = _clean_html(descriptions[0]) if descriptions else ""
 
-                subjects = item.get("subject", [])
-                if isinstance(subjects, str):
-                    subjects = [subjects]
-
-                contributors = item.get("contributor", [])
-                if isinstance(contributors, str):
-                    contributors = [contributors]
-                authors = "; ".join(contributors)
-
-                language = item.get("language", [])
-                if isinstance(language, str):
-                    language = [language]
+                subjects = _as_str_list(item.get("subject"))
+                authors = "; ".join(_as_str_list(item.get("contributor")))
+                language = _as_str_list(item.get("language"))
 
                 date = item.get("date", "")
 
@@ -136,18 +186,46 @@ class LOCSource(BaseSource):
 
             if len(hits) >= _SEARCH_CAP:
                 log.info("[loc] '%s': capped at %d results", query, _SEARCH_CAP)
-                hits = hits[:_SEARCH_CAP]
-                break
-
-            # Pagination
-            next_url = pagination.get("next")
-            if not next_url:
                 break
-            page += 1
 
         log.info("[loc] '%s': %d item(s)", query, len(hits))
         return hits
 
+    def _search_pages(self, query: str) -> Iterator[list[dict]]:
+        """Yield the ``results`` of each search page in order.
+
+        The first page's ``pagination`` gives the page count; later pages
+        are then requested a couple at a time concurrently, each still
+        waiting for a rate-limit token, so network round trips overlap
+        without exceeding the rate limit.
+        """
+        data = self._search_page(query, 1)
+        yield data.get("results", [])
+
+        pagination = data.get("pagination", {})
+        last = 1
+        if pagination.get("next"):
+            # "total" is the page count; derive it from the item count ("of") if absent
+            last = pagination.get("total") or -(-pagination.get("of", 0) // _PAGE_SIZE)
+        pages = range(2, last + 1)
+        with ThreadPoolExecutor(max_workers=_PAGE_WORKERS) as pool:
+            for i in range(0, len(pages), _PAGE_WORKERS):
+                for data in pool.map(
+                    lambda p: self._search_page(query, p), pages[i:i + _PAGE_WORKERS],
+                ):
+                    yield data.get("results", [])
+
+    def _search_page(self, query: str, page: int) -> dict:
+        """Fetch one page of search results."""
+        params = {
+            "q": query,
+            "fo": "json",
+            "c": _PAGE_SIZE,
+            "sp": page,
+            "fa": "digitized:true",
+        }
+        return self._get_json(f"{_BASE_URL}/search/", params, kind="search")
+
     # ── Full metadata ───────────────────────────────────────
 
     def fetch_metadata(self, url: str) -> DatasetHit:
@@ -164,31 +242,20 @@ class LOCSource(BaseSource):
         resources = data.get("resources", [])
 
         title = item.get("title", "")
-        description_list = item.get("description", [])
-        description = ""
-        if isinstance(description_list, list) and description_list:
-            description = _clean_html(description_list[0])
-        elif isinstance(description_list, str):
-            description = _clean_html(description_list)
+        descriptions = _as_str_list(item.get("description"))
+        description = _clean_html(descriptions[0]) if descriptions else ""
 
         # Contributors / authors
-        contributor_names = item.get("contributor_names", [])
-        if isinstance(contributor_names, str):
-            contributor_names = [contributor_names]
-        authors = "; ".join(contributor_names)
+        authors = "; ".join(_as_str_list(item.get("contributor_names")))
 
         # Subjects
-        subject_headings = item.get("subject_headings", [])
-        if isinstance(subject_headings, str):
-            subject_headings = [subject_headings]
+        subject_headings = _as_str_list(item.get("subject_headings"))
 
         # Date
         date = item.get("date", "")
 
         # Language
-        language = item.get("language", [])
-        if isinstance(language, str):
-            language = [language]
+        language = _as_str_list(item.get("language"))
 
         # Access restriction
         access_restricted = item.get("access_restricted", False)
@@ -203,9 +270,7 @@ class LOCSource(BaseSource):
                 if r_clean:
                     license_type = r_clean
                     # Try to extract a CC URL
-                    cc_match = re.search(
-                        r"https?://creativecommons\.org/[^\s\"'<>]+", r,
-                    )
+                    cc_match = _CC_URL_RE.search(r)
                     if cc_match:
                         license_url = cc_match.group(0)
                     break
@@ -224,19 +289,7 @@ class LOCSource(BaseSource):
                 license_type = "No known restrictions"
 
         # Genre → kind_of_data
-        genre = item.get("genre", [])
-        if isinstance(genre, str):
-            genre = [genre]
-
-        # Original format
-        original_format = item.get("original_format", [])
-        if isinstance(original_format, str):
-            original_format = [original_format]
-
-        # Notes
-        notes = item.get("notes", [])
-        if isinstance(notes, str):
-            notes = [notes]
+        genre = _as_str_list(item.get("genre"))
 
         # Created/published info
         created_published = item.get("created_published", [])
@@ -245,11 +298,6 @@ class LOCSource(BaseSource):
         else:
             producer = []
 
-        # Repository
-        repository = item.get("repository", [])
-        if isinstance(repository, str):
-            repository = [repository]
-
         # Files from resources
         file_list = []
         for resource in resources:
@@ -260,15 +308,14 @@ class LOCSource(BaseSource):
                 res_url = resource.get(key)
                 if res_url and isinstance(res_url, str):
                     name = res_url.rstrip("/").split("/")[-1]
-                    file_list.append({
-                        "id": name,
-                        "name": name,
-                        "size": 0,
-                        "download_url": res_url,
-                        "content_type": _key_to_mime(key),
-                        "restricted": download_restricted or access_restricted,
-                        "api_checksum": "",
-                    })
+                    file_list.append(FileEntry(
+                        id=name,
+                        name=name,
+                        size=0,
+                        download_url=res_url,
+                        content_type=_key_to_mime(key),
+                        restricted=download_restricted or access_restricted,
+                    ))
 
             # If no shortcut, parse files array
             if not any(resource.get(k) for k in ("pdf", "audio", "video", "fulltext")):
@@ -283,15 +330,14 @@ class LOCSource(BaseSource):
                             continue
                         mime = f.get("mimetype", "")
                         name = f_url.rstrip("/").split("/")[-1]
-                        file_list.append({
-                            "id": name,
-                            "name": name,
-                            "size": f.get("size", 0) or 0,
-                            "download_url": f_url,
-                            "content_type": mime,
-                            "restricted": download_restricted or access_restricted,
-                            "api_checksum": "",
-                        })
+                        file_list.append(FileEntry(
+                            id=name,
+                            name=name,
+                            size=f.get("size", 0) or 0,
+                            download_url=f_url,
+                            content_type=mime,
+                            restricted=download_restricted or access_restricted,
+                        ))
 
         return DatasetHit(
             source_name="loc",
@@ -318,16 +364,23 @@ class LOCSource(BaseSource):
 
     # ── File download ───────────────────────────────────────
 
-    def pull_file(self, url: str, dest_dir: str, filename: str | None = None) -> str:
+    def pull_file(
+        self, url: str, dest_dir: str, filename: str | None = None,
+        hasher: StreamDigest | None = None,
+    ) -> str:
         """Stream a file from LOC with retry."""
         target = Path(dest_dir)
         target.mkdir(parents=True, exist_ok=True)
 
+        if url.startswith("file://"):
+            # Mirrored or cached copy on local disk: no HTTP round trip
+            out = copy_file_url(url, target, filename, hasher)
+            log.info("Saved %s → %s", url, out)
+            return str(out)
+
         for attempt in range(1, _RETRY_LIMIT + 1):
             try:
-                with httpx.stream(
-                    "GET", url, timeout=_DOWNLOAD_TIMEOUT, follow_redirects=True,
-                ) as resp:
+                with self._client.stream("GET", url, timeout=_DOWNLOAD_TIMEOUT) as resp:
                     resp.raise_for_status()
 
                     if not filename:
@@ -335,17 +388,20 @@ class LOCSource(BaseSource):
                     if not filename:
                         filename = url.rstrip("/").split("/")[-1]
 
+                    if hasher is not None:
+                        hasher.reset()
                     out = target / filename
-                    with open(out, "wb") as fh:
-                        for chunk in resp.iter_bytes(chunk_size=8192):
-                            fh.write(chunk)
+                    write_stream(
+                        out, resp.iter_bytes(chunk_size=DOWNLOAD_CHUNK), hasher,
+                        size=declared_length(resp.headers),
+                    )
 
                 log.info("Saved %s → %s", url, out)
                 return str(out)
 
-            except (httpx.ConnectError, httpx.ReadError, ConnectionError) as exc:
+            except (httpx.ReadError, httpx.RemoteProtocolError, ConnectionError) as exc:
                 if attempt < _RETRY_LIMIT:
-                    wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
+                    wait = backoff(attempt, _INITIAL_BACKOFF)
                     log.warning(
                         "Attempt %d/%d failed for %s (%s) — retrying in %.0fs",
                         attempt, _RETRY_LIMIT, url, exc, wait,
@@ -358,6 +414,7 @@ class LOCSource(BaseSource):
 # ── Module-level utilities ──────────────────────────────────
 
 
+@lru_cache(maxsize=1024)
 def _extract_item_id(url: str) -> str:
     """Extract the LOC item ID from a URL.
 
@@ -366,12 +423,13 @@ def _extract_item_id(url: str) -> str:
     - http://www.loc.gov/item/2020706022/
     - Bare IDs like '2020706022'
     """
-    match = re.search(r"/item/([^/?]+)", url)
+    match = _ITEM_ID_RE.search(url)
     if match:
         return match.group(1).rstrip("/")
     return url.strip().rstrip("/").split("/")[-1]
 
 
+@lru_cache(maxsize=1024)
 def _normalize_item_url(url: str) -> str:
     """Ensure we have a full item URL."""
     if "/item/" in url:
@@ -382,11 +440,23 @@ def _normalize_item_url(url: str) -> str:
     return f"{_BASE_URL}/item/{item_id}/"
 
 
+_KEY_MIME = {
+    "pdf": "application/pdf",
+    "audio": "audio/mpeg",
+    "video": "video/mp4",
+    "fulltext": "application/xml",
+}
+
+
+def _as_str_list(value) -> list:
+    """Normalise a loc.gov field that may be a list, a single string or missing."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [value]
+    return []
+
+
 def _key_to_mime(key: str) -> str:
     """Map resource shortcut keys to MIME types."""
-    return {
-        "pdf": "application/pdf",
-        "audio": "audio/mpeg",
-        "video": "video/mp4",
-        "fulltext": "application/xml",
-    }.get(key, "")
+    return _KEY_MIME.get(key, "")
@@ -1,14 +1,28 @@
 """OSF (Open Science Framework) JSON:API v2 source for public nodes."""
 
 import logging
+import random
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import httpx
 
-from harvester.sources.base import BaseSource, DatasetHit
+from harvester.helpers.cache import ResponseCache
+from harvester.helpers.jsonio import loads
+from harvester.helpers.ratelimit import TokenBucket, backoff, quota_from_headers, retry_after
+from harvester.settings import CACHE_DIR
+from harvester.sources.base import BaseSource, DatasetHit, FileEntry
 from harvester.sources.dataverse import _clean_html, _name_from_headers
+from harvester.storage.files import (
+    DOWNLOAD_CHUNK,
+    StreamDigest,
+    copy_file_url,
+    declared_length,
+    write_stream,
+)
 
 log = logging.getLogger("harvester")
 
@@ -17,9 +31,26 @@ _API_TIMEOUT = 30.0
 _DOWNLOAD_TIMEOUT = 120.0
 _RETRY_LIMIT = 3
 _INITIAL_BACKOFF = 2.0
+_MAX_BACKOFF = 60.0
+# Worth retrying: rate limits and gateway hiccups, and connections dropped
+# mid-response (failed connects are already retried by the transport)
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_RETRY_ERRORS = (httpx.ReadError, httpx.RemoteProtocolError, ConnectionError)
+# Keep-alive pool reused across pagination, the metadata sub-requests and downloads.
+# Sized for pull_files' 8 download streams plus 4 prefetched lookups × 3
+# sub-requests each, so metadata never queues behind long downloads.
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
 _SEARCH_CAP = 500
 _PAGE_SIZE = 50
-_THROTTLE = 1.0  # conservative — OSF allows 100 req/hr unauthenticated
+_METADATA_WORKERS = 3  # contributors, files and license fetched side by side
+# Token bucket: a short burst for those sub-requests, ~1 req/s sustained
+# (conservative — OSF allows 100 req/hr unauthenticated)
+_BURST = 3
+_RATE = 1.0
+
+# api.osf.io/v2/nodes/<id>/... and osf.io/<id>/
+_API_ID_RE = re.compile(r"/v2/nodes/([^/?]+)")
+_WEB_ID_RE = re.compile(r"osf\.io/([a-z0-9]{3,10})", re.IGNORECASE)
 
 
 class OSFSource(BaseSource):
@@ -30,36 +61,97 @@ class OSFSource(BaseSource):
     """
 
     def __init__(self) -> None:
-        self._last_request_time = 0.0
+        self._pace = TokenBucket(_BURST, _RATE)
+        self._responses = ResponseCache(CACHE_DIR)
+        self._http: httpx.Client | None = None
+        self._http_lock = threading.Lock()
 
     @property
     def label(self) -> str:
         return "osf"
 
+    @property
+    def _client(self) -> httpx.Client:
+        """Connection-pooling client, created on first use."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    # The transport retries failed connects itself, on the
+                    # same pool; pull_file only has to handle broken reads
+                    transport = httpx.HTTPTransport(limits=_POOL_LIMITS, retries=_RETRY_LIMIT)
+                    self._http = httpx.Client(
+                        timeout=_API_TIMEOUT,
+                        transport=transport,
+                        headers={"Accept": "application/vnd.api+json"},
+                        follow_redirects=True,
+                    )
+        return self._http
+
+    def close(self) -> None:
+        """Close the pooled client; a later request opens a fresh one."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
     def _throttle(self) -> None:
-        """Enforce minimum interval between API requests."""
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < _THROTTLE:
-            time.sleep(_THROTTLE - elapsed)
-        self._last_request_time = time.monotonic()
-
-    def _get(self, url: str, params: dict | None = None) -> dict:
-        """GET with throttle and 429 backoff."""
+        self._pace.wait()
+
+    def _get(self, url: str, params: dict | None = None, kind: str = "metadata") -> dict:
+        """GET a JSON:API document, served from the response cache while it is fresh.
+
+        Public OSF nodes rarely change between harvests, and the unauthenticated
+        budget is only 100 requests an hour, so cache hits skip the throttle
+        entirely and expired entries are revalidated with a conditional GET.
+        """
+        body = self._responses.get(kind, url, params)
+        if body is not None:
+            return loads(body)
+
+        # Expired entry with an ETag/Last-Modified: ask whether it changed
+        stale = self._responses.revalidation(kind, url, params)
+        r = self._fetch(url, params, headers=stale[1] if stale else None)
+        if r.status_code == 304 and stale:
+            body = stale[0]
+            self._responses.refresh(kind, url, params, body)
+        else:
+            body = r.content
+            self._responses.put(
+                kind, url, params, body,
+                etag=r.headers.get("etag"), last_modified=r.headers.get("last-modified"),
+            )
+        return loads(body)
+
+    def _fetch(
+        self, url: str, params: dict | None = None, headers: dict | None = None,
+    ) -> httpx.Response:
+        """GET the response under the retry policy (see :func:`_pause_before_retry`).
+
+        Rate limits, gateway errors and dropped connections are retried;
+        anything else fails straight away.
+        """
         for attempt in range(1, _RETRY_LIMIT + 1):
             self._throttle()
-            r = httpx.get(url, params=params, timeout=_API_TIMEOUT)
-            if r.status_code == 429:
-                wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
-                log.warning(
-                    "[osf] 429 rate-limited — retrying in %.0fs (attempt %d/%d)",
-                    wait, attempt, _RETRY_LIMIT,
-                )
-                time.sleep(wait)
+            try:
+                r = self._client.get(url, params=params, headers=headers)
+            except _RETRY_ERRORS as exc:
+                if attempt == _RETRY_LIMIT:
+                    raise
+                _pause_before_retry(url, attempt, exc)
+                continue
+            # Pace later calls by the quota OSF says is left, not a guess
+            quota = quota_from_headers(r.headers)
+            if quota is not None:
+                self._pace.sync(*quota)
+            if r.status_code == 304:
+                return r
+            if r.status_code in _RETRY_STATUSES and attempt < _RETRY_LIMIT:
+                _pause_before_retry(url, attempt, f"HTTP {r.status_code}", r.headers)
                 continue
             r.raise_for_status()
-            return r.json()
+            return r
         r.raise_for_status()
-        return r.json()
+        return r
 
     # ── Search ──────────────────────────────────────────────
 
@@ -73,7 +165,7 @@ class OSFSource(BaseSource):
         }
 
         while url:
-            data = self._get(url, params)
+            data = self._get(url, params, kind="search")
             # After the first page, pagination URL includes params already
             params = None  # type: ignore[assignment]
 
@@ -147,76 +239,24 @@ class OSFSource(BaseSource):
                 if text:
                     tags.append(text)
 
-        # 2. Contributors
-        authors_list: list[str] = []
-        contributors_url: str | None = f"{_API_BASE}/nodes/{node_id}/contributors/?embed=users"
-        while contributors_url:
-            contrib_data = self._get(contributors_url)
-            contributors_url = None
-            for contrib in contrib_data.get("data", []):
-                embeds = contrib.get("embeds", {})
-                user_data = embeds.get("users", {}).get("data", {})
-                user_attrs = user_data.get("attributes", {})
-                full_name = user_attrs.get("full_name", "")
-                if full_name:
-                    authors_list.append(full_name)
-            contributors_url = contrib_data.get("links", {}).get("next")
+        # 2–4. Contributors, files and license only depend on the node id, so
+        # they are fetched side by side instead of one after another
+        rels = node_data.get("data", {}).get("relationships", {})
+        license_link = rels.get("license", {}).get("links", {}).get("related", {})
+        license_href = (
+            license_link.get("href", "") if isinstance(license_link, dict) else license_link
+        )
+        with ThreadPoolExecutor(max_workers=_METADATA_WORKERS) as pool:
+            contributors = pool.submit(self._contributors, node_id)
+            files = pool.submit(self._files, node_id)
+            license_info = pool.submit(self._license, license_href, node_id)
+        authors_list = contributors.result()
+        file_list = files.result()
+        license_type, license_url = license_info.result()
 
         authors = "; ".join(authors_list)
         uploader_name = authors_list[0] if authors_list else ""
 
-        # 3. Files from osfstorage
-        file_list: list[dict] = []
-        files_url: str | None = f"{_API_BASE}/nodes/{node_id}/files/osfstorage/"
-        while files_url:
-            files_data = self._get(files_url)
-            files_url = None
-            for f in files_data.get("data", []):
-                f_attrs = f.get("attributes", {})
-                # Skip folders
-                if f_attrs.get("kind") == "folder":
-                    continue
-
-                extra = f_attrs.get("extra", {})
-                hashes = extra.get("hashes", {})
-                sha256 = hashes.get("sha256", "")
-                api_checksum = f"SHA-256:{sha256}" if sha256 else ""
-
-                download_url = f_attrs.get("links", {}).get("download", "")
-                if not download_url:
-                    # Fallback: construct from file GUID
-                    guid = f.get("id", "")
-                    if guid:
-                        download_url = f"https://osf.io/download/{guid}/"
-
-                file_list.append({
-                    "id": f.get("id", ""),
-                    "name": f_attrs.get("name", ""),
-                    "size": f_attrs.get("size", 0),
-                    "download_url": download_url,
-                    "content_type": f_attrs.get("content_type", "") or "",
-                    "restricted": False,
-                    "api_checksum": api_checksum,
-                })
-            files_url = files_data.get("links", {}).get("next")
-
-        # 4. License
-        license_type = ""
-        license_url = ""
-        node_license = attrs.get("node_license")
-        rels = node_data.get("data", {}).get("relationships", {})
-        license_rel = rels.get("license", {})
-        license_link = license_rel.get("links", {}).get("related", {})
-        license_href = license_link.get("href", "") if isinstance(license_link, dict) else license_link
-        if license_href:
-            try:
-                lic_data = self._get(license_href)
-                lic_attrs = lic_data.get("data", {}).get("attributes", {})
-                license_type = lic_attrs.get("name", "")
-                license_url = lic_attrs.get("url", "")
-            except httpx.HTTPStatusError:
-                log.debug("[osf] Could not fetch license for node %s", node_id)
-
         return DatasetHit(
             source_name="osf",
             source_url=url,
@@ -240,18 +280,91 @@ class OSFSource(BaseSource):
             files=file_list,
         )
 
+    def _contributors(self, node_id: str) -> list[str]:
+        """Full names of a node's contributors, across all pages."""
+        names: list[str] = []
+        url: str | None = f"{_API_BASE}/nodes/{node_id}/contributors/?embed=users"
+        while url:
+            data = self._get(url)
+            for contrib in data.get("data", []):
+                embeds = contrib.get("embeds", {})
+                user_data = embeds.get("users", {}).get("data", {})
+                user_attrs = user_data.get("attributes", {})
+                full_name = user_attrs.get("full_name", "")
+                if full_name:
+                    names.append(full_name)
+            url = data.get("links", {}).get("next")
+        return names
+
+    def _files(self, node_id: str) -> list[FileEntry]:
+        """File entries stored in the node's osfstorage, folders skipped."""
+        file_list: list[FileEntry] = []
+        url: str | None = f"{_API_BASE}/nodes/{node_id}/files/osfstorage/"
+        while url:
+            data = self._get(url)
+            for f in data.get("data", []):
+                f_attrs = f.get("attributes", {})
+                # Skip folders
+                if f_attrs.get("kind") == "folder":
+                    continue
+
+                extra = f_attrs.get("extra", {})
+                hashes = extra.get("hashes", {})
+                sha256 = hashes.get("sha256", "")
+                api_checksum = f"SHA-256:{sha256}" if sha256 else ""
+
+                download_url = f_attrs.get("links", {}).get("download", "")
+                if not download_url:
+                    # Fallback: construct from file GUID
+                    guid = f.get("id", "")
+                    if guid:
+                        download_url = f"https://osf.io/download/{guid}/"
+
+                file_list.append(FileEntry(
+                    id=f.get("id", ""),
+                    name=f_attrs.get("name", ""),
+                    size=f_attrs.get("size", 0),
+                    download_url=download_url,
+                    content_type=f_attrs.get("content_type", "") or "",
+                    api_checksum=api_checksum,
+                ))
+            url = data.get("links", {}).get("next")
+        return file_list
+
+    def _license(self, href: str, node_id: str) -> tuple[str, str]:
+        """(name, url) of the license at *href*; empty strings if unavailable."""
+        if not href:
+            return "", ""
+        try:
+            lic_data = self._get(href)
+        except httpx.HTTPStatusError:
+            log.debug("[osf] Could not fetch license for node %s", node_id)
+            return "", ""
+        lic_attrs = lic_data.get("data", {}).get("attributes", {})
+        return lic_attrs.get("name", ""), lic_attrs.get("url", "")
+
     # ── File download ───────────────────────────────────────
 
-    def pull_file(self, url: str, dest_dir: str, filename: str | None = None) -> str:
+    def pull_file(
+        self, url: str, dest_dir: str, filename: str | None = None,
+        hasher: StreamDigest | None = None,
+    ) -> str:
         """Stream a file from OSF with retry."""
         target = Path(dest_dir)
         target.mkdir(parents=True, exist_ok=True)
 
+        if url.startswith("file://"):
+            # Mirrored or cached copy on local disk: no HTTP round trip
+            out = copy_file_url(url, target, filename, hasher)
+            log.info("Saved %s → %s", url, out)
+            return str(out)
+
         for attempt in range(1, _RETRY_LIMIT + 1):
             try:
-                with httpx.stream(
-                    "GET", url, timeout=_DOWNLOAD_TIMEOUT, follow_redirects=True,
-                ) as resp:
+                with self._client.stream("GET", url, timeout=_DOWNLOAD_TIMEOUT) as resp:
+                    if resp.status_code in _RETRY_STATUSES and attempt < _RETRY_LIMIT:
+                        _pause_before_retry(url, attempt, f"HTTP {resp.status_code}", resp.headers)
+                        continue
                     resp.raise_for_status()
 
                     if not filename:
@@ -259,29 +372,45 @@ class OSFSource(BaseSource):
                     if not filename:
                         filename = url.rstrip("/").split("/")[-1]
 
+                    if hasher is not None:
+                        hasher.reset()
                     out = target / filename
-                    with open(out, "wb") as fh:
-                        for chunk in resp.iter_bytes(chunk_size=8192):
-                            fh.write(chunk)
+                    write_stream(
+                        out, resp.iter_bytes(chunk_size=DOWNLOAD_CHUNK), hasher,
+                        size=declared_length(resp.headers),
+                    )
 
                 log.info("Saved %s → %s", url, out)
                 return str(out)
 
-            except (httpx.ConnectError, httpx.ReadError, ConnectionError) as exc:
-                if attempt < _RETRY_LIMIT:
-                    wait = _INITIAL_BACKOFF * (2 ** (attempt - 1))
-                    log.warning(
-                        "Attempt %d/%d failed for %s (%s) — retrying in %.0fs",
-                        attempt, _RETRY_LIMIT, url, exc, wait,
-                    )
-                    time.sleep(wait)
-                else:
+            except _RETRY_ERRORS as exc:
+                if attempt == _RETRY_LIMIT:
                     raise
+                _pause_before_retry(url, attempt, exc)
 
 
 # ── Module-level utilities ──────────────────────────────────
 
 
+def _pause_before_retry(url: str, attempt: int, reason, headers=None) -> None:
+    """Sleep before retry *attempt* + 1 of *url*: the one retry policy for OSF.
+
+    A ``Retry-After`` hint is obeyed, plus a random spread so workers that
+    were limited together don't come back together.  Otherwise the wait is
+    jittered exponential backoff, capped at ``_MAX_BACKOFF``.
+    """
+    hinted = retry_after(headers) if headers is not None else None
+    if hinted is None:
+        wait = min(backoff(attempt, _INITIAL_BACKOFF), _MAX_BACKOFF)
+    else:
+        wait = hinted + random.uniform(0, _INITIAL_BACKOFF)
+    log.warning(
+        "[osf] %s for %s — retrying in %.0fs (attempt %d/%d)",
+        reason, url, wait, attempt, _RETRY_LIMIT,
+    )
+    time.sleep(wait)
+
+
 def _extract_node_id(url: str) -> str:
     """Extract the OSF node ID from various URL formats.
 
@@ -291,11 +420,11 @@ def _extract_node_id(url: str) -> str:
     - Bare node IDs like '4vtu3'
     """
     # API URL: /v2/nodes/<id>/...
-    match = re.search(r"/v2/nodes/([^/?]+)", url)
+    match = _API_ID_RE.search(url)
     if match:
         return match.group(1)
     # Web URL: https://osf.io/<id>/
-    match = re.search(r"osf\.io/([a-z0-9]{3,10})", url, re.IGNORECASE)
+    match = _WEB_ID_RE.search(url)
     if match:
         return match.group(1)
     # Bare ID
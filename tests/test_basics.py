@@ -1,11 +1,14 @@
 """Smoke tests for core components — settings, helpers, storage, DB, and CLI."""
 
+import os
 import tempfile
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from click.testing import CliRunner
 
+from harvester.sources.base import BaseSource
+
 # ── Settings ────────────────────────────────────────────────
 
 
@@ -57,6 +60,146 @@ def test_license_standard_access():
     assert license_is_open("Standard Access") is True
 
 
+def test_json_loads_accepts_bytes():
+    from harvester.helpers.jsonio import loads
+
+    assert loads(b'{"data": {"items": [1, "\\u00e9"]}}') == {"data": {"items": [1, "\u00e9"]}}
+
+
+def test_xml_fromstring_supports_namespaced_find():
+    from harvester.helpers.xmlio import fromstring
+
+    root = fromstring(b'<r xmlns:a="urn:a"><a:x lang="en">hi</a:x></r>')
+    assert root.find("a:x", {"a": "urn:a"}).get("lang") == "en"
+    assert [e.text for e in root.findall("a:x", {"a": "urn:a"})] == ["hi"]
+
+
+def test_throttle_spaces_concurrent_callers():
+    import threading
+    import time
+
+    from harvester.helpers.ratelimit import Throttle
+
+    pace = Throttle(0.05)
+    stamps: list[float] = []
+
+    def call():
+        pace.wait()
+        stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stamps.sort()
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert all(g >= 0.04 for g in gaps)
+
+
+def test_token_bucket_allows_burst_then_paces():
+    import time
+
+    from harvester.helpers.ratelimit import TokenBucket
+
+    bucket = TokenBucket(capacity=3, rate=20)
+    t0 = time.monotonic()
+    for _ in range(3):
+        bucket.wait()
+    assert time.monotonic() - t0 < 0.03  # burst goes straight through
+
+    for _ in range(2):
+        bucket.wait()
+    assert time.monotonic() - t0 >= 0.09  # then one token per 50 ms
+
+
+def test_token_bucket_sync_follows_server_quota():
+    import time
+
+    from harvester.helpers.ratelimit import TokenBucket
+
+    bucket = TokenBucket(capacity=3, rate=0.001)
+    bucket.sync(remaining=100, reset_in=1.0)  # plenty of headroom: ~100/s
+    t0 = time.monotonic()
+    for _ in range(5):
+        bucket.wait()
+    assert time.monotonic() - t0 < 0.1
+
+    bucket.sync(remaining=0, reset_in=0.2)  # exhausted: hold until the reset
+    t0 = time.monotonic()
+    bucket.wait()
+    assert time.monotonic() - t0 >= 0.15
+
+
+def test_quota_and_retry_after_headers():
+    import time
+    from email.utils import formatdate
+
+    from harvester.helpers.ratelimit import quota_from_headers, retry_after
+
+    assert quota_from_headers({}) is None
+    quota = {"x-ratelimit-remaining": "5", "x-ratelimit-reset": "30"}
+    assert quota_from_headers(quota) == (5, 30.0)
+    remaining, reset_in = quota_from_headers(
+        {"x-ratelimit-remaining": "5", "x-ratelimit-reset": str(int(time.time()) + 60)}
+    )
+    assert remaining == 5 and 55 <= reset_in <= 60
+
+    assert retry_after({}) is None
+    assert retry_after({"retry-after": "7"}) == 7.0
+    assert 25 <= retry_after({"retry-after": formatdate(time.time() + 30, usegmt=True)}) <= 30
+    assert retry_after({"retry-after": "soon"}) is None
+
+
+def test_backoff_is_exponential_with_jitter():
+    from harvester.helpers.ratelimit import backoff
+
+    waits = [backoff(3, 2.0) for _ in range(200)]
+    assert all(4.0 <= w < 12.0 for w in waits)  # 8 s ± 50 %
+    assert len(set(waits)) > 1
+
+
+def test_response_cache_round_trip_and_expiry(tmp_path):
+    import time
+
+    from harvester.helpers.cache import ResponseCache
+
+    cache = ResponseCache(tmp_path, ttls={"search": 60, "metadata": 60})
+    params = [("q", "x"), ("fl[]", "title")]
+    assert cache.get("search", "https://api/s", params) is None
+
+    cache.put("search", "https://api/s", params, b'{"a": 1}')
+    assert cache.get("search", "https://api/s", params) == b'{"a": 1}'
+    assert cache.get("search", "https://api/s", [("q", "y")]) is None
+    assert cache.get("metadata", "https://api/s", params) is None
+
+    # A later run (fresh memory layer) sees the on-disk entry expire
+    entry = next(p for p in (tmp_path / "search").rglob("*") if p.is_file())
+    stale = time.time() - 120
+    os.utime(entry, (stale, stale))
+    assert cache.get("search", "https://api/s", params) == b'{"a": 1}'
+    later = ResponseCache(tmp_path, ttls={"search": 60, "metadata": 60})
+    assert later.get("search", "https://api/s", params) is None
+
+
+def test_response_cache_memory_layer_skips_disk(tmp_path):
+    from harvester.helpers.cache import ResponseCache
+
+    cache = ResponseCache(tmp_path)
+    cache.put("metadata", "https://api/m", None, b"{}")
+    with patch("pathlib.Path.stat", side_effect=AssertionError("disk touched")):
+        assert cache.get("metadata", "https://api/m", None) == b"{}"
+
+
+def test_response_cache_disabled():
+    from harvester.helpers.cache import ResponseCache
+
+    cache = ResponseCache(None)
+    cache.put("search", "u", None, b"{}")
+    assert cache.get("search", "u", None) is None
+
+
 # ── Storage ─────────────────────────────────────────────────
 
 
@@ -68,6 +211,15 @@ def test_to_slug():
     assert to_slug("Ünïcödé") == "unicode"
 
 
+def test_to_slug_is_cached():
+    from harvester.storage.files import to_slug
+
+    to_slug.cache_clear()
+    assert to_slug("Same Title") == to_slug("Same Title") == "same-title"
+    info = to_slug.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
 def test_to_slug_truncates():
     from harvester.storage.files import to_slug
 
@@ -107,9 +259,142 @@ def test_sha256_digest():
     Path(f.name).unlink()
 
 
+def test_sha256_digest_fallback_matches(tmp_path):
+    import hashlib
+
+    from harvester.storage import files
+
+    target = tmp_path / "blob.bin"
+    data = b"x" * (3 * files._HASH_BLOCK + 17)
+    target.write_bytes(data)
+    with patch.object(files, "_file_digest", None):
+        fallback = files.sha256_digest(target)
+    assert fallback == files.sha256_digest(target) == hashlib.sha256(data).hexdigest()
+
+
+def test_stream_digest_matches_file_digest(tmp_path):
+    from harvester.storage.files import StreamDigest, sha256_digest
+
+    target = tmp_path / "f.bin"
+    target.write_bytes(b"abc" * 1000)
+
+    h = StreamDigest()
+    h.update(b"partial attempt")
+    h.reset()
+    for i in range(0, 3000, 512):
+        h.update((b"abc" * 1000)[i:i + 512])
+    assert h.hexdigest() == sha256_digest(target)
+
+
 # ── Database ────────────────────────────────────────────────
 
 
+def test_write_stream_writes_and_hashes(tmp_path):
+    import hashlib
+
+    from harvester.storage.files import StreamDigest, write_stream
+
+    chunks = [b"a" * 10, b"", bytearray(b"bc")]
+    out = tmp_path / "out.bin"
+    out.write_bytes(b"stale content that must be truncated")
+    h = StreamDigest()
+
+    assert write_stream(out, iter(chunks), h) == 12
+    assert out.read_bytes() == b"a" * 10 + b"bc"
+    assert h.hexdigest() == hashlib.sha256(b"a" * 10 + b"bc").hexdigest()
+
+
+def test_write_stream_gathers_small_chunks(tmp_path):
+    from harvester.storage.files import write_stream
+
+    chunks = [bytes([i]) * 100 for i in range(200)]
+    out = tmp_path / "many.bin"
+    with patch("harvester.storage.files.os.writev", wraps=os.writev) as mock_writev:
+        assert write_stream(out, iter(chunks)) == 20_000
+
+    assert out.read_bytes() == b"".join(chunks)
+    assert mock_writev.call_count == 4  # 64 + 64 + 64 + 8 buffers
+
+
+def test_write_stream_preallocates_declared_size(tmp_path):
+    from harvester.storage.files import declared_length, write_stream
+
+    out = tmp_path / "sized.bin"
+    assert write_stream(out, iter([b"abc", b"de"]), size=5) == 5
+    assert out.read_bytes() == b"abcde"
+
+    # The server overstated the length: the reservation is trimmed away
+    assert write_stream(out, iter([b"abc"]), size=4096) == 3
+    assert out.read_bytes() == b"abc"
+
+    assert declared_length({"content-length": "42"}) == 42
+    assert declared_length({"content-length": "42", "content-encoding": "gzip"}) == 0
+    assert declared_length({"content-length": "n/a"}) == 0
+    assert declared_length({}) == 0
+
+
+def test_write_direct_pads_blocks_and_trims_tail(tmp_path):
+    import hashlib
+
+    from harvester.storage.files import DOWNLOAD_CHUNK, StreamDigest, _write_direct
+
+    # Crosses the aligned buffer boundary and ends mid-block
+    data = os.urandom(DOWNLOAD_CHUNK + 5000)
+    chunks = [data[:700_000], b"", data[700_000:]]
+    out = tmp_path / "direct.bin"
+    fd = os.open(out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    h = StreamDigest()
+
+    assert _write_direct(fd, iter(chunks), h, size=len(data) + 4096) == len(data)
+    assert out.read_bytes() == data
+    assert h.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
+def test_write_direct_failed_write_raises_and_closes_fd():
+    import pytest
+
+    from harvester.storage.files import _write_direct
+
+    if not os.path.exists("/dev/full"):
+        pytest.skip("needs /dev/full")
+    fd = os.open("/dev/full", os.O_WRONLY)  # every write fails with ENOSPC
+
+    with pytest.raises(OSError) as err:
+        _write_direct(fd, iter([b"x" * 5000]))
+
+    assert not isinstance(err.value, BufferError)
+    with pytest.raises(OSError):
+        os.fstat(fd)  # descriptor was closed
+
+
+def test_write_stream_direct_io_opt_in(tmp_path):
+    from harvester.storage.files import write_stream
+
+    out = tmp_path / "opt-in.bin"
+    # O_DIRECT where the filesystem allows it, the regular path where it doesn't
+    with patch("harvester.storage.files.DIRECT_IO", True):
+        assert write_stream(out, iter([b"abc", b"de"])) == 5
+    assert out.read_bytes() == b"abcde"
+
+
+def test_copy_local_with_and_without_hasher(tmp_path):
+    import hashlib
+
+    from harvester.storage.files import StreamDigest, copy_local
+
+    src = tmp_path / "src.bin"
+    payload = b"x" * 200_000
+    src.write_bytes(payload)
+
+    assert copy_local(src, tmp_path / "plain.bin") == len(payload)
+    assert (tmp_path / "plain.bin").read_bytes() == payload
+
+    h = StreamDigest()
+    assert copy_local(src, tmp_path / "hashed.bin", h) == len(payload)
+    assert (tmp_path / "hashed.bin").read_bytes() == payload
+    assert h.hexdigest() == hashlib.sha256(payload).hexdigest()
+
+
 def test_record_model():
     from harvester.database.models import File
 
@@ -144,6 +429,94 @@ def test_setup_database(tmp_path):
     s.close()
 
 
+def test_apply_migrations_upgrades_legacy_table(tmp_path):
+    from sqlalchemy import create_engine, inspect, text
+
+    from harvester.database import engine as db_engine
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with eng.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE files (id INTEGER PRIMARY KEY, source_name VARCHAR(100) NOT NULL,"
+            " source_url TEXT NOT NULL, download_url TEXT NOT NULL,"
+            " file_name VARCHAR(500) NOT NULL, file_type VARCHAR(50), file_hash VARCHAR(64),"
+            " file_size_bytes INTEGER, local_path TEXT, license_type VARCHAR(100),"
+            " license_url TEXT, title TEXT, description TEXT, authors TEXT,"
+            " date_published VARCHAR(50), tags TEXT, is_qda_file BOOLEAN,"
+            " downloaded_at DATETIME, created_at DATETIME, notes TEXT)"
+        ))
+
+    with patch.object(db_engine, "_engine", eng):
+        db_engine._apply_migrations()
+
+    insp = inspect(eng)
+    cols = {c["name"] for c in insp.get_columns("files")}
+    assert set(db_engine._EXTRA_COLUMNS) <= cols
+    assert "ix_files_source_url_name" in {ix["name"] for ix in insp.get_indexes("files")}
+
+    # Once stamped with the schema version, later starts skip inspection
+    with eng.connect() as conn:
+        assert conn.execute(text("PRAGMA user_version")).scalar() == db_engine._SCHEMA_VERSION
+    with patch.object(db_engine, "_engine", eng), \
+         patch.object(db_engine, "inspect", side_effect=AssertionError("inspected")):
+        db_engine._apply_migrations()
+
+
+def test_apply_migrations_drops_duplicates_before_unique_index(tmp_path):
+    from sqlalchemy import create_engine, inspect, text
+
+    from harvester.database import engine as db_engine
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'dup.db'}")
+    with eng.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE files (id INTEGER PRIMARY KEY, source_name VARCHAR(100) NOT NULL,"
+            " source_url TEXT NOT NULL, download_url TEXT NOT NULL,"
+            " file_name VARCHAR(500) NOT NULL, file_type VARCHAR(50), file_hash VARCHAR(64),"
+            " file_size_bytes INTEGER, local_path TEXT, license_type VARCHAR(100),"
+            " license_url TEXT, title TEXT, description TEXT, authors TEXT,"
+            " date_published VARCHAR(50), tags TEXT, is_qda_file BOOLEAN,"
+            " downloaded_at DATETIME, created_at DATETIME, notes TEXT)"
+        ))
+        conn.execute(text(
+            "INSERT INTO files (id, source_name, source_url, download_url, file_name) VALUES"
+            " (1, 'unit', 'u://1', 'u://f/1', 'a.txt'),"
+            " (2, 'unit', 'u://1', 'u://f/1', 'a.txt'),"
+            " (3, 'unit', 'u://1', 'u://f/1', 'b.txt'),"
+            " (4, 'unit', 'u://1', 'u://f/1', 'a.txt')"
+        ))
+
+    with patch.object(db_engine, "_engine", eng):
+        db_engine._apply_migrations()
+
+    assert "ix_files_source_url_name" in {
+        ix["name"] for ix in inspect(eng).get_indexes("files")
+    }
+    with eng.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM files ORDER BY id")).scalars().all()
+        version = conn.execute(text("PRAGMA user_version")).scalar()
+    assert ids == [1, 3]
+    # Stamped, so the next start neither inspects the table nor retries the index
+    assert version == db_engine._SCHEMA_VERSION
+    with patch.object(db_engine, "_engine", eng), \
+         patch.object(db_engine, "inspect", side_effect=AssertionError("inspected")):
+        db_engine._apply_migrations()
+
+
+def test_setup_database_skips_create_all_when_current(tmp_path):
+    from sqlalchemy import create_engine
+
+    from harvester.database import engine as db_engine
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    with patch.object(db_engine, "_engine", eng):
+        db_engine.setup_database()
+        with patch.object(
+            db_engine.Base.metadata, "create_all", side_effect=AssertionError("created"),
+        ):
+            db_engine.setup_database()
+
+
 def test_write_csv(tmp_path):
     from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
@@ -193,6 +566,20 @@ def test_source_registry():
     assert len(SOURCES) >= 13
 
 
+def test_file_entry_reads_like_a_file_dict():
+    import pytest
+
+    from harvester.sources import FileEntry
+
+    entry = FileEntry(id="1", name="a.pdf", size=3, download_url="https://x/a.pdf")
+    assert entry["name"] == "a.pdf"
+    assert entry.get("restricted", True) is False
+    assert entry.get("friendly_type", "") == ""
+    with pytest.raises(KeyError):
+        entry["friendly_type"]
+    assert not hasattr(entry, "__dict__")
+
+
 def test_source_has_label():
     from harvester.sources import SOURCES
 
@@ -248,6 +635,34 @@ def test_cli_find_help():
     assert "--query" in result.output
 
 
+def test_cli_find_searches_several_sources_concurrently():
+    import threading
+
+    from harvester.cli import app
+    from harvester.sources.base import DatasetHit
+
+    both_started = threading.Barrier(2, timeout=5)
+
+    def make_source(key):
+        src = MagicMock()
+
+        def find(query, file_type=None):
+            both_started.wait()  # deadlocks unless both searches run at once
+            return [DatasetHit(source_name=key, source_url=f"u://{key}", title=f"{key} hit")]
+
+        src.find.side_effect = find
+        return src
+
+    sources = {"ia": make_source("ia"), "loc": make_source("loc")}
+    runner = CliRunner()
+    with patch("harvester.cli._resolve_source", side_effect=sources.__getitem__):
+        result = runner.invoke(app, ["find", "ia,loc", "-q", "oral history"])
+
+    assert result.exit_code == 0
+    assert "Results from ia" in result.output
+    assert "Results from loc" in result.output
+
+
 def test_cli_browse_help():
     from harvester.cli import app
 
@@ -257,6 +672,15 @@ def test_cli_browse_help():
     assert "--qda-only" in result.output
 
 
+def test_cli_browse_rejects_empty_page_limit():
+    from harvester.cli import app
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["browse", "--limit", "0"])
+    assert result.exit_code == 2
+    assert "--limit" in result.output
+
+
 def test_cli_dump_help():
     from harvester.cli import app
 
@@ -281,3 +705,285 @@ def test_cli_overview():
     result = runner.invoke(app, ["overview"])
     assert result.exit_code == 0
     assert "Total records" in result.output
+
+
+# ── Harvest loop ────────────────────────────────────────────
+
+
+class _FakeSource(BaseSource):
+    """Minimal in-memory source for exercising ``_process_hits``."""
+
+    label = "fake"
+
+    def __init__(self, meta):
+        self._meta = meta
+        self.pulled: list[str] = []
+
+    def find(self, query, file_type=None):
+        return []
+
+    def fetch_metadata(self, url):
+        return self._meta
+
+    def pull_file(self, url, dest_dir, filename=None, hasher=None):
+        self.pulled.append(url)
+        out = Path(dest_dir) / filename
+        out.write_bytes(url.encode())
+        if hasher is not None:
+            hasher.update(url.encode())
+        return str(out)
+
+
+def test_fetch_metadata_bulk_keeps_order_and_yields_errors():
+    import time
+
+    from harvester.sources.base import DatasetHit
+
+    class _Slow(_FakeSource):
+        def fetch_metadata(self, url):
+            if url == "bad":
+                raise ValueError("boom")
+            time.sleep(0.02 if url == "a" else 0)
+            return DatasetHit(source_name="fake", source_url=url, title=url)
+
+    results = list(_Slow(None).fetch_metadata_bulk(["a", "bad", "c", "d", "e", "f"], workers=3))
+
+    assert [r.source_url for r in results if isinstance(r, DatasetHit)] == ["a", "c", "d", "e", "f"]
+    assert isinstance(results[1], ValueError)
+
+
+def test_pull_files_keeps_order_caps_streams_and_returns_errors(tmp_path):
+    import hashlib
+    import threading
+    import time
+
+    from harvester.storage.files import StreamDigest
+
+    class _Counting(_FakeSource):
+        download_workers = 2
+
+        def __init__(self):
+            super().__init__(None)
+            self.active = self.peak = 0
+            self.lock = threading.Lock()
+
+        def pull_file(self, url, dest_dir, filename=None, hasher=None):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.01)
+            with self.lock:
+                self.active -= 1
+            if url == "bad":
+                raise ValueError("boom")
+            return super().pull_file(url, dest_dir, filename, hasher)
+
+    src = _Counting()
+    urls = ["a", "bad", "c", "d", "e"]
+    names = [f"{u}.txt" for u in urls]
+    hashers = [StreamDigest() for _ in urls]
+    results = src.pull_files(urls, str(tmp_path), filenames=names, hashers=hashers)
+
+    assert results[0] == str(tmp_path / "a.txt")
+    assert isinstance(results[1], ValueError)
+    assert results[2:] == [str(tmp_path / n) for n in names[2:]]
+    assert (tmp_path / "d.txt").read_bytes() == b"d"
+    assert hashers[4].hexdigest() == hashlib.sha256(b"e").hexdigest()
+    assert src.peak <= 2
+    assert src.pull_files([], str(tmp_path)) == []
+
+
+def _harvest_session(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from harvester.database.models import Base
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'harvest.db'}")
+    Base.metadata.create_all(eng)
+    return sessionmaker(bind=eng)()
+
+
+def test_process_hits_downloads_files(tmp_path):
+    from harvester.cli import _process_hits
+    from harvester.database.models import File
+    from harvester.sources.base import DatasetHit
+    from harvester.storage.files import sha256_digest
+
+    files = [
+        {"id": i, "name": f"interview-{i}.txt", "size": 10, "download_url": f"u://f/{i}"}
+        for i in range(5)
+    ]
+    files.append({"id": 9, "name": "image.png", "size": 10, "download_url": "u://f/9"})
+    meta = DatasetHit(
+        source_name="fake", source_url="u://ds/1", title="Interviews",
+        description="qualitative interview study", license_type="CC BY 4.0", files=files,
+    )
+    src = _FakeSource(meta)
+    session = _harvest_session(tmp_path)
+
+    with patch("harvester.cli.ROOT_DIR", tmp_path), \
+         patch("harvester.storage.files.DOWNLOAD_DIR", tmp_path / "downloads"):
+        dl, rest, skip = _process_hits(src, "fake", [meta], session)
+
+    assert (dl, rest, skip) == (5, 0, 0)
+    assert sorted(src.pulled) == [f"u://f/{i}" for i in range(5)]
+    assert session.query(File).count() == 6
+    assert session.query(File).filter(File.local_path.isnot(None)).count() == 5
+    rec = session.query(File).filter_by(download_url="u://f/0").one()
+    assert rec.file_hash == sha256_digest(tmp_path / rec.local_path)
+    assert rec.downloaded_at is not None
+    assert session.query(File).filter(File.downloaded_at.isnot(None)).count() == 5
+
+    # A second pass finds everything already recorded
+    src.pulled.clear()
+    with patch("harvester.cli.ROOT_DIR", tmp_path), \
+         patch("harvester.storage.files.DOWNLOAD_DIR", tmp_path / "downloads"):
+        assert _process_hits(src, "fake", [meta], session) == (0, 0, 0)
+    assert src.pulled == []
+    assert session.query(File).count() == 6
+    session.close()
+
+
+def test_process_hits_discards_sha256_mismatch(tmp_path):
+    import hashlib
+
+    from harvester.cli import _process_hits
+    from harvester.database.models import File
+    from harvester.sources.base import DatasetHit
+
+    good = hashlib.sha256(b"u://f/1").hexdigest()
+    files = [
+        {"id": 1, "name": "a.txt", "size": 7, "download_url": "u://f/1",
+         "api_checksum": f"SHA-256:{good}"},
+        {"id": 2, "name": "b.txt", "size": 7, "download_url": "u://f/2",
+         "api_checksum": "SHA-256:" + "0" * 64},
+    ]
+    meta = DatasetHit(
+        source_name="fake", source_url="u://ds/1", title="Interviews",
+        description="qualitative interview study", license_type="CC BY 4.0", files=files,
+    )
+    session = _harvest_session(tmp_path)
+
+    with patch("harvester.cli.ROOT_DIR", tmp_path), \
+         patch("harvester.storage.files.DOWNLOAD_DIR", tmp_path / "downloads"):
+        dl, _, _ = _process_hits(_FakeSource(meta), "fake", [meta], session)
+
+    assert dl == 1
+    assert [r.download_url for r in session.query(File)] == ["u://f/1"]
+    assert not list(tmp_path.rglob("b.txt"))
+    session.close()
+
+
+def test_expected_sha256():
+    from harvester.storage.files import expected_sha256
+
+    assert expected_sha256("SHA-256:ABC") == "abc"
+    assert expected_sha256("SHA256:abc") == "abc"
+    assert expected_sha256("MD5:abc") == ""
+    assert expected_sha256(None) == ""
+
+
+def test_run_sources_concurrently_reports_failures():
+    from harvester import cli
+
+    sessions = []
+
+    def fake_run(src, key, queries, cap, size_cap, session):
+        if key == "osf":
+            raise RuntimeError("boom")
+        return (1, 0, 0)
+
+    def fake_open():
+        sessions.append(MagicMock())
+        return sessions[-1]
+
+    with patch("harvester.cli._run_source", side_effect=fake_run), \
+         patch("harvester.cli.open_session", side_effect=fake_open):
+        out = {k: (c, e) for k, c, e in cli._run_sources_concurrently(["qdr", "osf"], [], None, 0)}
+
+    assert out["qdr"] == ((1, 0, 0), None)
+    assert isinstance(out["osf"][1], RuntimeError)
+    assert sessions and all(s.close.called for s in sessions)
+
+
+def test_process_hits_skips_irrelevant_dataset(tmp_path):
+    from harvester.cli import _process_hits
+    from harvester.sources.base import DatasetHit
+
+    meta = DatasetHit(
+        source_name="fake", source_url="u://ds/2", title="Census",
+        description="Household survey tables", keywords=["Census", "Income"],
+        license_type="CC0 1.0",
+        files=[{"id": 1, "name": "tables.pdf", "size": 1, "download_url": "u://f/t"}],
+    )
+    src = _FakeSource(meta)
+    session = _harvest_session(tmp_path)
+
+    assert _process_hits(src, "fake", [meta], session) == (0, 0, 1)
+    assert src.pulled == []
+    session.close()
+
+
+def test_flush_records_skips_existing_rows(tmp_path):
+    from sqlalchemy import select
+
+    from harvester.cli import _flush_records
+    from harvester.database.models import File
+
+    session = _harvest_session(tmp_path)
+    row = {
+        "source_name": "fake", "source_url": "u://d", "download_url": "", "file_name": "a.txt",
+    }
+    _flush_records(session, [dict(row)])
+    _flush_records(session, [dict(row), {**row, "file_name": "b.txt"}])
+
+    assert sorted(session.scalars(select(File.file_name))) == ["a.txt", "b.txt"]
+
+
+def test_record_status_expression(tmp_path):
+    from sqlalchemy import select
+
+    from harvester.cli import _RECORD_STATUS
+    from harvester.database.models import File
+
+    session = _harvest_session(tmp_path)
+    base = {"source_name": "fake", "source_url": "u://d", "download_url": "u://f"}
+    session.add_all([
+        File(**base, file_name="a", local_path="/x/a"),
+        File(**base, file_name="b", local_path="", notes="access restricted"),
+        File(**base, file_name="c", notes="Restricted upstream"),
+        File(**base, file_name="d"),
+    ])
+    session.commit()
+
+    rows = session.execute(select(File.file_name, _RECORD_STATUS).order_by(File.file_name))
+    assert [s for _, s in rows] == ["downloaded", "restricted", "metadata only", "metadata only"]
+    session.close()
+
+
+def test_suffix_matches_pathlib():
+    from harvester.cli import _suffix
+
+    for name in ["a.TXT", ".bashrc", "a.", "dir.v2/file", "x/y.Qdpx", "noext", "a.tar.gz"]:
+        assert _suffix(name) == Path(name).suffix.lower()
+
+
+def test_run_source_skips_datasets_seen_in_earlier_queries():
+    from harvester.cli import _run_source
+    from harvester.sources.base import DatasetHit
+
+    hits = [DatasetHit(source_name="fake", source_url=f"u://ds/{i}", title="T") for i in range(3)]
+    src = MagicMock()
+    src.find.side_effect = [hits[:2], hits, hits[1:]]
+    batches = []
+
+    def fake_process(source, name, batch, session, size_cap):
+        batches.append([h.source_url for h in batch])
+        return (len(batch), 0, 0)
+
+    with patch("harvester.cli._process_hits", side_effect=fake_process):
+        totals = _run_source(src, "fake", ["a", "b", "c"], None, 0, MagicMock())
+
+    assert batches == [["u://ds/0", "u://ds/1"], ["u://ds/2"]]
+    assert totals == (3, 0, 0)
@@ -1,5 +1,6 @@
 """Unit tests for the DataverseSource — search, metadata, download."""
 
+import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -22,9 +23,7 @@ def _mock_search_response(items, total=None):
         total = len(items)
     mock = MagicMock()
     mock.raise_for_status = MagicMock()
-    mock.json.return_value = {
-        "data": {"items": items, "total_count": total}
-    }
+    mock.content = json.dumps({"data": {"items": items, "total_count": total}}).encode()
     return mock
 
 
@@ -40,7 +39,7 @@ def test_find_basic(dv):
             "subjects": ["Social Sciences"],
         }
     ]
-    with patch("httpx.get", return_value=_mock_search_response(items)):
+    with patch("httpx.Client.get", return_value=_mock_search_response(items)):
         hits = dv.find("qualitative")
 
     assert len(hits) == 1
@@ -49,7 +48,7 @@ def test_find_basic(dv):
 
 
 def test_find_empty(dv):
-    with patch("httpx.get", return_value=_mock_search_response([])):
+    with patch("httpx.Client.get", return_value=_mock_search_response([])):
         hits = dv.find("nonexistent")
     assert hits == []
 
@@ -62,14 +61,30 @@ def test_find_pagination(dv):
         _mock_search_response(page1, total=150),
         _mock_search_response(page2, total=150),
     ]
-    with patch("httpx.get", side_effect=responses):
+    with patch("httpx.Client.get", side_effect=responses):
         hits = dv.find("interview")
     assert len(hits) == 150
 
 
+def test_find_merges_concurrent_pages_in_order(dv):
+    def page(url, params=None):
+        start = params["start"]
+        items = [
+            {"name": f"DS {i}", "url": f"u/{i}", "global_id": f"doi:{i}"}
+            for i in range(start, min(start + 100, 320))
+        ]
+        return _mock_search_response(items, total=320)
+
+    with patch("httpx.Client.get", side_effect=page) as get:
+        hits = dv.find("interview")
+
+    assert get.call_count == 4
+    assert [h.title for h in hits] == [f"DS {i}" for i in range(320)]
+
+
 def test_find_respects_cap(dv):
     huge = [{"name": f"DS{i}", "url": f"u/{i}", "global_id": f"doi:{i}"} for i in range(600)]
-    with patch("httpx.get", return_value=_mock_search_response(huge, total=600)):
+    with patch("httpx.Client.get", return_value=_mock_search_response(huge, total=600)):
         hits = dv.find("big")
     assert len(hits) <= 500
 
@@ -91,7 +106,7 @@ def _build_metadata_response(fields_dict, files=None, license_info=None):
     }
     mock = MagicMock()
     mock.raise_for_status = MagicMock()
-    mock.json.return_value = {"data": {"latestVersion": version}}
+    mock.content = json.dumps({"data": {"latestVersion": version}}).encode()
     return mock
 
 
@@ -120,7 +135,7 @@ def test_fetch_metadata_basic(dv):
     )
 
     url = "https://example.dataverse.org/dataset.xhtml?persistentId=doi:10.5072/FK2/A"
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = dv.fetch_metadata(url)
 
     assert meta.title == "Interview Transcripts 2024"
@@ -137,7 +152,7 @@ def test_fetch_metadata_html_stripped(dv):
             {"dsDescriptionValue": {"value": "<p>Some <b>bold</b> text</p>"}}
         ],
     })
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = dv.fetch_metadata("https://x.org/d?persistentId=doi:1")
     assert "<" not in meta.description
     assert "bold" in meta.description
@@ -154,7 +169,7 @@ def test_fetch_metadata_extended_fields(dv):
         "depositor": "Jane Doe",
         "producer": [{"producerName": {"value": "ACME Lab"}}],
     })
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = dv.fetch_metadata("https://x.org/d?persistentId=doi:2")
 
     assert "interviews" in meta.keywords
@@ -176,9 +191,9 @@ def test_fetch_metadata_terms_of_access_fallback(dv):
     }
     mock = MagicMock()
     mock.raise_for_status = MagicMock()
-    mock.json.return_value = {"data": {"latestVersion": version}}
+    mock.content = json.dumps({"data": {"latestVersion": version}}).encode()
 
-    with patch("httpx.get", return_value=mock):
+    with patch("httpx.Client.get", return_value=mock):
         meta = dv.fetch_metadata("https://x.org/d?persistentId=doi:3")
     assert meta.license_type == "Standard Access"
 
@@ -195,9 +210,9 @@ def test_fetch_metadata_terms_of_use_fallback(dv):
     }
     mock = MagicMock()
     mock.raise_for_status = MagicMock()
-    mock.json.return_value = {"data": {"latestVersion": version}}
+    mock.content = json.dumps({"data": {"latestVersion": version}}).encode()
 
-    with patch("httpx.get", return_value=mock):
+    with patch("httpx.Client.get", return_value=mock):
         meta = dv.fetch_metadata("https://x.org/d?persistentId=doi:tou")
     assert meta.license_type == "CC BY 4.0"
 
@@ -218,7 +233,7 @@ def test_fetch_metadata_md5_fallback(dv):
             "restricted": False,
         }],
     )
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = dv.fetch_metadata("https://x.org/d?persistentId=doi:md5")
     assert meta.files[0]["api_checksum"] == "MD5:d41d8cd98f00b204e9800998ecf8427e"
 
@@ -236,7 +251,7 @@ def test_pull_file(dv, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = dv.pull_file("https://example.org/file/1", str(tmp_path))
 
     assert Path(path).exists()
@@ -252,12 +267,41 @@ def test_pull_file_explicit_name(dv, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = dv.pull_file("https://example.org/file/2", str(tmp_path), filename="custom.txt")
 
     assert Path(path).name == "custom.txt"
 
 
+def test_pull_file_feeds_hasher(dv, tmp_path):
+    import hashlib
+
+    from harvester.storage.files import StreamDigest
+
+    chunks = [b"first chunk ", b"second chunk"]
+    mock_resp = MagicMock()
+    mock_resp.raise_for_status = MagicMock()
+    mock_resp.headers = {}
+    mock_resp.iter_bytes = MagicMock(return_value=iter(chunks))
+    mock_resp.__enter__ = MagicMock(return_value=mock_resp)
+    mock_resp.__exit__ = MagicMock(return_value=False)
+
+    h = StreamDigest()
+    with patch("httpx.Client.stream", return_value=mock_resp):
+        dv.pull_file("https://example.org/file/3", str(tmp_path), filename="h.txt", hasher=h)
+
+    assert h.hexdigest() == hashlib.sha256(b"".join(chunks)).hexdigest()
+
+
+def test_client_is_shared_and_closed(dv):
+    client = dv._client
+    assert dv._client is client
+    dv.close()
+    assert client.is_closed
+    assert dv._client is not client
+    dv.close()
+
+
 # ── Utility functions ───────────────────────────────────────
 
 
@@ -266,6 +310,16 @@ def test_clean_html():
     assert _clean_html("no tags") == "no tags"
 
 
+def test_clean_html_plain_text_fast_path():
+    from harvester.sources.dataverse import _clean_html_cached
+
+    before = _clean_html_cached.cache_info().currsize
+    assert _clean_html("  spaced\n out\ttext ") == "spaced out text"
+    assert _clean_html("") == ""
+    assert _clean_html_cached.cache_info().currsize == before
+    assert _clean_html("Tom &amp; Jerry") == "Tom & Jerry"
+
+
 def test_field_val():
     fields = {"title": {"value": "Test"}}
     assert _field_val(fields, "title", "") == "Test"
@@ -1,10 +1,13 @@
 """Unit tests for the FigshareSource — search, metadata, download."""
 
+import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
+from harvester.helpers.ratelimit import Throttle
 from harvester.sources.base import BaseSource
 from harvester.sources.figshare import (
     FigshareSource,
@@ -16,7 +19,7 @@ from harvester.sources.figshare import (
 @pytest.fixture
 def fs():
     src = FigshareSource()
-    src._last_request_time = 0.0  # disable throttle in tests
+    src._pace = Throttle(0)  # disable throttle in tests
     return src
 
 
@@ -53,14 +56,14 @@ SEARCH_ITEMS = [
 
 def test_find_basic(fs):
     resp1 = MagicMock()
-    resp1.json.return_value = SEARCH_ITEMS
+    resp1.content = json.dumps(SEARCH_ITEMS).encode()
     resp1.raise_for_status = MagicMock()
 
     resp_empty = MagicMock()
-    resp_empty.json.return_value = []
+    resp_empty.content = json.dumps([]).encode()
     resp_empty.raise_for_status = MagicMock()
 
-    with patch("httpx.post", side_effect=[resp1, resp_empty]):
+    with patch("httpx.Client.post", side_effect=[resp1, resp_empty]):
         hits = fs.find("qualitative interview")
 
     assert len(hits) == 2
@@ -84,14 +87,14 @@ def test_find_skips_figures(fs):
         },
     ]
     resp = MagicMock()
-    resp.json.return_value = items
+    resp.content = json.dumps(items).encode()
     resp.raise_for_status = MagicMock()
 
     resp_empty = MagicMock()
-    resp_empty.json.return_value = []
+    resp_empty.content = json.dumps([]).encode()
     resp_empty.raise_for_status = MagicMock()
 
-    with patch("httpx.post", side_effect=[resp, resp_empty]):
+    with patch("httpx.Client.post", side_effect=[resp, resp_empty]):
         hits = fs.find("test")
 
     assert len(hits) == 1
@@ -106,14 +109,14 @@ def test_find_skips_all_non_data_types(fs):
         for i, t in enumerate(["figure", "media", "code", "poster", "presentation"], 1)
     ]
     resp = MagicMock()
-    resp.json.return_value = items
+    resp.content = json.dumps(items).encode()
     resp.raise_for_status = MagicMock()
 
     resp_empty = MagicMock()
-    resp_empty.json.return_value = []
+    resp_empty.content = json.dumps([]).encode()
     resp_empty.raise_for_status = MagicMock()
 
-    with patch("httpx.post", side_effect=[resp, resp_empty]):
+    with patch("httpx.Client.post", side_effect=[resp, resp_empty]):
         hits = fs.find("test")
 
     assert len(hits) == 0
@@ -133,27 +136,58 @@ def test_find_pagination(fs):
         for i in range(10)  # partial → stops
     ]
 
-    r1 = MagicMock()
-    r1.json.return_value = page1
-    r1.raise_for_status = MagicMock()
+    pages = {1: page1, 2: page2}
 
-    r2 = MagicMock()
-    r2.json.return_value = page2
-    r2.raise_for_status = MagicMock()
+    def fake_post(url, **kwargs):
+        r = MagicMock()
+        r.content = json.dumps(pages.get(kwargs["json"]["page"], [])).encode()
+        r.raise_for_status = MagicMock()
+        return r
 
-    with patch("httpx.post", side_effect=[r1, r2]) as mock_post:
+    with patch("httpx.Client.post", side_effect=fake_post) as mock_post:
         hits = fs.find("test")
 
     assert len(hits) == 60
-    assert mock_post.call_count == 2
+    assert [h.source_url.rsplit("/", 1)[1] for h in hits] == [str(i) for i in range(60)]
+    # Page 1 alone, then one concurrent round of pages 2..5
+    assert mock_post.call_count == 5
+
+
+def test_find_single_partial_page_makes_one_request(fs):
+    resp = MagicMock()
+    resp.content = json.dumps(SEARCH_ITEMS).encode()
+    resp.raise_for_status = MagicMock()
+
+    with patch("httpx.Client.post", return_value=resp) as mock_post:
+        fs.find("test")
+
+    assert mock_post.call_count == 1
+
+
+def test_find_iter_fetches_lazily(fs):
+    full_page = [
+        {"id": i, "title": f"Item {i}", "defined_type_name": "dataset",
+         "url_public_html": f"https://figshare.com/articles/dataset/x/{i}",
+         "published_date": "2023-01-01"}
+        for i in range(50)
+    ]
+    resp = MagicMock()
+    resp.content = json.dumps(full_page).encode()
+    resp.raise_for_status = MagicMock()
+
+    with patch("httpx.Client.post", return_value=resp) as mock_post:
+        first = next(fs.find_iter("test"))
+
+    assert first.title == "Item 0"
+    assert mock_post.call_count == 1
 
 
 def test_find_empty(fs):
     resp = MagicMock()
-    resp.json.return_value = []
+    resp.content = json.dumps([]).encode()
     resp.raise_for_status = MagicMock()
 
-    with patch("httpx.post", return_value=resp):
+    with patch("httpx.Client.post", return_value=resp):
         hits = fs.find("nonexistent")
 
     assert hits == []
@@ -211,11 +245,11 @@ ARTICLE_RESPONSE = {
 
 def test_fetch_metadata_basic(fs):
     resp = MagicMock()
-    resp.json.return_value = ARTICLE_RESPONSE
+    resp.content = json.dumps(ARTICLE_RESPONSE).encode()
     resp.raise_for_status = MagicMock()
 
     url = "https://figshare.com/articles/dataset/x/12345"
-    with patch("httpx.get", return_value=resp) as mock_get:
+    with patch("httpx.Client.get", return_value=resp) as mock_get:
         meta = fs.fetch_metadata(url)
 
     assert meta.source_name == "figshare"
@@ -249,10 +283,10 @@ def test_fetch_metadata_basic(fs):
 
 def test_fetch_metadata_html_stripped(fs):
     resp = MagicMock()
-    resp.json.return_value = ARTICLE_RESPONSE
+    resp.content = json.dumps(ARTICLE_RESPONSE).encode()
     resp.raise_for_status = MagicMock()
 
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = fs.fetch_metadata("https://figshare.com/articles/dataset/x/12345")
 
     assert "<p>" not in meta.title
@@ -281,10 +315,10 @@ def test_fetch_metadata_skips_link_only(fs):
     ]
 
     resp = MagicMock()
-    resp.json.return_value = data
+    resp.content = json.dumps(data).encode()
     resp.raise_for_status = MagicMock()
 
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = fs.fetch_metadata("https://figshare.com/articles/dataset/x/12345")
 
     assert len(meta.files) == 1
@@ -299,10 +333,10 @@ def test_fetch_metadata_confidential(fs):
         "is_metadata_record": False,
     }
     resp = MagicMock()
-    resp.json.return_value = data
+    resp.content = json.dumps(data).encode()
     resp.raise_for_status = MagicMock()
 
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = fs.fetch_metadata("https://figshare.com/articles/dataset/x/99999")
 
     assert meta.files == []
@@ -319,15 +353,31 @@ def test_fetch_metadata_undefined_mime(fs):
     }]
 
     resp = MagicMock()
-    resp.json.return_value = data
+    resp.content = json.dumps(data).encode()
     resp.raise_for_status = MagicMock()
 
-    with patch("httpx.get", return_value=resp):
+    with patch("httpx.Client.get", return_value=resp):
         meta = fs.fetch_metadata("https://figshare.com/articles/dataset/x/12345")
 
     assert meta.files[0]["content_type"] == ""
 
 
+def test_fetch_metadata_is_cached_per_url(fs):
+    resp = MagicMock()
+    resp.content = json.dumps(ARTICLE_RESPONSE).encode()
+    resp.raise_for_status = MagicMock()
+
+    url = "https://figshare.com/articles/dataset/x/12345"
+    with patch("httpx.Client.get", return_value=resp) as mock_get:
+        first = fs.fetch_metadata(url)
+        first.files.clear()  # callers get their own copy
+        second = fs.fetch_metadata(url)
+
+    assert mock_get.call_count == 1
+    assert second.title == first.title
+    assert second.files
+
+
 # ── Download ───────────────────────────────────────────────
 
 
@@ -341,7 +391,7 @@ def test_pull_file(fs, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = fs.pull_file(
             "https://ndownloader.figshare.com/files/111",
             str(tmp_path),
@@ -362,7 +412,7 @@ def test_pull_file_infers_filename(fs, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = fs.pull_file(
             "https://ndownloader.figshare.com/files/interview.txt",
             str(tmp_path),
@@ -371,6 +421,66 @@ def test_pull_file_infers_filename(fs, tmp_path):
     assert Path(path).name == "interview.txt"
 
 
+def test_pull_file_retries_broken_reads(fs, tmp_path):
+    good = MagicMock()
+    good.raise_for_status = MagicMock()
+    good.iter_bytes = MagicMock(return_value=iter([b"ok"]))
+    good.headers = {}
+    good.__enter__ = MagicMock(return_value=good)
+    good.__exit__ = MagicMock(return_value=False)
+
+    broken = MagicMock()
+    broken.__enter__ = MagicMock(side_effect=httpx.ReadError("reset"))
+
+    with patch("httpx.Client.stream", side_effect=[broken, good]) as mock_stream, \
+         patch("harvester.sources.figshare.time.sleep"):
+        fs.pull_file("https://ndownloader.figshare.com/files/1", str(tmp_path), "a.txt")
+
+    assert mock_stream.call_count == 2
+    assert (tmp_path / "a.txt").read_bytes() == b"ok"
+
+
+def test_pull_file_copies_local_urls(fs, tmp_path):
+    cached = tmp_path / "cache" / "interview.txt"
+    cached.parent.mkdir()
+    cached.write_bytes(b"mirrored")
+
+    with patch("httpx.Client.stream") as mock_stream, \
+         patch("harvester.storage.files.MIRROR_DIR", cached.parent):
+        path = fs.pull_file(cached.as_uri(), str(tmp_path / "out"))
+
+    mock_stream.assert_not_called()
+    assert path == str(tmp_path / "out" / "interview.txt")
+    assert Path(path).read_bytes() == b"mirrored"
+
+
+def test_pull_file_refuses_local_urls_outside_mirror(fs, tmp_path):
+    secret = tmp_path / "home" / "id_rsa"
+    secret.parent.mkdir()
+    secret.write_bytes(b"private")
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    (mirror / "escape").symlink_to(secret)
+
+    for url in (secret.as_uri(), (mirror / "escape").as_uri(), f"{mirror.as_uri()}/../home/id_rsa"):
+        with patch("harvester.storage.files.MIRROR_DIR", mirror), \
+             pytest.raises(PermissionError):
+            fs.pull_file(url, str(tmp_path / "out"))
+    # No mirror configured: file:// links are never followed
+    with patch("harvester.storage.files.MIRROR_DIR", None), pytest.raises(PermissionError):
+        fs.pull_file(secret.as_uri(), str(tmp_path / "out"))
+    assert not (tmp_path / "out" / "id_rsa").exists()
+
+
+def test_client_is_shared_and_closed(fs):
+    client = fs._client
+    assert fs._client is client
+    fs.close()
+    assert client.is_closed
+    assert fs._client is not client
+    fs.close()
+
+
 # ── Utility functions ──────────────────────────────────────
 
 
@@ -5,6 +5,7 @@ from xml.etree.ElementTree import Element, SubElement, tostring
 
 import pytest
 
+from harvester.helpers.ratelimit import Throttle
 from harvester.sources.base import BaseSource
 from harvester.sources.fsd import (
     FSDSource,
@@ -17,7 +18,7 @@ from harvester.sources.fsd import (
 @pytest.fixture
 def fsd():
     src = FSDSource()
-    src._last_request_time = 0.0
+    src._pace = Throttle(0)  # disable throttle in tests
     return src
 
 
@@ -114,7 +115,7 @@ def test_find_basic(fsd):
     ]
     page = _wrap_list_records(records)
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
@@ -132,7 +133,7 @@ def test_find_basic(fsd):
 def test_find_empty(fsd):
     page = _wrap_list_records([])
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
@@ -171,7 +172,7 @@ def test_find_pagination(fsd):
         resp.content = tostring(page1 if call_count == 1 else page2, encoding="unicode").encode()
         return resp
 
-    with patch("httpx.get", side_effect=side_effect):
+    with patch("httpx.Client.get", side_effect=side_effect):
         hits = fsd.find("interview")
 
     assert len(hits) == 2
@@ -190,7 +191,7 @@ def test_find_skips_deleted(fsd):
 
     page = _wrap_list_records([rec])
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
@@ -284,7 +285,7 @@ def _make_ddi_response(
 def test_fetch_metadata_basic(fsd):
     ddi_resp = _make_ddi_response()
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
@@ -311,7 +312,7 @@ def test_fetch_metadata_restricted(fsd):
         restrctn="(B) available for research, teaching and study",
     )
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
@@ -328,7 +329,7 @@ def test_fetch_metadata_restricted(fsd):
 def test_fetch_metadata_no_files(fsd):
     ddi_resp = _make_ddi_response(files=[])
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
@@ -354,7 +355,7 @@ def test_pull_file(fsd, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = fsd.pull_file(
             "https://services.fsd.tuni.fi/catalogue/download/FSD4012",
             str(tmp_path),
@@ -388,6 +389,81 @@ def test_to_oai_identifier_already_oai():
     assert _to_oai_identifier("oai:fsd.uta.fi:FSD4012") == "oai:fsd.uta.fi:FSD4012"
 
 
+def test_iter_records_streams_large_page():
+    from harvester.sources.fsd import _iter_records
+
+    records = [
+        _make_dc_record(f"oai:fsd.uta.fi:FSD{i:04d}", f"Title {i}", "x" * 500)
+        for i in range(300)  # well past one parse chunk
+    ]
+    data = tostring(_wrap_list_records(records, token="t"), encoding="unicode").encode()
+
+    titles = []
+    for rec in _iter_records(data):
+        titles.append(rec.find("oai:metadata/oai_dc:dc/dc:title", _NS).text)
+    assert titles == [f"Title {i}" for i in range(300)]
+
+
+def test_iter_records_with_lxml_pull_parser():
+    lxml_etree = pytest.importorskip("lxml.etree")
+    from harvester.sources.fsd import _iter_records
+
+    records = [
+        _make_dc_record(f"oai:fsd.uta.fi:FSD{i:04d}", f"Title {i}", "x" * 500)
+        for i in range(300)  # several feed() calls
+    ]
+    data = tostring(_wrap_list_records(records, token="t"), encoding="unicode").encode()
+
+    with patch("harvester.helpers.xmlio.etree", lxml_etree):
+        titles = [
+            rec.find("oai:metadata/oai_dc:dc/dc:title", _NS).text
+            for rec in _iter_records(data)
+        ]
+    assert titles == [f"Title {i}" for i in range(300)]
+
+
+def test_date_range():
+    from harvester.sources.fsd import _date_range
+
+    def el(event, date):
+        e = Element("collDate")
+        e.set("event", event)
+        e.set("date", date)
+        return e
+
+    assert _date_range([el("start", "2020"), el("end", "2021"), el("end", "2022")]) == (
+        "2020 – 2021"
+    )
+    assert _date_range([el("end", "2021")]) == "2021"
+    assert _date_range([el("single", "2019")]) == ""
+    assert _date_range([]) == ""
+
+
+def test_resumption_token():
+    from harvester.sources.fsd import _resumption_token
+
+    with_token = _wrap_list_records([], token="offset:100&amp;set=a")
+    assert _resumption_token(tostring(with_token)) == "offset:100&amp;set=a"
+    assert _resumption_token(tostring(_wrap_list_records([]))) == ""
+    assert _resumption_token(
+        b'<ListRecords><resumptionToken completeListSize="3"/>\n</ListRecords>'
+    ) == ""
+
+
+def test_matches_terms():
+    from harvester.sources.base import DatasetHit
+    from harvester.sources.fsd import _matches_terms
+
+    hit = DatasetHit(
+        source_name="fsd", source_url="u", title="Nurses' Interviews",
+        description="Qualitative study", tags=["Health care"],
+    )
+    assert _matches_terms(hit, [])
+    assert _matches_terms(hit, ["interview", "qualitative"])
+    assert _matches_terms(hit, ["care"])
+    assert not _matches_terms(hit, ["interview", "survey"])
+
+
 # ── Registry ──────────────────────────────────────────────
 
 
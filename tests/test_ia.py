@@ -1,9 +1,14 @@
 """Unit tests for the IASource — Internet Archive search, metadata, download."""
 
+import json
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from harvester.helpers.cache import ResponseCache
+from harvester.helpers.ratelimit import Throttle
+from harvester.sources import ia as ia_module
 from harvester.sources.base import BaseSource
 from harvester.sources.ia import (
     IASource,
@@ -16,7 +21,8 @@ from harvester.sources.ia import (
 @pytest.fixture
 def ia():
     src = IASource()
-    src._last_request_time = 0.0
+    src._pace = Throttle(0)  # disable throttle in tests
+    src._responses = ResponseCache(None)  # never serve stale test data
     return src
 
 
@@ -64,11 +70,11 @@ SEARCH_RESPONSE = {
 
 
 def test_find_basic(ia):
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
-        resp.json.return_value = SEARCH_RESPONSE
+        resp.content = json.dumps(SEARCH_RESPONSE).encode()
         mock_get.return_value = resp
 
         hits = ia.find("oral history interview")
@@ -80,13 +86,29 @@ def test_find_basic(ia):
     assert hits[1].title == "Focus Group Discussion on Education"
 
 
+def test_find_requests_only_mapped_fields(ia):
+    with patch("httpx.Client.get") as mock_get:
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.raise_for_status = MagicMock()
+        resp.content = json.dumps(SEARCH_RESPONSE).encode()
+        mock_get.return_value = resp
+
+        ia.find("oral history interview")
+
+    params = mock_get.call_args.kwargs["params"]
+    fields = {v for k, v in params if k == "fl[]"}
+    assert {"identifier", "title", "subject"} <= fields
+    assert "licenseurl" not in fields
+
+
 def test_find_handles_string_subject(ia):
     """Subject can be a semicolon-separated string instead of a list."""
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
-        resp.json.return_value = SEARCH_RESPONSE
+        resp.content = json.dumps(SEARCH_RESPONSE).encode()
         mock_get.return_value = resp
 
         hits = ia.find("education")
@@ -130,24 +152,63 @@ def test_find_pagination(ia):
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
-        resp.json.return_value = page1 if call_count == 1 else page2
+        resp.content = json.dumps(page1 if call_count == 1 else page2).encode()
         return resp
 
-    with patch("httpx.get", side_effect=side_effect):
+    with patch("httpx.Client.get", side_effect=side_effect):
         hits = ia.find("test")
 
     assert len(hits) == 70
     assert call_count == 2
 
 
+def test_find_fetches_remaining_pages_in_order(ia):
+    def fake_get(url, params=None, **kwargs):
+        start = int(dict(params)["start"])
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.raise_for_status = MagicMock()
+        resp.content = json.dumps({"response": {"numFound": 230, "docs": [
+            {"identifier": f"item-{start + i}", "title": f"Item {start + i}"}
+            for i in range(min(50, 230 - start))
+        ]}}).encode()
+        return resp
+
+    with patch("httpx.Client.get", side_effect=fake_get) as mock_get:
+        hits = ia.find("test")
+
+    assert mock_get.call_count == 5
+    assert [h.title for h in hits] == [f"Item {i}" for i in range(230)]
+
+
+def test_find_stops_mapping_docs_at_cap(ia):
+    page = {"response": {"numFound": 50, "docs": [
+        {"identifier": f"item-{i}", "title": f"Item {i}"} for i in range(50)
+    ]}}
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.raise_for_status = MagicMock()
+    resp.content = json.dumps(page).encode()
+
+    with (
+        patch("harvester.sources.ia._SEARCH_CAP", 10),
+        patch("harvester.sources.ia._doc_to_hit", wraps=ia_module._doc_to_hit) as mapper,
+        patch("httpx.Client.get", return_value=resp),
+    ):
+        hits = ia.find("test")
+
+    assert len(hits) == 10
+    assert mapper.call_count == 10
+
+
 def test_find_empty(ia):
     empty_resp = {"response": {"numFound": 0, "start": 0, "docs": []}}
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
         resp.status_code = 200
         resp.raise_for_status = MagicMock()
-        resp.json.return_value = empty_resp
+        resp.content = json.dumps(empty_resp).encode()
         mock_get.return_value = resp
 
         hits = ia.find("nonexistent_xyz")
@@ -155,6 +216,22 @@ def test_find_empty(ia):
     assert hits == []
 
 
+def test_repeat_search_served_from_cache(ia, tmp_path):
+    ia._responses = ResponseCache(tmp_path)
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.raise_for_status = MagicMock()
+    resp.content = json.dumps(SEARCH_RESPONSE).encode()
+    resp.headers = {}
+
+    with patch("httpx.Client.get", return_value=resp) as mock_get:
+        first = ia.find("interview")
+        second = ia.find("interview")
+
+    assert mock_get.call_count == 1
+    assert [h.title for h in first] == [h.title for h in second]
+
+
 # ── Full metadata ──────────────────────────────────────────
 
 METADATA_RESPONSE = {
@@ -290,7 +367,7 @@ def test_pull_file(ia, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = ia.pull_file(
             "https://archive.org/download/oral-history-001/interview.pdf",
             str(tmp_path),
@@ -301,6 +378,25 @@ def test_pull_file(ia, tmp_path):
     assert (tmp_path / "interview.pdf").read_bytes() == content
 
 
+def test_pull_file_copies_local_urls(ia, tmp_path):
+    import hashlib
+
+    from harvester.storage.files import StreamDigest
+
+    cached = tmp_path / "mirror" / "tape01.mp3"
+    cached.parent.mkdir()
+    cached.write_bytes(b"audio bytes")
+    h = StreamDigest()
+
+    with patch("httpx.Client.stream") as mock_stream, \
+         patch("harvester.storage.files.MIRROR_DIR", cached.parent):
+        path = ia.pull_file(cached.as_uri(), str(tmp_path / "out"), hasher=h)
+
+    mock_stream.assert_not_called()
+    assert Path(path).read_bytes() == b"audio bytes"
+    assert h.hexdigest() == hashlib.sha256(b"audio bytes").hexdigest()
+
+
 # ── Utility functions ──────────────────────────────────────
 
 
@@ -356,6 +452,38 @@ def test_license_name_empty():
     assert _license_name_from_url("") == ""
 
 
+def test_client_is_shared_and_closed(ia):
+    client = ia._client
+    assert ia._client is client
+    ia.close()
+    assert client.is_closed
+    assert ia._client is not client
+    ia.close()
+
+
+def test_doc_to_hit():
+    from harvester.sources.ia import _doc_to_hit
+
+    hit = _doc_to_hit({
+        "identifier": "tape-7", "title": "Tape 7", "description": ["<p>Side A</p>"],
+        "creator": ["Doe, J."], "publicdate": "2001-02-03", "subject": "oral history; labor",
+    })
+    assert hit.source_url == "https://archive.org/details/tape-7"
+    assert hit.description == "Side A"
+    assert hit.authors == "Doe, J."
+    assert hit.date_published == "2001-02-03"
+    assert hit.tags == ["oral history", "labor"]
+    assert _doc_to_hit({"identifier": "untitled"}) is None
+
+
+def test_as_str_list():
+    from harvester.sources.ia import _as_str_list
+
+    assert _as_str_list(["a", "b"]) == ["a", "b"]
+    assert _as_str_list("oral history; education") == ["oral history", "education"]
+    assert _as_str_list(None) == []
+
+
 # ── Registry ──────────────────────────────────────────────
 
 
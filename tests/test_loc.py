@@ -1,9 +1,12 @@
 """Unit tests for the LOCSource — Library of Congress search, metadata, download."""
 
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from harvester.helpers.cache import ResponseCache
+from harvester.helpers.ratelimit import Throttle
 from harvester.sources.base import BaseSource
 from harvester.sources.loc import (
     LOCSource,
@@ -15,7 +18,8 @@ from harvester.sources.loc import (
 @pytest.fixture
 def loc():
     src = LOCSource()
-    src._last_request_time = 0.0
+    src._pace = Throttle(0)  # disable throttle in tests
+    src._responses = ResponseCache(None)  # never serve stale test data
     return src
 
 
@@ -139,6 +143,23 @@ def test_find_pagination(loc):
     assert call_count == 2
 
 
+def test_find_derives_page_count_from_item_total(loc):
+    def fake_search(query, page):
+        return {
+            "results": [
+                {"title": f"Item {page}-{i}", "url": f"https://www.loc.gov/item/{page}-{i}/"}
+                for i in range(3)
+            ],
+            "pagination": {"next": "https://www.loc.gov/search/?sp=2", "of": 400},
+        }
+
+    with patch.object(loc, "_search_page", side_effect=fake_search) as mock_page:
+        hits = loc.find("test")
+
+    assert mock_page.call_count == 3
+    assert [h.title for h in hits][::3] == ["Item 1-0", "Item 2-0", "Item 3-0"]
+
+
 def test_find_empty(loc):
     empty = {
         "results": [],
@@ -151,6 +172,43 @@ def test_find_empty(loc):
     assert hits == []
 
 
+def test_get_json_serves_repeat_requests_from_cache(loc, tmp_path):
+    loc._responses = ResponseCache(tmp_path)
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.raise_for_status = MagicMock()
+    resp.content = json.dumps(SEARCH_RESPONSE).encode()
+    resp.headers = {}
+
+    with patch("httpx.Client.get", return_value=resp) as mock_get:
+        first = loc._get_json("https://www.loc.gov/search/", {"q": "x"}, kind="search")
+        second = loc._get_json("https://www.loc.gov/search/", {"q": "x"}, kind="search")
+
+    assert mock_get.call_count == 1
+    assert first == second == SEARCH_RESPONSE
+
+
+def test_get_json_revalidates_expired_entries_with_etag(loc, tmp_path):
+    loc._responses = ResponseCache(tmp_path, ttls={"search": 0, "metadata": 0})
+    fresh = MagicMock()
+    fresh.status_code = 200
+    fresh.raise_for_status = MagicMock()
+    fresh.content = json.dumps(SEARCH_RESPONSE).encode()
+    fresh.headers = {"etag": '"v1"'}
+    not_modified = MagicMock()
+    not_modified.status_code = 304
+    not_modified.headers = {}
+
+    url = "https://www.loc.gov/item/1/"
+    with patch("httpx.Client.get", side_effect=[fresh, not_modified]) as mock_get:
+        loc._get_json(url, {"fo": "json"})
+        again = loc._get_json(url, {"fo": "json"})
+
+    assert again == SEARCH_RESPONSE
+    assert mock_get.call_args_list[0].kwargs["headers"] is None
+    assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
 # ── Full metadata ──────────────────────────────────────────
 
 ITEM_RESPONSE = {
@@ -308,7 +366,7 @@ def test_pull_file(loc, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = loc.pull_file(
             "https://tile.loc.gov/storage-services/test/recording.mp3",
             str(tmp_path),
@@ -319,9 +377,6 @@ def test_pull_file(loc, tmp_path):
     assert (tmp_path / "recording.mp3").read_bytes() == content
 
 
-# ── Utility functions ──────────────────────────────────────
-
-
 def test_extract_item_id_https():
     assert _extract_item_id("https://www.loc.gov/item/2020706022/") == "2020706022"
 
@@ -343,6 +398,23 @@ def test_normalize_item_url_existing():
     assert result == "https://www.loc.gov/item/2020706022/"
 
 
+def test_client_is_shared_and_closed(loc):
+    client = loc._client
+    assert loc._client is client
+    loc.close()
+    assert client.is_closed
+    assert loc._client is not client
+    loc.close()
+
+
+def test_as_str_list():
+    from harvester.sources.loc import _as_str_list
+
+    assert _as_str_list(["a", "b"]) == ["a", "b"]
+    assert _as_str_list("english; french") == ["english; french"]
+    assert _as_str_list(None) == []
+
+
 # ── Registry ──────────────────────────────────────────────
 
 
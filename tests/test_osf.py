@@ -1,17 +1,21 @@
 """Unit tests for the OSFSource — search, metadata, download."""
 
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from harvester.sources.base import BaseSource
+from harvester.helpers.cache import ResponseCache
+from harvester.helpers.ratelimit import Throttle
+from harvester.sources.base import BaseSource, FileEntry
 from harvester.sources.osf import OSFSource, _extract_node_id
 
 
 @pytest.fixture
 def osf():
     src = OSFSource()
-    src._last_request_time = 0.0  # disable throttle in tests
+    src._pace = Throttle(0)  # disable throttle in tests
+    src._responses = ResponseCache(None)  # never serve stale test data
     return src
 
 
@@ -66,11 +70,12 @@ def test_find_basic(osf):
     ]
     page1 = _wrap_page(nodes)
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
-        resp.json.return_value = page1
+        resp.content = json.dumps(page1).encode()
         resp.raise_for_status = MagicMock()
         resp.status_code = 200
+        resp.headers = {}
         mock_get.return_value = resp
 
         hits = osf.find("qualitative interview")
@@ -92,11 +97,12 @@ def test_find_skips_non_public(osf):
     ]
     page = _wrap_page(nodes)
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
-        resp.json.return_value = page
+        resp.content = json.dumps(page).encode()
         resp.raise_for_status = MagicMock()
         resp.status_code = 200
+        resp.headers = {}
         mock_get.return_value = resp
 
         hits = osf.find("test")
@@ -119,11 +125,12 @@ def test_find_pagination(osf):
         call_count += 1
         resp = MagicMock()
         resp.status_code = 200
+        resp.headers = {}
         resp.raise_for_status = MagicMock()
-        resp.json.return_value = page1 if call_count == 1 else page2
+        resp.content = json.dumps(page1 if call_count == 1 else page2).encode()
         return resp
 
-    with patch("httpx.get", side_effect=side_effect):
+    with patch("httpx.Client.get", side_effect=side_effect):
         hits = osf.find("test")
 
     assert len(hits) == 60
@@ -133,11 +140,12 @@ def test_find_pagination(osf):
 def test_find_empty(osf):
     page = _wrap_page([])
 
-    with patch("httpx.get") as mock_get:
+    with patch("httpx.Client.get") as mock_get:
         resp = MagicMock()
-        resp.json.return_value = page
+        resp.content = json.dumps(page).encode()
         resp.raise_for_status = MagicMock()
         resp.status_code = 200
+        resp.headers = {}
         mock_get.return_value = resp
 
         hits = osf.find("nonexistent")
@@ -145,6 +153,95 @@ def test_find_empty(osf):
     assert hits == []
 
 
+def test_get_serves_cache_hits_and_revalidates_with_etag(osf, tmp_path):
+    page = _wrap_page([])
+    fresh = MagicMock()
+    fresh.status_code = 200
+    fresh.raise_for_status = MagicMock()
+    fresh.content = json.dumps(page).encode()
+    fresh.headers = {"etag": '"v1"'}
+    not_modified = MagicMock()
+    not_modified.status_code = 304
+    not_modified.headers = {}
+
+    url = "https://api.osf.io/v2/nodes/4vtu3/"
+    osf._responses = ResponseCache(tmp_path)
+    with patch("httpx.Client.get", return_value=fresh) as mock_get:
+        osf._get(url)
+        assert osf._get(url) == page
+    assert mock_get.call_count == 1
+
+    osf._responses = ResponseCache(tmp_path, ttls={"search": 0, "metadata": 0})
+    with patch("httpx.Client.get", return_value=not_modified) as mock_get:
+        assert osf._get(url) == page
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_fetch_honours_retry_after(osf):
+    limited = MagicMock()
+    limited.status_code = 429
+    limited.headers = {"retry-after": "30"}
+    ok = MagicMock()
+    ok.status_code = 200
+    ok.raise_for_status = MagicMock()
+    ok.headers = {}
+
+    with patch("httpx.Client.get", side_effect=[limited, ok]), \
+         patch("harvester.sources.osf.time.sleep") as sleep:
+        assert osf._fetch("https://api.osf.io/v2/nodes/") is ok
+
+    (wait,), _ = sleep.call_args
+    assert 30 <= wait <= 32
+
+
+def test_fetch_retries_gateway_errors_and_dropped_reads(osf):
+    import httpx
+
+    unavailable = MagicMock()
+    unavailable.status_code = 503
+    unavailable.headers = {}
+    ok = MagicMock()
+    ok.status_code = 200
+    ok.raise_for_status = MagicMock()
+    ok.headers = {}
+
+    with patch("httpx.Client.get", side_effect=[httpx.ReadError("reset"), unavailable, ok]), \
+         patch("harvester.sources.osf.time.sleep") as sleep:
+        assert osf._fetch("https://api.osf.io/v2/nodes/") is ok
+
+    assert sleep.call_count == 2
+    assert all(w <= 60 for (w,), _ in sleep.call_args_list)
+
+
+def test_fetch_does_not_retry_client_errors(osf):
+    import httpx
+
+    missing = MagicMock()
+    missing.status_code = 404
+    missing.headers = {}
+    missing.raise_for_status.side_effect = httpx.HTTPStatusError(
+        "404", request=MagicMock(), response=missing,
+    )
+
+    with patch("httpx.Client.get", return_value=missing) as mock_get, \
+         pytest.raises(httpx.HTTPStatusError):
+        osf._fetch("https://api.osf.io/v2/nodes/nope/")
+    assert mock_get.call_count == 1
+
+
+def test_fetch_syncs_pace_with_rate_limit_headers(osf):
+    ok = MagicMock()
+    ok.status_code = 200
+    ok.raise_for_status = MagicMock()
+    ok.headers = {"x-ratelimit-remaining": "42", "x-ratelimit-reset": "600"}
+    osf._pace = MagicMock()
+
+    with patch("httpx.Client.get", return_value=ok):
+        osf._fetch("https://api.osf.io/v2/nodes/")
+
+    osf._pace.sync.assert_called_once_with(42, 600.0)
+
+
 # ── Full metadata ──────────────────────────────────────────
 
 NODE_RESPONSE = {
@@ -253,12 +350,13 @@ def _osf_side_effect(call_map):
     def side_effect(url, **kwargs):
         resp = MagicMock()
         resp.status_code = 200
+        resp.headers = {}
         resp.raise_for_status = MagicMock()
         for key in sorted_keys:
             if key in url:
-                resp.json.return_value = call_map[key]
+                resp.content = json.dumps(call_map[key]).encode()
                 return resp
-        resp.json.return_value = {"data": {}}
+        resp.content = json.dumps({"data": {}}).encode()
         return resp
 
     return side_effect
@@ -273,7 +371,7 @@ def test_fetch_metadata_basic(osf):
     }
 
     url = "https://osf.io/4vtu3/"
-    with patch("httpx.get", side_effect=_osf_side_effect(call_map)):
+    with patch("httpx.Client.get", side_effect=_osf_side_effect(call_map)):
         meta = osf.fetch_metadata(url)
 
     assert meta.source_name == "osf"
@@ -292,6 +390,7 @@ def test_fetch_metadata_basic(osf):
     # Files
     assert len(meta.files) == 2
     f0 = meta.files[0]
+    assert isinstance(f0, FileEntry)
     assert f0["name"] == "transcripts.pdf"
     assert f0["id"] == "file001"
     assert f0["size"] == 204800
@@ -302,6 +401,32 @@ def test_fetch_metadata_basic(osf):
     assert meta.files[1]["name"] == "codebook.docx"
 
 
+def test_fetch_metadata_sub_requests_overlap(osf):
+    import threading
+
+    call_map = {
+        "/v2/nodes/4vtu3/": NODE_RESPONSE,
+        "/v2/nodes/4vtu3/contributors/": CONTRIBUTORS_RESPONSE,
+        "/v2/nodes/4vtu3/files/osfstorage/": FILES_RESPONSE,
+        "/v2/licenses/abc123/": LICENSE_RESPONSE,
+    }
+    respond = _osf_side_effect(call_map)
+    # Only passes if contributors, files and license are in flight together
+    together = threading.Barrier(3, timeout=5)
+
+    def side_effect(url, **kwargs):
+        if "/contributors/" in url or "/files/" in url or "/licenses/" in url:
+            together.wait()
+        return respond(url, **kwargs)
+
+    with patch("httpx.Client.get", side_effect=side_effect):
+        meta = osf.fetch_metadata("https://osf.io/4vtu3/")
+
+    assert meta.authors == "Jane Smith; Adam Doe"
+    assert len(meta.files) == 2
+    assert meta.license_type == "CC-By Attribution 4.0 International"
+
+
 def test_fetch_metadata_no_license(osf):
     node_no_lic = {
         "data": {
@@ -328,7 +453,7 @@ def test_fetch_metadata_no_license(osf):
         "/v2/nodes/xyz99/files/osfstorage/": {"data": [], "links": {"next": None}},
     }
 
-    with patch("httpx.get", side_effect=_osf_side_effect(call_map)):
+    with patch("httpx.Client.get", side_effect=_osf_side_effect(call_map)):
         meta = osf.fetch_metadata("https://osf.io/xyz99/")
 
     assert meta.license_type == ""
@@ -344,7 +469,7 @@ def test_fetch_metadata_no_files(osf):
         "/v2/licenses/abc123/": LICENSE_RESPONSE,
     }
 
-    with patch("httpx.get", side_effect=_osf_side_effect(call_map)):
+    with patch("httpx.Client.get", side_effect=_osf_side_effect(call_map)):
         meta = osf.fetch_metadata("https://osf.io/4vtu3/")
 
     assert meta.files == []
@@ -364,7 +489,7 @@ def test_pull_file(osf, tmp_path):
     mock_resp.__enter__ = MagicMock(return_value=mock_resp)
     mock_resp.__exit__ = MagicMock(return_value=False)
 
-    with patch("httpx.stream", return_value=mock_resp):
+    with patch("httpx.Client.stream", return_value=mock_resp):
         path = osf.pull_file(
             "https://files.osf.io/v1/resources/4vtu3/providers/osfstorage/file001",
             str(tmp_path),
@@ -375,6 +500,83 @@ def test_pull_file(osf, tmp_path):
     assert (tmp_path / "transcripts.pdf").read_bytes() == content
 
 
+def test_pull_file_streams_large_chunks_into_hasher(osf, tmp_path):
+    import hashlib
+
+    from harvester.storage.files import DOWNLOAD_CHUNK, StreamDigest
+
+    chunks = [b"a" * 10, b"b" * 5]
+    mock_resp = MagicMock()
+    mock_resp.raise_for_status = MagicMock()
+    mock_resp.iter_bytes = MagicMock(return_value=iter(chunks))
+    mock_resp.headers = {"content-length": "15"}
+    mock_resp.__enter__ = MagicMock(return_value=mock_resp)
+    mock_resp.__exit__ = MagicMock(return_value=False)
+    h = StreamDigest()
+
+    with patch("httpx.Client.stream", return_value=mock_resp):
+        path = osf.pull_file("https://osf.io/download/f1/", str(tmp_path), "f.bin", hasher=h)
+
+    mock_resp.iter_bytes.assert_called_once_with(chunk_size=DOWNLOAD_CHUNK)
+    assert open(path, "rb").read() == b"".join(chunks)
+    assert h.hexdigest() == hashlib.sha256(b"".join(chunks)).hexdigest()
+
+
+def test_pull_file_retries_unavailable(osf, tmp_path):
+    def streamed(status, body=b""):
+        resp = MagicMock()
+        resp.status_code = status
+        resp.raise_for_status = MagicMock()
+        resp.iter_bytes = MagicMock(return_value=iter([body]))
+        resp.headers = {"retry-after": "1"} if status == 503 else {}
+        resp.__enter__ = MagicMock(return_value=resp)
+        resp.__exit__ = MagicMock(return_value=False)
+        return resp
+
+    with patch("httpx.Client.stream", side_effect=[streamed(503), streamed(200, b"ok")]), \
+         patch("harvester.sources.osf.time.sleep") as sleep:
+        path = osf.pull_file("https://osf.io/download/f1/", str(tmp_path), "f.txt")
+
+    assert open(path, "rb").read() == b"ok"
+    (wait,), _ = sleep.call_args
+    assert 1 <= wait <= 3
+
+
+def test_pull_file_copies_local_urls_only_from_mirror(osf, tmp_path):
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    (mirror / "codebook.docx").write_bytes(b"mirrored")
+    outside = tmp_path / "harvester.db"
+    outside.write_bytes(b"sqlite")
+
+    with patch("httpx.Client.stream") as mock_stream, \
+         patch("harvester.storage.files.MIRROR_DIR", mirror):
+        path = osf.pull_file((mirror / "codebook.docx").as_uri(), str(tmp_path / "out"))
+        with pytest.raises(PermissionError):
+            osf.pull_file(outside.as_uri(), str(tmp_path / "out"))
+
+    mock_stream.assert_not_called()
+    assert open(path, "rb").read() == b"mirrored"
+    assert not (tmp_path / "out" / "harvester.db").exists()
+
+
+def test_pool_fits_downloads_and_prefetched_metadata():
+    from harvester.sources.osf import _METADATA_WORKERS, _POOL_LIMITS, OSFSource
+
+    # fetch_metadata_bulk keeps 4 lookups in flight while pull_files streams
+    assert _POOL_LIMITS.max_connections >= OSFSource.download_workers + 4 * _METADATA_WORKERS
+
+
+def test_client_is_shared_and_closed(osf):
+    client = osf._client
+    assert osf._client is client
+    assert client.headers["accept"] == "application/vnd.api+json"
+    osf.close()
+    assert client.is_closed
+    assert osf._client is not client
+    osf.close()
+
+
 # ── Utility functions ──────────────────────────────────────
 
 